@@ -0,0 +1,78 @@
+"""Shared fixtures of the benchmark suite.
+
+Benchmarks need the ``bench`` extra (pytest-benchmark); without it the
+benchmark modules are skipped. They are not collected by the default test
+run. Every benchmark takes the ``elements`` fixture, parametrized over sizes
+from 10^2 up to ``--bench-max-elements``.
+"""
+
+from typing import Dict
+
+import pytest
+from synthetic import TEMPLATE, draw_board
+
+from kicad_draw.PCBmodule import PCBdraw
+
+SIZES = [10**2, 10**3, 10**4, 10**5, 10**6]
+# Total element count processed per benchmark, spread over its rounds
+ROUND_ELEMENTS = 10**5
+
+
+def pytest_addoption(parser):
+    """Add the size limit option."""
+    parser.addoption(
+        "--bench-max-elements",
+        type=int,
+        default=10**5,
+        help="Largest benchmark size in elements (10^6 for the full curve)",
+    )
+
+
+def pytest_generate_tests(metafunc):
+    """Parametrize benchmarks over the element counts."""
+    if "elements" in metafunc.fixturenames:
+        limit = metafunc.config.getoption("--bench-max-elements")
+        sizes = [size for size in SIZES if size <= limit]
+        ids = [f"1e{len(str(size)) - 1}" for size in sizes]
+        metafunc.parametrize("elements", sizes, ids=ids)
+
+
+@pytest.fixture
+def run(benchmark, elements):
+    """Return a function benchmarking one stage at the current size.
+
+    The stage function is timed for several rounds, fewer for large sizes;
+    ``setup`` (untimed) prepares its arguments for each round. The stage
+    name, nominal size and actual element count (``count``, when it differs
+    from the size) are stored in the benchmark's ``extra_info`` so that
+    results can be turned into scaling curves (see ``regression.py``).
+    """
+
+    def run_stage(stage, function, setup=None, count=None):
+        benchmark.group = stage
+        benchmark.extra_info["stage"] = stage
+        benchmark.extra_info["size"] = elements
+        benchmark.extra_info["elements"] = elements if count is None else count
+        rounds = max(3, min(50, ROUND_ELEMENTS // elements))
+        return benchmark.pedantic(function, setup=setup, rounds=rounds)
+
+    return run_stage
+
+
+_boards: Dict[int, PCBdraw] = {}
+
+
+@pytest.fixture
+def board(elements) -> PCBdraw:
+    """Synthetic board with visualization, drawn once per size and session."""
+    if elements not in _boards:
+        _boards[elements] = draw_board(elements)
+    return _boards[elements]
+
+
+@pytest.fixture
+def template(tmp_path) -> str:
+    """Write a minimal KiCad PCB template."""
+    path = tmp_path / "template.kicad_pcb"
+    path.write_text(TEMPLATE)
+    return str(path)
@@ -0,0 +1,204 @@
+"""Scaling curves and regression gate for benchmark results.
+
+Reads the JSON written by ``pytest benchmarks --benchmark-json=FILE`` and
+prints, for each stage, the time and throughput at every size::
+
+    python benchmarks/regression.py results.json
+
+With ``--baseline``, the run fails (exit status 1) when a stage got slower
+than the saved baseline by more than ``--threshold``. Independently of the
+baseline, it fails when a stage's time grows faster than
+``elements ** --max-exponent`` between the sizes of at least 10^4 elements.
+Linear stages measure up to about 1.5 there (memory-bound stages fall out
+of the CPU caches), so the default limit catches accidentally quadratic code
+on any machine without flagging them. ``--save`` writes
+the curves of the current run as a new baseline.
+"""
+
+import json
+import math
+import platform
+from typing import Dict, List, Optional
+
+import click
+
+# Sizes below this are dominated by fixed overhead and not used for scaling
+SCALING_MIN_SIZE = 10**4
+
+# Curves map a stage to its points by nominal size: {"elements", "time"}
+Curves = Dict[str, Dict[int, dict]]
+
+
+def load_curves(path: str) -> Curves:
+    """Load scaling curves from benchmark results or a saved baseline.
+
+    Args:
+        path: pytest-benchmark JSON output or baseline written by ``--save``
+
+    Returns:
+        Curves keyed by stage and nominal size, timed by the fastest round
+
+    """
+    with open(path) as f:
+        data = json.load(f)
+    if "curves" in data:
+        return {
+            stage: {int(size): point for size, point in points.items()}
+            for stage, points in data["curves"].items()
+        }
+    curves: Curves = {}
+    for result in data["benchmarks"]:
+        info = result["extra_info"]
+        if "stage" not in info:
+            continue
+        curves.setdefault(info["stage"], {})[int(info["size"])] = {
+            "elements": info["elements"],
+            "time": result["stats"]["min"],
+        }
+    return curves
+
+
+def scaling_exponent(points: Dict[int, dict]) -> Optional[float]:
+    """Least-squares slope of log(time) over log(elements).
+
+    Only sizes of at least ``SCALING_MIN_SIZE`` are used; returns None when
+    fewer than two remain.
+    """
+    large = [p for size, p in points.items() if size >= SCALING_MIN_SIZE]
+    if len(large) < 2:
+        return None
+    x = [math.log(p["elements"]) for p in large]
+    y = [math.log(p["time"]) for p in large]
+    mx, my = sum(x) / len(x), sum(y) / len(y)
+    return sum((a - mx) * (b - my) for a, b in zip(x, y)) / sum(
+        (a - mx) ** 2 for a in x
+    )
+
+
+def check(
+    curves: Curves,
+    baseline: Optional[Curves],
+    threshold: float,
+    max_exponent: float,
+) -> List[str]:
+    """Compare curves with the baseline and the scaling limit.
+
+    Args:
+        curves: Curves of the current run
+        baseline: Saved curves, or None to only check scaling
+        threshold: Allowed relative slowdown (0.25 means 25% slower)
+        max_exponent: Largest allowed scaling exponent
+
+    Returns:
+        Description of every failure (empty when the run passes)
+
+    """
+    failures = []
+    for stage, points in sorted(curves.items()):
+        exponent = scaling_exponent(points)
+        if exponent is not None and exponent > max_exponent:
+            failures.append(
+                f"{stage}: time grows as elements^{exponent:.2f} "
+                f"(limit {max_exponent})"
+            )
+        for size, point in sorted(points.items()):
+            reference = (baseline or {}).get(stage, {}).get(size)
+            if reference is None:
+                continue
+            ratio = point["time"] / reference["time"]
+            if ratio > 1.0 + threshold:
+                failures.append(
+                    f"{stage} at {size} elements: {ratio:.2f}x the baseline "
+                    f"time (limit {1.0 + threshold:.2f}x)"
+                )
+    return failures
+
+
+def report(curves: Curves, baseline: Optional[Curves]) -> str:
+    """Format the curves as a table, with ratios to the baseline."""
+    lines = [
+        f"{'stage':<24}{'size':>9}{'elements':>10}{'time (s)':>12}"
+        f"{'elements/s':>13}{'vs base':>9}"
+    ]
+    for stage, points in sorted(curves.items()):
+        for size, point in sorted(points.items()):
+            reference = (baseline or {}).get(stage, {}).get(size)
+            ratio = (
+                "" if reference is None else f"{point['time'] / reference['time']:.2f}x"
+            )
+            rate = point["elements"] / point["time"]
+            lines.append(
+                f"{stage:<24}{size:>9}{point['elements']:>10}"
+                f"{point['time']:>12.6f}{rate:>13.0f}{ratio:>9}"
+            )
+        exponent = scaling_exponent(points)
+        if exponent is not None:
+            lines.append(f"{stage:<24}{'scaling exponent':>31} {exponent:.2f}")
+    return "\n".join(lines)
+
+
+@click.command()
+@click.argument("results", type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    "--baseline",
+    type=click.Path(exists=True, dir_okay=False),
+    help="Saved baseline to compare with",
+)
+@click.option(
+    "--threshold",
+    type=float,
+    default=0.25,
+    show_default=True,
+    help="Allowed relative slowdown against the baseline",
+)
+@click.option(
+    "--max-exponent",
+    type=float,
+    default=1.7,
+    show_default=True,
+    help="Largest allowed scaling exponent",
+)
+@click.option(
+    "--save",
+    type=click.Path(dir_okay=False),
+    help="Write the curves of this run as a baseline",
+)
+def main(
+    results: str,
+    baseline: Optional[str],
+    threshold: float,
+    max_exponent: float,
+    save: Optional[str],
+) -> None:
+    """Print scaling curves of RESULTS and gate them against a baseline."""
+    curves = load_curves(results)
+    reference = None if baseline is None else load_curves(baseline)
+    click.echo(report(curves, reference))
+
+    if save is not None:
+        with open(results) as f:
+            machine = json.load(f).get("machine_info", {})
+        data = {
+            "machine_info": {
+                "machine": machine.get("machine", platform.machine()),
+                "processor": machine.get("cpu", {}).get("brand_raw", ""),
+                "python_version": machine.get(
+                    "python_version", platform.python_version()
+                ),
+            },
+            "curves": curves,
+        }
+        with open(save, "w") as f:
+            json.dump(data, f, indent=2, sort_keys=True)
+            f.write("\n")
+        click.echo(f"Saved baseline to {save}")
+
+    failures = check(curves, reference, threshold, max_exponent)
+    for failure in failures:
+        click.echo(f"REGRESSION: {failure}", err=True)
+    if failures:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
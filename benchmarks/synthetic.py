@@ -0,0 +1,148 @@
+"""Synthetic large-board generator for the benchmark suite.
+
+Boards are built from circular and rectangular four-layer helices whose
+``segment_number`` is chosen so that the board has (close to) a requested
+number of elements. The same size and seed always give the same board.
+
+The generator can also write a board to disk, e.g. to profile KiCad itself
+or other tools on a large input::
+
+    python benchmarks/synthetic.py 1000000 large.kicad_pcb --svg large.svg
+"""
+
+from typing import List, Optional, Union
+
+import click
+import numpy as np
+
+from kicad_draw.models import HelixParams, HelixRectangleParams
+from kicad_draw.PCBmodule import PCBdraw
+
+CoilParams = Union[HelixParams, HelixRectangleParams]
+
+LAYERS = [0, 1, 2, 3]
+# Elements drawn by a four-layer coil: per segment_number and fixed overhead
+HELIX_ELEMENTS = (4, 9)
+RECTANGLE_ELEMENTS = (16, 29)
+# Largest coil of a board, in elements; bigger boards use more coils
+MAX_COIL_ELEMENTS = 10_000
+PITCH = 30.0
+
+TEMPLATE = '(kicad_pcb\n\t(version 20241229)\n\t(net 0 "")\n)\n'
+
+
+def helix(elements: int, x0: float = 0.0, y0: float = 0.0, net: int = 1):
+    """Circular helix with about the given number of elements."""
+    per_segment, overhead = HELIX_ELEMENTS
+    return HelixParams(
+        x0=x0,
+        y0=y0,
+        radius=10.0,
+        port_gap=1.0,
+        tab_gap=2.0,
+        angle_step=0.1,
+        layer_index_list=LAYERS,
+        track_width=0.5,
+        connect_width=0.3,
+        drill_size=0.2,
+        via_size=0.4,
+        net_number=net,
+        segment_number=max(1, (elements - overhead) // per_segment),
+    )
+
+
+def helix_rectangle(elements: int, x0: float = 0.0, y0: float = 0.0, net: int = 1):
+    """Rectangular helix with about the given number of elements."""
+    per_segment, overhead = RECTANGLE_ELEMENTS
+    return HelixRectangleParams(
+        x0=x0,
+        y0=y0,
+        width=20.0,
+        height=12.0,
+        corner_radius=2.0,
+        layer_index_list=LAYERS,
+        track_width=0.5,
+        connect_width=0.3,
+        drill_size=0.2,
+        via_size=0.4,
+        net_number=net,
+        port_gap=1.0,
+        tab_gap=1.0,
+        segment_number=max(1, (elements - overhead) // per_segment),
+    )
+
+
+def synthetic_board(elements: int, seed: int = 0) -> List[CoilParams]:
+    """Coil parameters of a board with about the given number of elements.
+
+    Small boards are a single circular helix. Larger boards alternate
+    circular and rectangular coils of at most ``MAX_COIL_ELEMENTS`` elements
+    on a square grid, each on its own net, with sizes jittered by the seed.
+
+    Args:
+        elements: Target number of elements
+        seed: Seed of the size jitter
+
+    Returns:
+        List of parameter models, to be drawn with ``PCBdraw.draw``
+
+    """
+    if elements < 1:
+        raise ValueError(f"elements must be positive, got {elements}")
+    count = -(-elements // MAX_COIL_ELEMENTS)
+    if count == 1:
+        return [helix(elements)]
+    rng = np.random.default_rng(seed)
+    columns = int(np.ceil(np.sqrt(count)))
+    coils = []
+    for i in range(count):
+        row, column = divmod(i, columns)
+        make = helix if i % 2 == 0 else helix_rectangle
+        params = make(elements // count, x0=PITCH * column, y0=PITCH * row, net=i + 1)
+        scale = float(rng.uniform(0.8, 1.0))
+        if isinstance(params, HelixParams):
+            params = params.model_copy(update={"radius": params.radius * scale})
+        else:
+            params = params.model_copy(
+                update={"width": params.width * scale, "height": params.height * scale}
+            )
+        coils.append(params)
+    return coils
+
+
+def draw_board(
+    elements: int, seed: int = 0, enable_visualization: bool = True
+) -> PCBdraw:
+    """Draw a synthetic board in file mode (see :func:`synthetic_board`)."""
+    pcb = PCBdraw(
+        "default_4layer", mode="file", enable_visualization=enable_visualization
+    )
+    for params in synthetic_board(elements, seed):
+        pcb.draw(params)
+    return pcb
+
+
+@click.command()
+@click.argument("elements", type=int)
+@click.argument("output", type=click.Path(dir_okay=False))
+@click.option("--seed", type=int, default=0, help="Seed of the size jitter")
+@click.option("--template", type=click.Path(exists=True, dir_okay=False))
+@click.option("--svg", type=click.Path(dir_okay=False), help="Also write an SVG")
+def main(
+    elements: int, output: str, seed: int, template: Optional[str], svg: Optional[str]
+) -> None:
+    """Write a synthetic board with about ELEMENTS elements to OUTPUT."""
+    pcb = draw_board(elements, seed, enable_visualization=svg is not None)
+    if template is None:
+        content = pcb._merge_template(TEMPLATE)
+        with open(output, "w") as f:
+            f.write(content)
+    else:
+        pcb.save(output, template)
+    if svg is not None:
+        pcb.save_svg(svg)
+    click.echo(f"Wrote {len(pcb.elements)} elements to {output}")
+
+
+if __name__ == "__main__":
+    main()
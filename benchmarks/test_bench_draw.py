@@ -0,0 +1,52 @@
+"""Benchmarks of coil generation."""
+
+import pytest
+from synthetic import helix, helix_rectangle
+
+from kicad_draw.PCBmodule import PCBdraw
+
+pytest.importorskip("pytest_benchmark")
+
+
+def fresh_pcb(params):
+    """Return setup arguments drawing into an empty PCB."""
+
+    def setup():
+        pcb = PCBdraw("default_4layer", mode="file", enable_visualization=False)
+        return (pcb, params), {}
+
+    return setup
+
+
+def draw_helix(pcb, params):
+    """Draw a circular helix."""
+    pcb.draw_helix(params)
+    return pcb
+
+
+def draw_helix_rectangle(pcb, params):
+    """Draw a rectangular helix."""
+    pcb.draw_helix_rectangle(params)
+    return pcb
+
+
+def test_draw_helix(run, elements):
+    """Generate and format one circular helix."""
+    pcb = run("draw_helix", draw_helix, setup=fresh_pcb(helix(elements)))
+    assert len(pcb.elements) == pytest.approx(elements, rel=0.1)
+
+
+def test_draw_helix_rectangle(run, elements):
+    """Generate and format one rectangular helix."""
+    setup = fresh_pcb(helix_rectangle(elements))
+    pcb = run("draw_helix_rectangle", draw_helix_rectangle, setup=setup)
+    assert len(pcb.elements) == pytest.approx(elements, rel=0.2)
+
+
+def test_draw_visualized(run, elements):
+    """Generate a circular helix with visualization enabled."""
+
+    def setup():
+        return (PCBdraw("default_4layer", mode="file"), helix(elements)), {}
+
+    run("draw_helix_visualized", draw_helix, setup=setup)
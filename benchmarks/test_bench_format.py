@@ -0,0 +1,44 @@
+"""Benchmarks of KiCad s-expression formatting."""
+
+import numpy as np
+import pytest
+
+from kicad_draw.formatter import KiCadFormatter
+from kicad_draw.geometry import Line, Point
+
+pytest.importorskip("pytest_benchmark")
+
+
+def coordinates(elements: int) -> np.ndarray:
+    """Random segment coordinates with the precision of drawn coils."""
+    rng = np.random.default_rng(0)
+    return rng.uniform(0.0, 300.0, size=(4, elements))
+
+
+def test_format_segment(run, elements):
+    """Format segments one by one."""
+    formatter = KiCadFormatter()
+    x1, y1, x2, y2 = coordinates(elements)
+    lines = [
+        Line(Point(*start), Point(*end), 0.5)
+        for start, end in zip(zip(x1, y1), zip(x2, y2))
+    ]
+
+    def format_all():
+        return [formatter.format_segment(line, "F.Cu", 1) for line in lines]
+
+    assert len(run("format_segment", format_all)) == elements
+
+
+def test_format_segments(run, elements):
+    """Format segments in bulk."""
+    formatter = KiCadFormatter()
+    x1, y1, x2, y2 = coordinates(elements)
+    widths = np.full(elements, 0.5)
+    layers = ["F.Cu"] * elements
+    nets = np.ones(elements, dtype=np.int64)
+
+    def format_all():
+        return formatter.format_segments(x1, y1, x2, y2, widths, layers, nets)
+
+    assert len(run("format_segments", format_all)) == elements
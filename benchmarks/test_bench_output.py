@@ -0,0 +1,44 @@
+"""Benchmarks of board output: export, save, SVG and re-parsing."""
+
+import pytest
+
+from kicad_draw.PCBmodule import PCBdraw
+
+pytest.importorskip("pytest_benchmark")
+
+
+def test_export(run, board):
+    """Join the board elements into s-expression text."""
+    run("export", board.export, count=len(board.elements))
+
+
+def test_save(run, board, template, tmp_path):
+    """Merge the board into a template and write it."""
+    output = str(tmp_path / "board.kicad_pcb")
+    count = len(board.elements)
+    run("save", board.save, setup=lambda: ((output, template), {}), count=count)
+    assert (tmp_path / "board.kicad_pcb").stat().st_size > 0
+
+
+def test_generate_svg(run, board):
+    """Render the board visualization as SVG."""
+    visualizer = board._scene_visualizer()
+    count = len(visualizer.elements)
+    assert run("generate_svg", visualizer.generate_svg, count=count)
+
+
+def test_parse_for_visualization(run, board):
+    """Rebuild the visualization from the board's s-expressions."""
+    pcb = PCBdraw("default_4layer", mode="file", enable_visualization=False)
+    pcb.elements = list(board.elements)
+
+    def setup():
+        pcb.visualizer = None
+        return (), {}
+
+    run(
+        "parse_s_expressions",
+        pcb._parse_s_expressions_for_visualization,
+        setup=setup,
+        count=len(pcb.elements),
+    )
@@ -0,0 +1,30 @@
+"""Benchmarks of the import time of short-lived processes.
+
+Each benchmark starts a fresh interpreter, so the time includes the
+interpreter's own startup. Results are recorded at size 1, so they are
+compared with the baseline but not used for scaling curves.
+"""
+
+import subprocess
+import sys
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+COMMANDS = {
+    "startup_package": ["-c", "import kicad_draw"],
+    "startup_pcbmodule": ["-c", "import kicad_draw.PCBmodule"],
+    "startup_cli_version": ["-m", "kicad_draw.cli", "version"],
+}
+
+
+@pytest.mark.parametrize("stage", list(COMMANDS))
+def test_startup(benchmark, stage):
+    """Start a Python process running one import or CLI command."""
+    command = [sys.executable, *COMMANDS[stage]]
+    benchmark.group = stage
+    benchmark.extra_info.update(stage=stage, size=1, elements=1)
+    benchmark.pedantic(
+        subprocess.run, args=(command,), kwargs={"check": True}, rounds=10
+    )
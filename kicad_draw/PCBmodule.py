@@ -1,16 +1,61 @@
 """Module for generating traces for KiCad PCB."""
 
-from typing import List, Literal, Optional
+import contextlib
+import copy
+import os
+import sys
+import tracemalloc
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    ContextManager,
+    Dict,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Tuple,
+    Union,
+)
 
 import numpy as np
 
+from kicad_draw.cells import Cell, CellReference, flatten
 from kicad_draw.config import default_layers
 from kicad_draw.constants import Angle, Defaults, Geometry, Math, RectangleIndex
+from kicad_draw.footprint import (
+    FootprintReference,
+    footprint_body,
+    format_footprint_instance,
+    format_kicad_mod,
+)
 from kicad_draw.formatter import KiCadFormatter
 from kicad_draw.geometry import Arc, Line, Point, Via
+from kicad_draw.group import ElementGroup, GroupBuilder
 from kicad_draw.layers import LayerManager
-from kicad_draw.models import HelixParams, HelixRectangleParams
-from kicad_draw.visualizer import PCBVisualizer
+from kicad_draw.memory import (
+    MemoryBudget,
+    MemoryBudgetExceeded,
+    format_usage,
+    strings_bytes,
+    visual_bytes,
+)
+from kicad_draw.nodes import DrawNode
+from kicad_draw.spill import DEFAULT_CHUNK_ELEMENTS, SpillStore
+from kicad_draw.stats import Stats, timed_call
+from kicad_draw.transform import flip_layers, grid_placements, polar_placements
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+    from kicad_draw.cache import BaseCoilCache
+    from kicad_draw.models import CoilParams, HelixParams, HelixRectangleParams
+    from kicad_draw.preview import ProgressivePreview
+    from kicad_draw.snapshot import Snapshot
+    from kicad_draw.visualizer import PCBVisualizer
+
+# Stage context while instrumentation is disabled
+_NO_STATS = contextlib.nullcontext()
 
 
 class PCBdraw:
@@ -20,8 +65,9 @@ class PCBdraw:
         self,
         stackup: Literal[tuple(default_layers)],
         mode: Literal["print", "file"] = "print",
-        visualizer: Optional[PCBVisualizer] = None,
+        visualizer: Optional["PCBVisualizer"] = None,
         enable_visualization: bool = True,
+        cache: Optional["BaseCoilCache"] = None,
     ):
         """Initialize PCBdraw with stackup.
 
@@ -30,6 +76,7 @@ class PCBdraw:
             mode: Operation mode - "print" for direct s-expression output, "file" for collecting elements
             visualizer: Optional PCBVisualizer instance for SVG output
             enable_visualization: Whether to enable visualization by default (True recommended)
+            cache: Optional coil cache reused by draw() in file mode
 
         """
         self.layer_manager = LayerManager(stackup)
@@ -37,6 +84,17 @@ class PCBdraw:
         self.mode = mode
         self.elements = []  # Buffer to collect s-expressions when in file mode
         self.visualizer = visualizer
+        self._preview = None  # Progressive preview still refining, if any
+        self.cache = cache
+        self.nodes: List[DrawNode] = []  # Handles of high-level drawing calls
+        self._dirty_nodes = False  # Whether a node was edited since refresh()
+        self._builder: Optional[GroupBuilder] = None  # Set while capturing
+        self.cells: Dict[str, Cell] = {}  # Cells defined for this stackup
+        self.references: List[CellReference] = []  # Placed cells, flattened on export
+        self.footprints: List[FootprintReference] = []  # Cells placed as footprints
+        self.stats: Optional[Stats] = None  # Timers and counters, if instrumented
+        self.memory_budget: Optional[MemoryBudget] = None
+        self.spill: Optional[SpillStore] = None  # Disk store of new nodes, if any
 
         # Enable visualization by default for better user experience
         if enable_visualization and not self.visualizer:
@@ -44,6 +102,39 @@ class PCBdraw:
 
             self.visualizer = PCBVisualizer()
 
+    @contextlib.contextmanager
+    def instrument(
+        self, stats: Optional[Stats] = None, memory: bool = False
+    ) -> Iterator[Stats]:
+        """Collect timers and counters while the block runs.
+
+        Args:
+            stats: Statistics to add to (default: new, empty statistics);
+                one Stats object can be shared by several PCBs
+            memory: Whether to also record the peak allocation of every
+                stage and call with tracemalloc (started for the block if it
+                is not tracing yet)
+
+        Yields:
+            The statistics, also available as ``self.stats`` inside the block
+
+        """
+        previous = self.stats
+        self.stats = Stats(memory=memory) if stats is None else stats
+        started = memory and not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        try:
+            yield self.stats
+        finally:
+            self.stats = previous
+            if started:
+                tracemalloc.stop()
+
+    def _stage(self, name: str) -> ContextManager:
+        """Timer of a stage, or a no-op context while not instrumented."""
+        return _NO_STATS if self.stats is None else self.stats.stage(name)
+
     def _output(self, s_expr: str) -> None:
         """Output s-expression based on current mode."""
         if self.mode == "print":
@@ -62,6 +153,42 @@ class PCBdraw:
         layer_index: int,
     ) -> None:
         """Draw linear conductive trace."""
+        if self._builder is not None:
+            self._builder.add_segment(
+                x1, y1, x2, y2, line_width, layer_index, net_number, visual=True
+            )
+            return
+
+        layer = self._output_segment(
+            x1, y1, x2, y2, line_width, net_number, layer_index
+        )
+
+        # Add to visualizer if present
+        if self.visualizer:
+            self.visualizer.add_line(x1, y1, x2, y2, line_width, layer)
+
+    def _output_segment(
+        self,
+        x1: float,
+        y1: float,
+        x2: float,
+        y2: float,
+        line_width: float,
+        net_number: int,
+        layer_index: int,
+    ) -> str:
+        """Output a segment s-expression without visualizing it.
+
+        Returns:
+            Name of the layer the segment was placed on (None while capturing)
+
+        """
+        if self._builder is not None:
+            self._builder.add_segment(
+                x1, y1, x2, y2, line_width, layer_index, net_number
+            )
+            return None
+
         line = Line(
             start=Point(x1, y1),
             end=Point(x2, y2),
@@ -69,10 +196,52 @@ class PCBdraw:
         )
         layer = self.layer_manager.get_layer_name(layer_index)
         self._output(self.formatter.format_segment(line, layer, net_number))
+        return layer
+
+    def _draw_arc(
+        self,
+        arc: Arc,
+        layer_index: int,
+        net_number: int,
+        segment_number: int,
+    ) -> None:
+        """Draw an arc as polyline segments, visualized as a single true arc."""
+        points = arc.to_points(segment_number)
+        for i in range(len(points) - 1):
+            layer = self._output_segment(
+                x1=points[i].x,
+                y1=points[i].y,
+                x2=points[i + 1].x,
+                y2=points[i + 1].y,
+                line_width=arc.width,
+                layer_index=layer_index,
+                net_number=net_number,
+            )
+
+        if self._builder is not None:
+            if len(points) > 1:
+                self._builder.add_arc(
+                    arc.center.x,
+                    arc.center.y,
+                    arc.radius,
+                    arc.start_angle,
+                    arc.end_angle,
+                    arc.width,
+                    layer_index,
+                )
+            return
 
         # Add to visualizer if present
-        if self.visualizer:
-            self.visualizer.add_line(x1, y1, x2, y2, line_width, layer)
+        if self.visualizer and len(points) > 1:
+            self.visualizer.add_arc(
+                arc.center.x,
+                arc.center.y,
+                arc.radius,
+                arc.start_angle,
+                arc.end_angle,
+                arc.width,
+                layer,
+            )
 
     def draw_polyline_arc(
         self,
@@ -98,18 +267,7 @@ class PCBdraw:
             end_angle=end_angle,
             width=line_width,
         )
-
-        points = arc.to_points(segment_number)
-        for i in range(len(points) - 1):
-            self.drawline(
-                x1=points[i].x,
-                y1=points[i].y,
-                x2=points[i + 1].x,
-                y2=points[i + 1].y,
-                line_width=line_width,
-                layer_index=layer_index,
-                net_number=net_number,
-            )
+        self._draw_arc(arc, layer_index, net_number, segment_number)
 
     def draw_via(
         self,
@@ -122,6 +280,18 @@ class PCBdraw:
         layer_index_2: int,
     ) -> None:
         """Draw via."""
+        if self._builder is not None:
+            self._builder.add_via(
+                x,
+                y,
+                via_size,
+                drill_size,
+                layer_index_1,
+                layer_index_2,
+                net_number,
+            )
+            return
+
         via = Via(
             position=Point(x, y),
             size=via_size,
@@ -134,13 +304,21 @@ class PCBdraw:
         if self.visualizer:
             self.visualizer.add_via(x, y, via_size)
 
-    def draw_helix(self, params: HelixParams) -> None:
+    @timed_call
+    def draw_helix(self, params: "HelixParams") -> DrawNode:
         """Draw helix coil pattern.
 
         Args:
             params: HelixParams object containing all parameters
 
+        Returns:
+            Node owning the coil's elements (editable in file mode)
+
         """
+        return self._add_node(params)
+
+    def _draw_helix(self, params: "HelixParams") -> None:
+        """Draw the elements of a helix coil."""
         p = params
         # angle of the port openings
         port_angle = (
@@ -220,15 +398,24 @@ class PCBdraw:
                     net_number=p.net_number,
                 )
 
+    @timed_call
     def draw_helix_rectangle(
         self,
-        params: HelixRectangleParams,
-    ) -> None:
+        params: "HelixRectangleParams",
+    ) -> DrawNode:
         """Draw a rectangle with rounded corners for each layer in layer_index_list.
 
         If port_gap > 0, creates ports (gaps) on the right side of the rectangle
         with tabs extending outward for layer connections.
+
+        Returns:
+            Node owning the coil's elements (editable in file mode)
+
         """
+        return self._add_node(params)
+
+    def _draw_helix_rectangle(self, params: "HelixRectangleParams") -> None:
+        """Draw the elements of a rectangular helix coil."""
         corners = [
             Point(
                 params.x0 - params.width / Math.HALF_DIVISOR,
@@ -406,17 +593,9 @@ class PCBdraw:
                     end_angle=end_angle,
                     width=params.track_width,
                 )
-                points = arc.to_points(params.segment_number)
-                for j in range(len(points) - 1):
-                    self.drawline(
-                        x1=points[j].x,
-                        y1=points[j].y,
-                        x2=points[j + 1].x,
-                        y2=points[j + 1].y,
-                        line_width=params.track_width,
-                        layer_index=layer_index,
-                        net_number=params.net_number,
-                    )
+                self._draw_arc(
+                    arc, layer_index, params.net_number, params.segment_number
+                )
 
             # Draw connection tabs and vias if ports are enabled
             if params.port_gap > 0:
@@ -474,6 +653,717 @@ class PCBdraw:
                         layer_index_2=next_layer,
                     )
 
+    @timed_call
+    def draw(self, params: "CoilParams") -> DrawNode:
+        """Draw a coil pattern, dispatching on the parameter model type.
+
+        In file mode with a cache, the coil's elements are reused from the
+        cache when the same coil was drawn before with the same stackup.
+
+        Args:
+            params: HelixParams or HelixRectangleParams object
+
+        Returns:
+            Node owning the coil's elements (editable in file mode)
+
+        """
+        return self._add_node(params)
+
+    async def adraw(
+        self, params: "CoilParams", executor: Optional["Executor"] = None
+    ) -> DrawNode:
+        """Draw a coil like :meth:`draw`, in an executor.
+
+        Args:
+            params: HelixParams or HelixRectangleParams object
+            executor: Thread pool to run in (default: see
+                :func:`kicad_draw.aio.set_executor`)
+
+        Returns:
+            Node owning the coil's elements (editable in file mode)
+
+        """
+        from kicad_draw import aio
+
+        return await aio.run(self.draw, params, executor=executor, threads=True)
+
+    def _draw_params(self, params: "CoilParams") -> None:
+        """Draw the elements of a coil pattern."""
+        from kicad_draw.models import HelixParams, HelixRectangleParams
+
+        if isinstance(params, HelixParams):
+            self._draw_helix(params)
+        elif isinstance(params, HelixRectangleParams):
+            self._draw_helix_rectangle(params)
+        else:
+            raise TypeError(f"Unsupported parameter model: {type(params).__name__}")
+
+    @timed_call
+    def draw_array(
+        self,
+        params: "CoilParams",
+        grid: Tuple[int, int],
+        pitch: Tuple[float, float],
+        net_step: int = 1,
+    ) -> DrawNode:
+        """Draw copies of a coil on a rectangular grid.
+
+        The coil is drawn once and its geometry is broadcast to all grid
+        positions in one vectorized operation; the copies are formatted in
+        bulk. The first copy is at the coil's own position.
+
+        Args:
+            params: Coil parameters (HelixParams or HelixRectangleParams)
+            grid: Number of (rows, columns); rows go along Y, columns along X
+            pitch: Distance between (columns, rows), i.e. X and Y pitch
+            net_step: Net number increment from one copy to the next, in
+                row-major order (0 puts all copies on the coil's net)
+
+        Returns:
+            Node owning all copies (editable in file mode)
+
+        """
+        rows, columns = grid
+        pitch_x, pitch_y = pitch
+        grid_placements(rows, columns, pitch_x, pitch_y)  # Validate now
+        return self._add_node(
+            params,
+            lambda p: grid_placements(rows, columns, pitch_x, pitch_y),
+            net_step,
+        )
+
+    @timed_call
+    def draw_polar_array(
+        self,
+        params: "CoilParams",
+        count: int,
+        radius: float,
+        center: Optional[Tuple[float, float]] = None,
+        start_angle: float = 0.0,
+        rotate: bool = True,
+        net_step: int = 1,
+    ) -> DrawNode:
+        """Draw copies of a coil evenly spaced on a circle.
+
+        The coil center (x0, y0) is moved onto the circle; the coil is drawn
+        once and broadcast to all positions like :meth:`draw_array`.
+
+        Args:
+            params: Coil parameters (HelixParams or HelixRectangleParams)
+            count: Number of copies
+            radius: Circle radius
+            center: Circle center (default: the coil center)
+            start_angle: Angle of the first copy in radians
+            rotate: Whether to rotate the copies to follow the circle
+            net_step: Net number increment from one copy to the next
+
+        Returns:
+            Node owning all copies (editable in file mode)
+
+        """
+        if center is None:
+            center = (params.x0, params.y0)
+        center = (float(center[0]), float(center[1]))
+        polar_placements(count, radius, center, center)  # Validate now
+        return self._add_node(
+            params,
+            lambda p: polar_placements(
+                count, radius, (p.x0, p.y0), center, start_angle, rotate
+            ),
+            net_step,
+        )
+
+    def _add_node(
+        self,
+        params: "CoilParams",
+        layout: Optional[Callable[["CoilParams"], np.ndarray]] = None,
+        net_step: int = 0,
+    ) -> DrawNode:
+        """Draw a coil (or an array of it) as a new node at the end of the output."""
+        if net_step < 0:
+            raise ValueError(f"net_step must be non-negative, got {net_step}")
+        if self.mode != "file":
+            node = DrawNode(self, params, False, layout, net_step)
+            if layout is None:
+                self._draw_params(params)
+            else:
+                elements, svg_elements = self._node_output(node)
+                for s_expr in elements:
+                    self._output(s_expr)
+                if self.visualizer is not None:
+                    self.visualizer.add_elements(svg_elements)
+            return node
+
+        if self.spill is not None:
+            # Spilled nodes are neither kept in memory nor editable
+            node = DrawNode(self, params, False, layout, net_step)
+            group = self._node_group(node, node._copies())
+            node._group = None
+            with self._stage("spill"):
+                self.spill.append(group)
+            return node
+
+        node = DrawNode(self, params, True, layout, net_step)
+        self._render_node(node)
+        node._span = self._append_block(self.elements, node._elements)
+        if self.visualizer is not None:
+            start = len(self.visualizer.elements)
+            with self._stage("visualize"):
+                self.visualizer.add_elements(node._svg_elements)
+            node._svg_span = (start, len(self.visualizer.elements))
+        self.nodes.append(node)
+        self._check_memory()
+        return node
+
+    @staticmethod
+    def _append_block(buffer: list, block: list) -> Tuple[int, int]:
+        """Append a block to a buffer and return its (start, stop) range."""
+        start = len(buffer)
+        buffer.extend(block)
+        return start, len(buffer)
+
+    def capture(self, params: "CoilParams") -> ElementGroup:
+        """Draw a coil into an ElementGroup instead of the output.
+
+        Args:
+            params: HelixParams or HelixRectangleParams object
+
+        Returns:
+            The coil's geometry, with layers as indices into this stackup
+
+        """
+        builder = GroupBuilder()
+        self._builder = builder
+        try:
+            with self._stage("geometry"):
+                self._draw_params(params)
+                group = builder.build()
+        finally:
+            self._builder = None
+        if self.stats is not None:
+            self.stats.count("segments", len(group.segments))
+            self.stats.count("vias", len(group.vias))
+            self.stats.count("arcs", len(group.arcs))
+
+        used = np.concatenate(
+            (group.segments["layer"], group.vias["layer1"], group.vias["layer2"])
+        )
+        if used.size and not self.layer_manager.validate_layers(
+            [int(used.min()), int(used.max())]
+        ):
+            raise ValueError(f"Invalid layer indices: {sorted(set(used.tolist()))}")
+        return group
+
+    def _render_node(self, node: DrawNode) -> None:
+        """Generate the s-expressions and visualizer elements of a node."""
+        node._elements, node._svg_elements = self._node_output(node)
+        node._dirty = False
+        if self.stats is not None:
+            self.stats.count("nodes_rendered")
+            self.stats.count("elements", len(node._elements))
+
+    def _node_output(self, node: DrawNode) -> Tuple[List[str], List[dict]]:
+        """Format the elements and visualizer elements of a node."""
+        layers = self.layer_manager.layers
+        svg = self.visualizer is not None
+        copies = node._copies()
+        plain = node._transform is None and node._net is None and not node._flipped
+        if plain and copies is None:
+            # Plain coil: reusable from the cache, no need to keep the geometry
+            node._group = None
+            key = entry = None
+            if self.cache is not None:
+                with self._stage("cache"):
+                    key = self.cache.key(node.params, layers, formatter=self.formatter)
+                    entry = self.cache.get(key, svg=svg)
+                if self.stats is not None:
+                    self.stats.count("cache_misses" if entry is None else "cache_hits")
+            if entry is not None:
+                return entry.elements, entry.svg_elements or []
+            group = self.capture(node.params)
+            with self._stage("format"):
+                elements = group.format(layers, self.formatter)
+            svg_elements = []
+            if svg:
+                with self._stage("visualize"):
+                    svg_elements = group.visual_elements(layers)
+            if key is not None:
+                with self._stage("cache"):
+                    self.cache.put(key, elements, svg_elements if svg else None)
+            return elements, svg_elements
+
+        group = self._node_group(node, copies)
+        with self._stage("format"):
+            elements = group.format(layers, self.formatter)
+        if not svg:
+            return elements, []
+        with self._stage("visualize"):
+            return elements, group.visual_elements(layers)
+
+    def _node_group(self, node: DrawNode, copies: Optional[tuple]) -> ElementGroup:
+        """Geometry of a node with its copies, net, flip and transform applied."""
+        if node._group is None:
+            node._group = self.capture(node.params)
+        group = node._group
+        with self._stage("transform"):
+            if copies is not None:
+                group = group.tile(*copies)
+            if node._net is not None:
+                group = group.with_net(node._net)
+            if node._flipped:
+                group = group.remap_layers(flip_layers(self._layer_count))
+            if node._transform is not None:
+                group = group.transformed(node._transform)
+        return group
+
+    def refresh(self) -> None:
+        """Regenerate edited nodes and splice their output into place.
+
+        Only dirty nodes are redrawn; the elements of all other nodes, and
+        elements drawn directly with the low-level methods, are reused. Called
+        automatically before exporting, saving and rendering.
+        """
+        if not self._dirty_nodes:
+            return
+        self._dirty_nodes = False
+        with self._stage("refresh"):
+            self._refresh_nodes()
+        self._check_memory()
+
+    def _refresh_nodes(self) -> None:
+        """Rebuild the element buffers around the nodes' ranges."""
+        visualizer = self.visualizer
+        old_svg = visualizer.elements if visualizer is not None else []
+        elements: List[str] = []
+        svg_elements: List[dict] = []
+        pos = svg_pos = 0
+        nodes = []
+        for node in self.nodes:
+            # Keep whatever was drawn between the previous node and this one
+            elements.extend(self.elements[pos : node._span[0]])
+            svg_elements.extend(old_svg[svg_pos : node._svg_span[0]])
+            pos, svg_pos = node._span[1], node._svg_span[1]
+            if node._removed:
+                continue
+            if node._dirty:
+                self._render_node(node)
+            visible = node._visible
+            node._span = self._append_block(elements, node._elements if visible else [])
+            node._svg_span = self._append_block(
+                svg_elements, node._svg_elements if visible else []
+            )
+            nodes.append(node)
+        elements.extend(self.elements[pos:])
+        svg_elements.extend(old_svg[svg_pos:])
+
+        self.elements = elements
+        self.nodes = nodes
+        if visualizer is not None:
+            visualizer.set_elements(svg_elements)
+
+    @timed_call
+    def define_cell(self, name: str, params: Optional["CoilParams"] = None) -> Cell:
+        """Define a cell that can be placed many times by reference.
+
+        The coil is drawn once, in its own coordinates: placements rotate
+        about the origin, so coils are usually defined with ``x0 = y0 = 0``.
+
+        Args:
+            name: Unique cell name
+            params: Coil drawn into the cell (None for an empty cell that
+                only holds references to other cells)
+
+        Returns:
+            The new cell
+
+        """
+        if name in self.cells:
+            raise ValueError(f"Cell {name!r} is already defined")
+        cell = Cell(name, None if params is None else self.capture(params))
+        self.cells[name] = cell
+        return cell
+
+    @timed_call
+    def place(
+        self,
+        cell: Cell,
+        x: float = 0.0,
+        y: float = 0.0,
+        rotation: float = 0.0,
+        net: Optional[int] = None,
+        flip: bool = False,
+    ) -> CellReference:
+        """Place a cell on the board by reference.
+
+        In file mode only the reference is stored; placed cells are flattened
+        when exporting and emitted after the directly drawn elements. In print
+        mode the placed elements are printed right away.
+
+        Args:
+            cell: Cell to place
+            x: X position of the cell origin
+            y: Y position of the cell origin
+            rotation: Counter-clockwise rotation about the cell origin in radians
+            net: Net for all placed elements (None keeps the cell's nets)
+            flip: Place the cell on the bottom side: mirrored left to right
+                with its layers reversed (F.Cu and B.Cu swap)
+
+        Returns:
+            The reference, whose attributes can still be changed before export
+
+        """
+        reference = CellReference(cell, x, y, rotation, net, flip)
+        if self.mode != "file":
+            for s_expr in flatten([reference], self._layer_count).format(
+                self.layer_manager.layers, self.formatter
+            ):
+                self._output(s_expr)
+        else:
+            self.references.append(reference)
+        return reference
+
+    @timed_call
+    def save_footprint(
+        self,
+        source: Union[Cell, "CoilParams"],
+        filename: str,
+        name: Optional[str] = None,
+    ) -> None:
+        """Save a coil as a KiCad footprint library file (``.kicad_mod``).
+
+        Straight tracks become copper ``fp_line`` items on their layers, arcs
+        become ``fp_arc`` items and vias become plated through-hole pads.
+        Coordinates are those of the coil, so coils are usually drawn around
+        the origin (``x0 = y0 = 0``).
+
+        Args:
+            source: Cell, or coil parameters drawn for the footprint
+            filename: Output ``.kicad_mod`` filename
+            name: Footprint name (default: the cell name or the file name)
+
+        """
+        if isinstance(source, Cell):
+            group = source.flatten(self._layer_count)
+            default_name = source.name
+        else:
+            group = self.capture(source)
+            default_name = os.path.splitext(os.path.basename(filename))[0]
+        body = footprint_body(group, self.layer_manager.layers)
+        with open(filename, "w") as f:
+            f.write(format_kicad_mod(name or default_name, body))
+        print(f"Footprint saved to {filename}")
+
+    @timed_call
+    def place_footprint(
+        self,
+        cell: Cell,
+        x: float = 0.0,
+        y: float = 0.0,
+        rotation: float = 0.0,
+        net: Optional[int] = None,
+        reference: Optional[str] = None,
+    ) -> FootprintReference:
+        """Place a cell on the board as a footprint.
+
+        The footprint body is formatted once per cell and shared by all its
+        placements; arcs stay single ``fp_arc`` items, which keeps repeated
+        coils much smaller than their segments. Footprints are emitted after
+        all other elements.
+
+        Args:
+            cell: Cell to place (see :meth:`define_cell`)
+            x: X position of the footprint anchor (the cell origin)
+            y: Y position of the footprint anchor
+            rotation: Counter-clockwise rotation in radians, as for :meth:`place`
+            net: Net of all pads (None keeps the nets of the vias)
+            reference: Reference designator (default: "L1", "L2", ...)
+
+        Returns:
+            The placement
+
+        """
+        if reference is None:
+            reference = f"L{len(self.footprints) + 1}"
+        placement = FootprintReference(cell, x, y, rotation, net, reference)
+        if self.mode != "file":
+            body = footprint_body(
+                cell.flatten(self._layer_count), self.layer_manager.layers
+            )
+            self._output(format_footprint_instance(cell.name, body, placement))
+        else:
+            self.footprints.append(placement)
+        return placement
+
+    @property
+    def _layer_count(self) -> int:
+        """Number of copper layers of the stackup."""
+        return len(self.layer_manager.layers)
+
+    def memory_usage(self) -> Dict[str, int]:
+        """Bytes held by each element store, estimated from object sizes.
+
+        Returns:
+            Bytes of "elements" (s-expressions), "visualizer" (visualizer
+            elements), "nodes" (per-node output and geometry kept for
+            editing), "cells" (cell geometry), "spill" (spilled elements not
+            written to disk yet) and their "total"
+
+        """
+        nodes = 0
+        for node in self.nodes:
+            # The node's strings are those of self.elements
+            nodes += sys.getsizeof(node._elements) + visual_bytes(node._svg_elements)
+            if node._group is not None:
+                nodes += node._group.nbytes
+        usage = {
+            "elements": strings_bytes(self.elements),
+            "visualizer": (
+                visual_bytes(self.visualizer.elements) if self.visualizer else 0
+            ),
+            "nodes": nodes,
+            "cells": sum(cell.nbytes for cell in self.cells.values()),
+            "spill": self.spill.buffered_bytes if self.spill is not None else 0,
+        }
+        usage["total"] = sum(usage.values())
+        return usage
+
+    def spill_to(
+        self,
+        directory: Optional[str] = None,
+        chunk_elements: int = DEFAULT_CHUNK_ELEMENTS,
+    ) -> SpillStore:
+        """Write the elements of later high-level drawing calls to disk.
+
+        From now on, coils and arrays drawn in file mode go to a
+        :class:`~kicad_draw.spill.SpillStore` instead of the in-memory
+        buffers. They are written after the in-memory elements on export,
+        are not visualized and return nodes that cannot be edited.
+
+        Args:
+            directory: Directory of the store; a temporary directory, removed
+                when the store is closed, if None
+            chunk_elements: Output elements per chunk written and read back
+
+        Returns:
+            The spill store
+
+        """
+        if self.mode != "file":
+            raise ValueError("Spilling to disk requires file mode")
+        if self.spill is not None:
+            raise ValueError(f"Already spilling to {self.spill.directory}")
+        self.spill = SpillStore(directory, chunk_elements)
+        return self.spill
+
+    def set_memory_budget(self, limit: Optional[int], on_exceed: str = "raise") -> None:
+        """Limit the memory held by the element stores.
+
+        The budget is checked right away and after every high-level drawing
+        call in file mode (see :mod:`kicad_draw.memory`); the call that
+        crossed the budget has drawn its elements when the error is raised.
+
+        Args:
+            limit: Budget in bytes, or None to remove it
+            on_exceed: "raise" to fail fast with MemoryBudgetExceeded,
+                "drop_visualization" to disable visualization and free its
+                elements first, raising only if that is not enough, or
+                "spill" to write later drawing calls to a temporary
+                :meth:`spill_to` store instead of raising
+
+        """
+        self.memory_budget = None if limit is None else MemoryBudget(limit, on_exceed)
+        self._check_memory()
+
+    def _check_memory(self) -> None:
+        """Apply the memory budget, if any."""
+        budget = self.memory_budget
+        if budget is None or (self.spill is not None and budget.on_exceed == "spill"):
+            return
+        count = len(self.elements)
+        if self.visualizer is not None:
+            count += len(self.visualizer.elements)
+        usage = budget.check(count, self.memory_usage)
+        if usage is None:
+            return
+        if budget.on_exceed == "spill":
+            print(
+                f"Warning: memory budget exceeded, {format_usage(usage)}; "
+                "spilling new elements to disk"
+            )
+            self.spill_to()
+            return
+        if budget.on_exceed == "drop_visualization" and self.visualizer is not None:
+            print(
+                f"Warning: memory budget exceeded, {format_usage(usage)}; "
+                "disabling visualization"
+            )
+            self.disable_visualization()
+            for node in self.nodes:
+                node._svg_elements = []
+            usage = budget.check(len(self.elements), self.memory_usage, force=True)
+            if usage is None:
+                return
+        raise MemoryBudgetExceeded(budget.limit, usage)
+
+    def _output_elements(self) -> List[str]:
+        """All s-expressions of the board, with placed cells flattened."""
+        self.refresh()
+        if not self.references and not self.footprints and self.spill is None:
+            return self.elements
+        elements = []
+        for block in self._output_blocks():
+            elements += block
+        return elements
+
+    def _output_blocks(self) -> Iterator[List[str]]:
+        """All s-expressions of the board in blocks, spilled chunks streamed."""
+        self.refresh()
+        yield self.elements
+        if self.spill is not None:
+            for group in self.spill.chunks():
+                with self._stage("spill"):
+                    block = group.format(self.layer_manager.layers, self.formatter)
+                yield block
+        if not self.references and not self.footprints:
+            return
+        with self._stage("flatten"):
+            elements = []
+            if self.references:
+                flat = flatten(self.references, self._layer_count)
+                elements += flat.format(self.layer_manager.layers, self.formatter)
+            elements += self._footprint_instances()
+        yield elements
+
+    def _footprint_instances(self) -> List[str]:
+        """Formatted footprint instances, with one body per distinct cell."""
+        bodies = {}
+        instances = []
+        for placement in self.footprints:
+            cell = placement.cell
+            if id(cell) not in bodies:
+                bodies[id(cell)] = footprint_body(
+                    cell.flatten(self._layer_count), self.layer_manager.layers
+                )
+            instances.append(
+                format_footprint_instance(cell.name, bodies[id(cell)], placement)
+            )
+        return instances
+
+    def snapshot(self) -> "Snapshot":
+        """Collect the geometry of the whole board in drawing order.
+
+        Nodes contribute their captured geometry (so arcs stay true arcs for
+        the visualizer); elements drawn with the low-level methods are read
+        back from their s-expressions. Spilled elements and placed cells
+        follow, as on export.
+
+        Returns:
+            Snapshot of the board, with footprint instances kept as text
+
+        """
+        from kicad_draw.snapshot import Snapshot, parse_elements
+
+        self.refresh()
+        layers = self.layer_manager.layers
+        groups = []
+        footprints = []
+
+        def add_elements(elements: List[str]) -> None:
+            """Add elements drawn outside of nodes."""
+            plain = [e for e in elements if not e.startswith("(footprint")]
+            footprints.extend(e for e in elements if e.startswith("(footprint"))
+            if plain:
+                groups.append(parse_elements(plain, layers))
+
+        pos = 0
+        for node in self.nodes:
+            add_elements(self.elements[pos : node._span[0]])
+            pos = node._span[1]
+            if node._visible:
+                kept = node._group
+                groups.append(self._node_group(node, node._copies()))
+                node._group = kept
+        add_elements(self.elements[pos:])
+        if self.spill is not None:
+            groups.extend(self.spill.chunks())
+        if self.references:
+            groups.append(flatten(self.references, self._layer_count))
+        footprints += self._footprint_instances()
+        group = ElementGroup.concatenate(groups)
+        return Snapshot(self.layer_manager.stackup, layers, group, footprints)
+
+    def save_snapshot(self, path: str) -> None:
+        """Save the geometry of the board as a binary snapshot.
+
+        The snapshot (see :mod:`kicad_draw.snapshot`) holds all segments,
+        vias, nets, layers and the stackup in an uncompressed NPZ file whose
+        arrays can be memory-mapped when it is read. This method only works
+        when in file mode.
+
+        Args:
+            path: Output file path
+
+        """
+        if self.mode != "file":
+            print("Warning: Not in file mode. Use set_mode('file') first.")
+            return
+        from kicad_draw.snapshot import write_snapshot
+
+        with self._stage("snapshot"):
+            write_snapshot(path, self.snapshot())
+
+    @classmethod
+    def load_snapshot(
+        cls, path: str, mmap: bool = True, enable_visualization: bool = True
+    ) -> "PCBdraw":
+        """Create a PCB in file mode from a snapshot file.
+
+        The elements are formatted from the snapshot's arrays; they are not
+        editable nodes, and footprint instances are not visualized. To work on
+        the arrays without formatting them, use
+        :func:`kicad_draw.snapshot.read_snapshot` instead.
+
+        Args:
+            path: Snapshot file written by :meth:`save_snapshot`
+            mmap: Memory-map the snapshot's arrays while reading them
+            enable_visualization: Whether to fill a visualizer too
+
+        Returns:
+            The PCB holding the snapshot's elements
+
+        """
+        from kicad_draw.snapshot import read_snapshot
+
+        snapshot = read_snapshot(path, mmap)
+        pcb = cls(
+            snapshot.stackup, mode="file", enable_visualization=enable_visualization
+        )
+        if pcb.layer_manager.layers != snapshot.layers:
+            raise ValueError(
+                f"Snapshot layers {snapshot.layers} do not match the "
+                f"{snapshot.stackup} stackup {pcb.layer_manager.layers}"
+            )
+        pcb.elements = snapshot.elements(pcb.formatter)
+        if pcb.visualizer is not None:
+            pcb.visualizer.add_elements(snapshot.visual_elements())
+        return pcb
+
+    def _scene_visualizer(self) -> "PCBVisualizer":
+        """The visualizer, with placed cells flattened into a copy of it."""
+        self.refresh()
+        placed = self.references + self.footprints
+        if not placed:
+            return self.visualizer
+        with self._stage("flatten"):
+            flat = flatten(placed, self._layer_count)
+            visualizer = copy.copy(self.visualizer)
+            visualizer.visible_layers = set(self.visualizer.visible_layers)
+            visualizer.set_elements(
+                self.visualizer.elements
+                + flat.visual_elements(self.layer_manager.layers)
+            )
+        return visualizer
+
     def open_pcbfile(self, path):
         """Open pcb file **(not used yet)**."""
         try:
@@ -495,44 +1385,129 @@ class PCBdraw:
         if mode != self.mode:
             self.mode = mode
             self.elements = []  # Always clear buffer when switching modes
+            self.nodes = []
+            self._dirty_nodes = False
+            self.references = []
+            self.footprints = []
+            if self.spill is not None:
+                self.spill.close()
+                self.spill = None
 
     def save(self, output_path: str, template_path: str = "asset.kicad_pcb") -> None:
         """Save PCB elements to a KiCad PCB file using a template.
 
-        This method only works when in file mode.
+        This method only works when in file mode. Elements are written block
+        by block, so spilled elements are streamed from disk.
         """
         if self.mode != "file":
             print("Warning: Not in file mode. Use set_mode('file') first.")
             return
 
+        with self._stage("save"):
+            template = self._read_template(template_path)
+            if template is None:
+                return
+            written = 0
+            with open(output_path, "w") as f:
+                for chunk in self._board_chunks(*template):
+                    written += f.write(chunk)
+        if self.stats is not None:
+            self.stats.count("chars_written", written)
+
+        print(f"PCB elements saved to {output_path}")
+
+    async def asave(
+        self,
+        output_path: str,
+        template_path: str = "asset.kicad_pcb",
+        executor: Optional["Executor"] = None,
+    ) -> None:
+        """Save like :meth:`save` without blocking the event loop.
+
+        The elements are formatted and written chunk by chunk in the executor
+        (see :mod:`kicad_draw.aio`).
+
+        Args:
+            output_path: Output KiCad PCB file
+            template_path: KiCad PCB template
+            executor: Thread pool to run in (default: see
+                :func:`kicad_draw.aio.set_executor`)
+
+        """
+        from kicad_draw import aio
+
+        if self.mode != "file":
+            print("Warning: Not in file mode. Use set_mode('file') first.")
+            return
+        template = await aio.run(
+            self._read_template, template_path, executor=executor, threads=True
+        )
+        if template is None:
+            return
+        written = await aio.write_text(
+            output_path, self._board_chunks(*template), executor
+        )
+        if self.stats is not None:
+            self.stats.count("chars_written", written)
+
+        print(f"PCB elements saved to {output_path}")
+
+    @staticmethod
+    def _read_template(template_path: str) -> Optional[Tuple[str, int]]:
+        """Read a template and find where the elements are inserted.
+
+        Returns:
+            The template content and the position of its last closing
+            parenthesis, or None (with a message) if it is missing or invalid
+
+        """
         try:
             with open(template_path, "r") as f:
                 template_content = f.read()
         except FileNotFoundError:
             print(f"Template file {template_path} not found.")
-            return
+            return None
 
         # Find the last closing parenthesis of the file
         last_closing = template_content.rstrip().rfind(")")
         if last_closing == -1:
             print("Invalid template file format.")
-            return
+            return None
+        return template_content, last_closing
+
+    def _board_chunks(self, template_content: str, last_closing: int) -> Iterator[str]:
+        """Text of the saved board in pieces, formatted as they are consumed."""
+        # Insert our elements before the last closing parenthesis
+        yield template_content[:last_closing] + "\n"
+        size = Defaults.SAVE_CHUNK_ELEMENTS
+        separator = ""
+        for block in self._output_blocks():
+            for start in range(0, len(block), size):
+                yield separator + "\n".join(block[start : start + size])
+                separator = "\n"
+        yield "\n" + template_content[last_closing:]
+
+    def _merge_template(self, template_content: str) -> Optional[str]:
+        """Insert collected elements into KiCad PCB template content.
+
+        Returns:
+            The merged PCB file content, or None if the template is invalid
+
+        """
+        # Find the last closing parenthesis of the file
+        last_closing = template_content.rstrip().rfind(")")
+        if last_closing == -1:
+            return None
 
         # Insert our elements before the last closing parenthesis
-        new_content = (
+        return (
             template_content[:last_closing]
             + "\n"
-            + "\n".join(self.elements)
+            + "\n".join(self._output_elements())
             + "\n"
             + template_content[last_closing:]
         )
 
-        # Write the modified content to the output file
-        with open(output_path, "w") as f:
-            f.write(new_content)
-
-        print(f"PCB elements saved to {output_path}")
-
     def enable_visualization(
         self,
         width: float = Defaults.CANVAS_WIDTH,
@@ -548,6 +1523,8 @@ class PCBdraw:
         from .visualizer import PCBVisualizer
 
         self.visualizer = PCBVisualizer(width, height)
+        for node in self.nodes:
+            node._svg_span = (0, 0)
 
     def disable_visualization(self) -> None:
         """Disable SVG visualization to save memory."""
@@ -563,7 +1540,73 @@ class PCBdraw:
         if not self.visualizer:
             print("Visualization not enabled. Call enable_visualization() first.")
             return
-        self.visualizer.save_svg(filename)
+        with self._stage("svg"):
+            self._scene_visualizer().save_svg(filename)
+
+    async def asave_svg(
+        self, filename: str, executor: Optional["Executor"] = None
+    ) -> None:
+        """Save the visualization like :meth:`save_svg` without blocking.
+
+        Args:
+            filename: Output SVG filename
+            executor: Thread pool to run in (default: see
+                :func:`kicad_draw.aio.set_executor`)
+
+        """
+        from kicad_draw import aio
+
+        if not self.visualizer:
+            print("Visualization not enabled. Call enable_visualization() first.")
+            return
+        visualizer = await aio.run(
+            self._scene_visualizer, executor=executor, threads=True
+        )
+        await visualizer.asave_svg(filename, executor)
+
+    def save_png(
+        self,
+        filename: str,
+        dpi: float = Defaults.RASTER_DPI,
+        antialias: bool = True,
+        max_size: Optional[int] = None,
+    ) -> None:
+        """Save current visualization as PNG file.
+
+        The raster preview uses the same layer colors and visibility state as
+        the SVG output, but its cost is bounded by the number of pixels.
+
+        Args:
+            filename: Output PNG filename
+            dpi: Output resolution in dots per inch
+            antialias: Whether to blend partially covered pixels
+            max_size: Optional limit for the longest image side in pixels
+
+        """
+        if not self.visualizer:
+            print("Visualization not enabled. Call enable_visualization() first.")
+            return
+        with self._stage("png"):
+            self._scene_visualizer().save_png(filename, dpi, antialias, max_size)
+
+    def save_html(self, filename: str, compress: bool = True) -> None:
+        """Save current visualization as a self-contained HTML viewer.
+
+        The page embeds a compact scene (quantized, delta-encoded coordinate
+        arrays) and renders it on a canvas with pan, zoom and layer toggles.
+
+        Args:
+            filename: Output HTML filename
+            compress: Whether to deflate-compress the embedded arrays
+
+        """
+        if not self.visualizer:
+            print("Visualization not enabled. Call enable_visualization() first.")
+            return
+        with self._stage("html"):
+            self._scene_visualizer().save_html(
+                filename, compress=compress, layer_order=self.layer_manager.layers
+            )
 
     def get_svg(self) -> str:
         """Get SVG string of current visualization.
@@ -576,15 +1619,52 @@ class PCBdraw:
             return ""
         # Pass the layer order from this PCB's stackup to the visualizer
         layer_order = self.layer_manager.layers
-        return self.visualizer.generate_svg(layer_order)
+        with self._stage("svg"):
+            return self._scene_visualizer().generate_svg(layer_order)
 
-    def show_svg(self) -> None:
-        """Display SVG in Jupyter notebook or print SVG string."""
+    async def aget_svg(self, executor: Optional["Executor"] = None) -> str:
+        """Get the SVG string like :meth:`get_svg`, rendered in an executor.
+
+        Args:
+            executor: Thread pool to run in (default: see
+                :func:`kicad_draw.aio.set_executor`)
+
+        Returns:
+            SVG string, or empty string if visualization not enabled
+
+        """
+        from kicad_draw import aio
+
+        return await aio.run(self.get_svg, executor=executor, threads=True)
+
+    def show_svg(self, progressive: bool = False) -> Optional["ProgressivePreview"]:
+        """Display SVG in Jupyter notebook or print SVG string.
+
+        Args:
+            progressive: If True, show a coarse raster preview immediately and
+                replace it with the full SVG once it has been generated in a
+                background thread. A previous progressive preview of this PCB
+                that is still refining is cancelled.
+
+        Returns:
+            The ProgressivePreview in progressive mode, otherwise None
+
+        """
         if not self.visualizer:
             print("Visualization not enabled. Call enable_visualization() first.")
-            return
+            return None
+
+        visualizer = self._scene_visualizer()
+        if progressive:
+            from .preview import ProgressivePreview
 
-        svg_content = self.visualizer.generate_svg()
+            self.cancel_preview()
+            self._preview = ProgressivePreview(
+                visualizer, self.layer_manager.layers
+            ).start()
+            return self._preview
+
+        svg_content = visualizer.generate_svg()
 
         # Try to display in Jupyter
         try:
@@ -595,6 +1675,13 @@ class PCBdraw:
             # Not in Jupyter, print SVG
             print("SVG content (save to .svg file to view):")
             print(svg_content)
+        return None
+
+    def cancel_preview(self) -> None:
+        """Cancel a progressive preview that is still refining."""
+        if self._preview is not None:
+            self._preview.cancel()
+            self._preview = None
 
     def show_layer(self, layer: str) -> None:
         """Show a specific layer in visualization.
@@ -717,7 +1804,8 @@ class PCBdraw:
         if self.mode != "file":
             print("Warning: Not in file mode. Use set_mode('file') first.")
             return ""
-        return "\n".join(self.elements)
+        with self._stage("export"):
+            return "\n".join(self._output_elements())
 
     def _parse_s_expressions_for_visualization(self) -> None:
         """Parse stored s-expressions and populate visualizer with elements."""
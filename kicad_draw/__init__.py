@@ -14,4 +14,49 @@ Main modules:
 - models: Parameter definitions for drawing operations
 - visualizer: SVG visualization system
 - geometry: Geometric primitives and calculations
+
+The main classes are also available from the package itself
+(``from kicad_draw import PCBdraw, HelixParams``). They are imported on first
+access, so importing the package alone does not load NumPy or Pydantic.
 """
+
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:
+    from kicad_draw.models import HelixParams, HelixRectangleParams
+    from kicad_draw.nodes import DrawNode
+    from kicad_draw.PCBmodule import PCBdraw
+    from kicad_draw.visualizer import PCBVisualizer
+
+# Public names and the submodule defining each of them
+_EXPORTS = {
+    "PCBdraw": "kicad_draw.PCBmodule",
+    "DrawNode": "kicad_draw.nodes",
+    "HelixParams": "kicad_draw.models",
+    "HelixRectangleParams": "kicad_draw.models",
+    "PCBVisualizer": "kicad_draw.visualizer",
+}
+
+__all__ = [
+    "PCBdraw",
+    "DrawNode",
+    "HelixParams",
+    "HelixRectangleParams",
+    "PCBVisualizer",
+]
+
+
+def __getattr__(name: str) -> Any:
+    """Import a public name from its submodule on first access."""
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    """List the module attributes, including the lazily imported names."""
+    return sorted(set(globals()) | set(__all__))
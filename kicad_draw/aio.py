@@ -0,0 +1,159 @@
+"""asyncio support: run drawing and output off the event loop.
+
+The ``a``-prefixed methods of :class:`~kicad_draw.PCBmodule.PCBdraw`
+(``adraw``, ``asave``, ``asave_svg``, ``aget_svg``) and
+:meth:`PCBVisualizer.asave_svg <kicad_draw.visualizer.PCBVisualizer.asave_svg>`
+run their CPU work in an executor and write files in chunks, each chunk in
+the executor, so the event loop keeps serving other tasks in between::
+
+    pcb = PCBdraw("default_4layer", mode="file")
+    await pcb.adraw(params)
+    await pcb.asave("board.kicad_pcb", "template.kicad_pcb")
+    svg = await pcb.aget_svg()
+
+:func:`draw_coils` draws many coils concurrently, e.g. in a process pool.
+
+Work goes to the ``executor`` passed to a call, else to the one set with
+:func:`set_executor`, else to the event loop's default executor. Calls that
+work on a PCB or an open file need threads: they fall back to the loop's
+default executor when given a process pool, which only :func:`draw_coils`
+uses. A PCB must not be used by other tasks while one of its async calls is
+running.
+"""
+
+import asyncio
+import functools
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Callable, Iterable, List, Optional, Sequence, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# Characters written per executor call when streaming files
+WRITE_CHUNK_CHARS = 1 << 20
+
+_executor: Optional[Executor] = None
+
+
+def set_executor(executor: Optional[Executor]) -> None:
+    """Set the default executor of the async calls.
+
+    Args:
+        executor: Thread or process pool, or None for the event loop's
+            default executor
+
+    """
+    global _executor
+    _executor = executor
+
+
+def get_executor() -> Optional[Executor]:
+    """Default executor of the async calls (None: the loop's default)."""
+    return _executor
+
+
+async def run(
+    function: Callable[..., T],
+    *args: Any,
+    executor: Optional[Executor] = None,
+    threads: bool = False,
+    **kwargs: Any,
+) -> T:
+    """Run a blocking function in an executor and await its result.
+
+    Args:
+        function: Function to call
+        *args: Positional arguments of the function
+        executor: Executor to use (default: see :func:`set_executor`)
+        threads: Whether the function shares objects with the caller, so a
+            process pool is replaced by the loop's default executor
+        **kwargs: Keyword arguments of the function
+
+    Returns:
+        The function's return value
+
+    """
+    executor = executor or _executor
+    if threads and isinstance(executor, ProcessPoolExecutor):
+        executor = None
+    loop = asyncio.get_running_loop()
+    call = functools.partial(function, *args, **kwargs)
+    return await loop.run_in_executor(executor, call)
+
+
+def _split(chunks: Iterable[str], size: int) -> Iterable[str]:
+    """Split text chunks into pieces of at most ``size`` characters."""
+    for chunk in chunks:
+        for start in range(0, len(chunk), size):
+            yield chunk[start : start + size]
+
+
+def _write_next(f, pieces) -> int:
+    """Write the next piece of an iterator, returning -1 when exhausted."""
+    piece = next(pieces, None)
+    return -1 if piece is None else f.write(piece)
+
+
+async def write_text(
+    path: str, chunks: Iterable[str], executor: Optional[Executor] = None
+) -> int:
+    """Write text to a file chunk by chunk without blocking the event loop.
+
+    The chunks are produced in the executor too, so they may be generated
+    lazily (e.g. formatted on the fly).
+
+    Args:
+        path: Output file path
+        chunks: Text chunks, written in order
+        executor: Executor to use (default: see :func:`set_executor`); a
+            process pool is replaced by the loop's default executor
+
+    Returns:
+        Number of characters written
+
+    """
+    pieces = iter(_split(chunks, WRITE_CHUNK_CHARS))
+    f = await run(open, path, "w", executor=executor, threads=True)
+    written = 0
+    try:
+        while True:
+            count = await run(_write_next, f, pieces, executor=executor, threads=True)
+            if count < 0:
+                return written
+            written += count
+    finally:
+        await run(f.close, executor=executor, threads=True)
+
+
+async def draw_coils(
+    coils: Sequence[Any],
+    stackup: str = "default_4layer",
+    svg: bool = False,
+    executor: Optional[Executor] = None,
+    limit: Optional[int] = None,
+) -> List[Tuple[List[str], Optional[List[dict]]]]:
+    """Draw coils concurrently in an executor.
+
+    Args:
+        coils: HelixParams or HelixRectangleParams objects
+        stackup: The PCB stackup configuration
+        svg: Whether to also return the visualizer elements
+        executor: Executor to use (default: see :func:`set_executor`); a
+            process pool draws coils in parallel
+        limit: Largest number of coils drawn at the same time (default: all)
+
+    Returns:
+        The s-expressions and visualizer elements (or None) of every coil, in
+        input order
+
+    """
+    from kicad_draw.generate import draw_coil_task
+    from kicad_draw.models import params_type_name
+
+    semaphore = asyncio.Semaphore(limit or max(1, len(coils)))
+
+    async def draw(params) -> Tuple[List[str], Optional[List[dict]]]:
+        task = (params_type_name(params), params.model_dump(), stackup, svg)
+        async with semaphore:
+            return await run(draw_coil_task, task, executor=executor)
+
+    return list(await asyncio.gather(*(draw(params) for params in coils)))
@@ -0,0 +1,335 @@
+"""Inductance estimates computed from generated coil geometry.
+
+The coil's segments and vias are treated as straight conductor pieces in
+3D, at the heights given by the stackup's layer spacing. The inductance is
+the sum of their partial inductances: the self term of every piece from
+Grover's formula for a straight conductor, and the mutual terms of every
+pair from the Neumann integral, evaluated with Gauss-Legendre quadrature::
+
+    L = sum_i L_i + 2 sum_{i<j} mu0 / (4 pi) (d_i . d_j) int int ds dt / |r_ij|
+
+Conductor cross-sections enter through their geometric mean distance (GMD):
+the distance in the integral is ``sqrt(|r_ij|^2 + g^2)``, which keeps pieces
+meeting at a corner finite. The pair terms are evaluated for blocks of pairs
+at once, so memory stays bounded for coils with thousands of segments.
+
+This is a low-frequency (DC current distribution) estimate that ignores the
+skin and proximity effects and any nearby copper; it is meant for screening
+coil variants, typically within a few percent of a field solver::
+
+    inductance = coil_inductance(params)  # nH
+    values = coil_inductances(expand_grid(base, {"radius": radii}), jobs=8)
+"""
+
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from kicad_draw.config import default_layers
+from kicad_draw.constants import Defaults
+from kicad_draw.group import ElementGroup
+from kicad_draw.models import PARAMS_TYPES, CoilParams, params_type_name
+from kicad_draw.PCBmodule import PCBdraw
+from kicad_draw.pool import map_tasks
+
+# mu0 / (4 pi) in nH/mm
+MU0_4PI = 0.1
+# GMD of a rectangular cross-section relative to its width plus thickness
+RECTANGLE_GMD = 0.2235
+# Pairs of pieces closer than this times their summed lengths use quadrature
+NEAR_DISTANCE = 3.0
+# Decimals of millimeters compared when matching element endpoints
+ENDPOINT_DECIMALS = 6
+
+
+def layer_heights(
+    stackup: str, layer_spacing: Optional[Sequence[float]] = None
+) -> np.ndarray:
+    """Heights of the copper layers of a stackup.
+
+    Args:
+        stackup: The PCB stackup configuration
+        layer_spacing: Distances between consecutive copper layers in mm
+            (default: the stackup's ``layer_spacing``)
+
+    Returns:
+        Depth of every layer below the top layer in mm, in layer index order
+
+    """
+    if stackup not in default_layers:
+        raise ValueError(f"Unknown stackup: {stackup}")
+    if layer_spacing is None:
+        layer_spacing = default_layers[stackup]["layer_spacing"]
+    spacing = np.asarray(layer_spacing, dtype=np.float64)
+    count = len(default_layers[stackup]["layer_list"])
+    if spacing.shape != (count - 1,) or not np.all(spacing > 0):
+        raise ValueError(
+            f"layer_spacing must be {count - 1} positive distances, "
+            f"got {list(layer_spacing)}"
+        )
+    return np.concatenate(([0.0], np.cumsum(spacing)))
+
+
+def conductor_pieces(
+    group: ElementGroup,
+    heights: np.ndarray,
+    thickness: float = Defaults.COPPER_THICKNESS,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Straight 3D conductor pieces of a coil, oriented along its path.
+
+    Segments become horizontal pieces at their layer's height and vias
+    vertical pieces between their two layers. The pieces must form a single
+    path (open or closed); each is oriented in the direction of a current
+    flowing from one end of the path to the other.
+
+    Args:
+        group: Geometry of the coil (see :meth:`PCBdraw.capture
+            <kicad_draw.PCBmodule.PCBdraw.capture>`)
+        heights: Layer heights from :func:`layer_heights`
+        thickness: Copper thickness in mm
+
+    Returns:
+        Start points (N, 3), end points (N, 3) and cross-section GMDs (N,)
+
+    """
+    segments, vias = group.segments, group.vias
+    # Zero-length segments (e.g. tabs with tab_gap 0) carry no inductance and
+    # would look like branches of the path
+    lengths = np.hypot(segments["x2"] - segments["x1"], segments["y2"] - segments["y1"])
+    segments = segments[lengths >= 10.0**-ENDPOINT_DECIMALS]
+    starts = np.concatenate(
+        (
+            np.column_stack((segments["x1"], segments["y1"])),
+            np.column_stack((vias["x"], vias["y"])),
+        )
+    )
+    ends = np.concatenate(
+        (
+            np.column_stack((segments["x2"], segments["y2"])),
+            np.column_stack((vias["x"], vias["y"])),
+        )
+    )
+    start_layers = np.concatenate((segments["layer"], vias["layer1"]))
+    end_layers = np.concatenate((segments["layer"], vias["layer2"]))
+    # Plated via barrels are tubes, whose GMD is their radius
+    gmd = np.concatenate(
+        (RECTANGLE_GMD * (segments["width"] + thickness), vias["drill"] / 2)
+    )
+    if not len(gmd):
+        raise ValueError("The coil has no conductors")
+
+    order, flipped = _path_order(starts, start_layers, ends, end_layers)
+    starts, ends = (
+        np.column_stack((starts, heights[start_layers])),
+        np.column_stack((ends, heights[end_layers])),
+    )
+    starts[flipped], ends[flipped] = ends[flipped], starts[flipped].copy()
+    return starts[order], ends[order], gmd[order]
+
+
+def _path_order(
+    starts: np.ndarray,
+    start_layers: np.ndarray,
+    ends: np.ndarray,
+    end_layers: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Walk the pieces end to end, returning their order and reversed ones."""
+    count = len(starts)
+    keys = np.concatenate(
+        (
+            np.column_stack((starts.round(ENDPOINT_DECIMALS), start_layers)),
+            np.column_stack((ends.round(ENDPOINT_DECIMALS), end_layers)),
+        )
+    )
+    _, nodes = np.unique(keys, axis=0, return_inverse=True)
+    nodes = nodes.reshape(-1)
+    start_nodes, end_nodes = nodes[:count], nodes[count:]
+    touching: Dict[int, List[int]] = {}
+    for piece, (a, b) in enumerate(zip(start_nodes.tolist(), end_nodes.tolist())):
+        touching.setdefault(a, []).append(piece)
+        touching.setdefault(b, []).append(piece)
+    if any(len(pieces) > 2 for pieces in touching.values()):
+        raise ValueError("The coil's conductors branch; expected a single path")
+
+    # Start at a terminal of an open path, anywhere on a closed one
+    node = next(
+        (node for node, pieces in touching.items() if len(pieces) == 1),
+        int(start_nodes[0]),
+    )
+    order: List[int] = []
+    flipped = np.zeros(count, dtype=bool)
+    visited = np.zeros(count, dtype=bool)
+    while True:
+        piece = next((p for p in touching[node] if not visited[p]), None)
+        if piece is None:
+            break
+        visited[piece] = True
+        order.append(piece)
+        if start_nodes[piece] == node:
+            node = int(end_nodes[piece])
+        else:
+            flipped[piece] = True
+            node = int(start_nodes[piece])
+    if len(order) != count:
+        raise ValueError("The coil's conductors are not connected as a single path")
+    return np.array(order), flipped
+
+
+def _pair_blocks(count: int, chunk_pairs: int) -> Iterator[Tuple[np.ndarray, ...]]:
+    """Index pairs i < j in blocks of at most ``chunk_pairs`` pairs."""
+    first, second = np.triu_indices(count, 1)
+    for start in range(0, len(first), chunk_pairs):
+        yield first[start : start + chunk_pairs], second[start : start + chunk_pairs]
+
+
+def partial_inductance(
+    starts: np.ndarray,
+    ends: np.ndarray,
+    gmd: np.ndarray,
+    order: int = Defaults.QUADRATURE_ORDER,
+    chunk_pairs: int = Defaults.INDUCTANCE_CHUNK_PAIRS,
+) -> float:
+    """Loop inductance of conductor pieces carrying the same current.
+
+    Args:
+        starts: Start points (N, 3) in mm, pieces oriented along the current
+        ends: End points (N, 3) in mm
+        gmd: Geometric mean distance of every piece's cross-section in mm
+        order: Gauss-Legendre points per piece in the mutual terms
+        chunk_pairs: Largest number of piece pairs evaluated at once
+
+    Returns:
+        Inductance in nH
+
+    """
+    if order < 1 or chunk_pairs < 1:
+        raise ValueError("order and chunk_pairs must be positive")
+    directions = ends - starts
+    lengths = np.linalg.norm(directions, axis=1)
+    total = float(np.sum(_self_inductance(lengths, gmd)))
+
+    nodes, weights = np.polynomial.legendre.leggauss(order)
+    quadrature = ((nodes + 1) / 2, np.outer(weights, weights) / 4)
+    middles = (starts + ends) / 2
+    mutual = 0.0
+    for i, j in _pair_blocks(len(starts), chunk_pairs):
+        dot = np.einsum("ij,ij->i", directions[i], directions[j])
+        # Perpendicular pieces (e.g. a via and a trace) do not couple
+        keep = dot != 0
+        i, j, dot = i[keep], j[keep], dot[keep]
+        offsets = middles[i] - middles[j]
+        r2 = np.einsum("ij,ij->i", offsets, offsets) + (gmd[i] ** 2 + gmd[j] ** 2) / 2
+        # Far apart pieces only need the value at their midpoints
+        near = r2 < (NEAR_DISTANCE * (lengths[i] + lengths[j])) ** 2
+        mutual += float(dot[~near] @ (1 / np.sqrt(r2[~near])))
+        i, j, dot = i[near], j[near], dot[near]
+        mutual += float(
+            dot @ _neumann_integral(starts, directions, gmd, i, j, dot, *quadrature)
+        )
+    return total + 2 * MU0_4PI * mutual
+
+
+def _neumann_integral(
+    starts: np.ndarray,
+    directions: np.ndarray,
+    gmd: np.ndarray,
+    i: np.ndarray,
+    j: np.ndarray,
+    dot: np.ndarray,
+    s: np.ndarray,
+    weights: np.ndarray,
+) -> np.ndarray:
+    """Mean of 1 / distance over pairs of pieces, by Gauss-Legendre quadrature."""
+    da, db = directions[i], directions[j]
+    c = starts[i] - starts[j]
+    # |c + s da - t db|^2 + g^2 expanded over the quadrature nodes s and t
+    r2 = (
+        (np.einsum("ij,ij->i", c, c) + (gmd[i] ** 2 + gmd[j] ** 2) / 2)[:, None, None]
+        + np.einsum("ij,ij->i", da, da)[:, None, None] * (s**2)[:, None]
+        + np.einsum("ij,ij->i", db, db)[:, None, None] * (s**2)[None, :]
+        + 2 * np.einsum("ij,ij->i", c, da)[:, None, None] * s[:, None]
+        - 2 * np.einsum("ij,ij->i", c, db)[:, None, None] * s[None, :]
+        - 2 * dot[:, None, None] * np.outer(s, s)
+    )
+    return np.einsum("puv,uv->p", 1 / np.sqrt(np.maximum(r2, 0) + 1e-30), weights)
+
+
+def _self_inductance(lengths: np.ndarray, gmd: np.ndarray) -> np.ndarray:
+    """Grover's partial self inductance of straight conductors in nH."""
+    u = lengths / gmd
+    return 2 * MU0_4PI * lengths * (np.arcsinh(u) - np.sqrt(1 + 1 / u**2) + 1 / u)
+
+
+def coil_inductance(
+    params: CoilParams,
+    stackup: str = "default_4layer",
+    layer_spacing: Optional[Sequence[float]] = None,
+    thickness: float = Defaults.COPPER_THICKNESS,
+    order: int = Defaults.QUADRATURE_ORDER,
+) -> float:
+    """Estimate the inductance of a coil.
+
+    Args:
+        params: HelixParams or HelixRectangleParams object
+        stackup: The PCB stackup configuration
+        layer_spacing: Distances between consecutive copper layers in mm
+            (default: the stackup's)
+        thickness: Copper thickness in mm
+        order: Gauss-Legendre points per piece in the mutual terms
+
+    Returns:
+        Inductance between the coil's two terminals in nH
+
+    """
+    heights = layer_heights(stackup, layer_spacing)
+    group = PCBdraw(stackup, mode="file", enable_visualization=False).capture(params)
+    return partial_inductance(*conductor_pieces(group, heights, thickness), order)
+
+
+def _coil_inductance(task: Tuple) -> float:
+    """Estimate the inductance of one coil of a batch."""
+    type_name, params_dict, stackup, layer_spacing, thickness, order = task
+    # Parameters were validated when the models were built
+    params = PARAMS_TYPES[type_name].model_construct(**params_dict)
+    return coil_inductance(params, stackup, layer_spacing, thickness, order)
+
+
+def coil_inductances(
+    coils: Sequence[CoilParams],
+    stackup: str = "default_4layer",
+    layer_spacing: Optional[Sequence[float]] = None,
+    thickness: float = Defaults.COPPER_THICKNESS,
+    order: int = Defaults.QUADRATURE_ORDER,
+    jobs: int = 1,
+) -> np.ndarray:
+    """Estimate the inductances of many coils, e.g. the variants of a sweep.
+
+    Args:
+        coils: HelixParams or HelixRectangleParams objects
+        stackup: The PCB stackup configuration
+        layer_spacing: Distances between consecutive copper layers in mm
+            (default: the stackup's)
+        thickness: Copper thickness in mm
+        order: Gauss-Legendre points per piece in the mutual terms
+        jobs: Number of worker processes (1 estimates in this process)
+
+    Returns:
+        Inductances in nH, in input order
+
+    """
+    if jobs < 1:
+        raise ValueError(f"jobs must be positive, got {jobs}")
+    layer_heights(stackup, layer_spacing)  # Validate now
+    spacing = None if layer_spacing is None else list(layer_spacing)
+    tasks = [
+        (
+            params_type_name(params),
+            params.model_dump(),
+            stackup,
+            spacing,
+            thickness,
+            order,
+        )
+        for params in coils
+    ]
+    return np.array(map_tasks(_coil_inductance, tasks, jobs), dtype=np.float64)
@@ -0,0 +1,348 @@
+"""Columnar batches of coil parameters.
+
+Building many thousands of Pydantic parameter models pays validation and
+allocation cost per object. The batch containers in this module hold every
+field as a NumPy column instead and validate all rows in one vectorized
+pass. Individual rows are still available as regular parameter models when
+needed (constructed without re-validation).
+
+Variable-length ``layer_index_list`` values are stored as a flat array of
+layer indices plus an offsets array (row ``i`` owns
+``values[offsets[i]:offsets[i + 1]]``).
+"""
+
+import csv
+import itertools
+import json
+import typing
+from typing import Any, Callable, Dict, Iterator, List, Sequence, Tuple, Type, Union
+
+import numpy as np
+from pydantic import BaseModel
+
+from kicad_draw.models import HelixParams, HelixRectangleParams
+
+# Constraint: (description, vectorized predicate returning True for valid rows)
+Constraint = Tuple[str, Callable[["ParamsBatch"], np.ndarray]]
+
+
+def _field_kind(annotation: Any) -> str:
+    """Classify a model field annotation as float, int, list, or choice."""
+    if annotation is float:
+        return "float"
+    if annotation is int:
+        return "int"
+    origin = typing.get_origin(annotation)
+    if origin in (list, List):
+        return "list"
+    if origin is typing.Literal:
+        return "choice"
+    raise TypeError(f"Unsupported field annotation: {annotation}")
+
+
+def _parse_int_list(text: str) -> List[int]:
+    """Parse a layer list from CSV text ("0;1;2" or "[0, 1, 2]")."""
+    text = text.strip()
+    if text.startswith("["):
+        return [int(v) for v in json.loads(text)]
+    return [int(v) for v in text.split(";") if v.strip()]
+
+
+class ParamsBatch:
+    """Columnar container for many parameter sets of one model type.
+
+    Subclasses set ``MODEL`` to the Pydantic model they batch. Validation
+    mirrors the model: a batch accepts exactly the rows the model accepts
+    (numeric and integer types, ``Literal`` choices). ``CONSTRAINTS`` may add
+    vectorized checks for subclasses that batch a stricter model.
+    """
+
+    MODEL: Type[BaseModel]
+    CONSTRAINTS: Sequence[Constraint] = ()
+
+    # Rows reported per failed constraint in validation errors
+    MAX_REPORTED_ROWS = 5
+
+    def __init__(self, **columns: Any):
+        """Build a batch from columns and validate it.
+
+        Args:
+            **columns: One sequence per model field. ``layer_index_list`` may
+                be given as a sequence of lists, or as a ``(values, offsets)``
+                tuple. Fields with defaults may be omitted.
+
+        Raises:
+            ValueError: If columns are missing, have mismatched lengths, or
+                rows violate a constraint
+
+        """
+        fields = self.MODEL.model_fields
+        unknown = set(columns) - set(fields)
+        if unknown:
+            raise ValueError(f"Unknown {self.MODEL.__name__} fields: {sorted(unknown)}")
+
+        lengths = {
+            name: self._column_length(name, column) for name, column in columns.items()
+        }
+        if len(set(lengths.values())) > 1:
+            raise ValueError(f"Columns have different lengths: {lengths}")
+        size = next(iter(lengths.values()), 0)
+
+        self._size = size
+        self.columns: Dict[str, np.ndarray] = {}
+        self.list_offsets: Dict[str, np.ndarray] = {}
+        for name, field in fields.items():
+            if name in columns:
+                column = columns[name]
+            elif field.is_required():
+                raise ValueError(f"Missing required column: {name}")
+            else:
+                column = [field.default] * size
+            self._set_column(name, _field_kind(field.annotation), column)
+
+        self.validate()
+
+    @classmethod
+    def _column_length(cls, name: str, column: Any) -> int:
+        """Number of rows described by a column."""
+        if isinstance(column, tuple) and len(column) == 2:
+            return len(column[1]) - 1
+        return len(column)
+
+    def _set_column(self, name: str, kind: str, column: Any) -> None:
+        """Coerce a column to its storage dtype."""
+        if kind == "list":
+            if isinstance(column, tuple) and len(column) == 2:
+                values, offsets = column
+                values = np.asarray(values)
+                offsets = np.asarray(offsets, dtype=np.int64)
+            else:
+                rows = [list(row) for row in column]
+                offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+                np.cumsum([len(row) for row in rows], out=offsets[1:])
+                values = np.fromiter(
+                    itertools.chain.from_iterable(rows),
+                    dtype=np.float64,
+                    count=int(offsets[-1]),
+                )
+            self.columns[name] = self._as_int(name, values)
+            self.list_offsets[name] = offsets
+        elif kind == "int":
+            self.columns[name] = self._as_int(name, np.asarray(column))
+        elif kind == "float":
+            try:
+                self.columns[name] = np.asarray(column, dtype=np.float64)
+            except (TypeError, ValueError) as e:
+                raise ValueError(f"Column {name} is not numeric: {e}") from None
+        else:
+            self.columns[name] = np.asarray(column, dtype=str)
+
+    @staticmethod
+    def _as_int(name: str, values: np.ndarray) -> np.ndarray:
+        """Convert values to int64, rejecting non-integral numbers."""
+        if values.dtype.kind in "iu":
+            return values.astype(np.int64, copy=False)
+        try:
+            as_float = values.astype(np.float64)
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Column {name} is not numeric: {e}") from None
+        bad = np.nonzero(~np.isfinite(as_float) | (as_float != np.round(as_float)))[0]
+        if len(bad):
+            raise ValueError(f"Column {name} has non-integer values in rows {bad[:5]}")
+        return as_float.astype(np.int64)
+
+    def validate(self) -> None:
+        """Validate all rows in one vectorized pass.
+
+        Raises:
+            ValueError: Listing every violated constraint and offending rows
+
+        """
+        errors = []
+        for name, field in self.MODEL.model_fields.items():
+            kind = _field_kind(field.annotation)
+            # Numeric and integer types were enforced when the columns were
+            # coerced; Literal choices are the only value rule of the models
+            if kind == "choice":
+                allowed = typing.get_args(field.annotation)
+                bad = ~np.isin(self.columns[name], allowed)
+                errors.extend(
+                    self._describe(f"{name} must be one of {list(allowed)}", bad)
+                )
+
+        for description, predicate in self.CONSTRAINTS:
+            with np.errstate(invalid="ignore"):
+                errors.extend(self._describe(description, ~predicate(self)))
+
+        if errors:
+            raise ValueError(
+                f"Invalid {self.MODEL.__name__} batch:\n" + "\n".join(errors)
+            )
+
+    def _describe(self, description: str, bad: np.ndarray) -> List[str]:
+        """Format a constraint violation, if any rows fail it."""
+        rows = np.nonzero(bad)[0]
+        if not len(rows):
+            return []
+        shown = ", ".join(str(r) for r in rows[: self.MAX_REPORTED_ROWS])
+        more = "" if len(rows) <= self.MAX_REPORTED_ROWS else ", ..."
+        return [f"  {description} ({len(rows)} rows: {shown}{more})"]
+
+    def __len__(self) -> int:
+        """Number of parameter sets in the batch."""
+        return self._size
+
+    def row(self, index: int) -> Dict[str, Any]:
+        """Get one row as a dictionary of Python values."""
+        if not -self._size <= index < self._size:
+            raise IndexError(f"Row index {index} out of range")
+        index %= self._size
+        row = {}
+        for name, column in self.columns.items():
+            if name in self.list_offsets:
+                start, end = self.list_offsets[name][index : index + 2]
+                row[name] = column[start:end].tolist()
+            else:
+                row[name] = column[index].item()
+        return row
+
+    def __getitem__(self, index: Union[int, slice, np.ndarray]):
+        """Get a row as a parameter model, or a sub-batch for slices/arrays."""
+        if isinstance(index, (int, np.integer)):
+            # Rows were validated as part of the batch
+            return self.MODEL.model_construct(**self.row(int(index)))
+        return self.take(np.arange(self._size)[index])
+
+    def __iter__(self) -> Iterator[BaseModel]:
+        """Iterate over rows as parameter models."""
+        for index in range(self._size):
+            yield self[index]
+
+    def take(self, indices: Sequence[int]) -> "ParamsBatch":
+        """Get a sub-batch with the given rows."""
+        indices = np.asarray(indices, dtype=np.int64)
+        columns: Dict[str, Any] = {}
+        for name, column in self.columns.items():
+            if name in self.list_offsets:
+                offsets = self.list_offsets[name]
+                lengths = np.diff(offsets)[indices]
+                new_offsets = np.zeros(len(indices) + 1, dtype=np.int64)
+                np.cumsum(lengths, out=new_offsets[1:])
+                starts = np.repeat(offsets[indices] - new_offsets[:-1], lengths)
+                columns[name] = (
+                    column[np.arange(new_offsets[-1]) + starts],
+                    new_offsets,
+                )
+            else:
+                columns[name] = column[indices]
+        return type(self)(**columns)
+
+    @classmethod
+    def from_models(cls, models: Sequence[BaseModel]) -> "ParamsBatch":
+        """Build a batch from parameter models."""
+        return cls.from_records([m.model_dump() for m in models])
+
+    @classmethod
+    def from_records(cls, records: Sequence[Dict[str, Any]]) -> "ParamsBatch":
+        """Build a batch from row dictionaries."""
+        names = set().union(*records) if records else set()
+        return cls(**{name: [record[name] for record in records] for name in names})
+
+    @classmethod
+    def from_grid(
+        cls, base: BaseModel, grid: Dict[str, Sequence[Any]]
+    ) -> "ParamsBatch":
+        """Build a batch from the Cartesian product of grid values.
+
+        Rows are ordered like ``itertools.product`` over the grid keys in
+        insertion order (the last key varies fastest), matching
+        :func:`kicad_draw.sweep.expand_grid`.
+        """
+        unknown = set(grid) - set(cls.MODEL.model_fields)
+        if unknown:
+            raise ValueError(f"Unknown {cls.MODEL.__name__} fields: {sorted(unknown)}")
+
+        shape = tuple(len(values) for values in grid.values())
+        size = int(np.prod(shape))
+        index = dict(zip(grid, np.indices(shape).reshape(len(shape), size)))
+        columns: Dict[str, Any] = {}
+        for name, value in base.model_dump().items():
+            if name in grid:
+                values = grid[name]
+                columns[name] = [values[i] for i in index[name]]
+            else:
+                columns[name] = [value] * size
+        return cls(**columns)
+
+    @classmethod
+    def from_csv(cls, path: str) -> "ParamsBatch":
+        """Load a batch from CSV with one column per field.
+
+        List fields are written as semicolon-separated values ("0;1;2") or
+        as JSON lists ("[0, 1, 2]").
+        """
+        with open(path, newline="") as f:
+            reader = csv.DictReader(f)
+            columns: Dict[str, List] = {name: [] for name in reader.fieldnames or []}
+            for record in reader:
+                for name, value in record.items():
+                    columns[name].append(value)
+
+        for name, field in cls.MODEL.model_fields.items():
+            if name in columns and _field_kind(field.annotation) == "list":
+                columns[name] = [_parse_int_list(v) for v in columns[name]]
+        return cls(**columns)
+
+    def to_csv(self, path: str) -> None:
+        """Save the batch as CSV (list fields are semicolon-separated)."""
+        names = list(self.columns)
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(names)
+            for index in range(self._size):
+                row = self.row(index)
+                writer.writerow(
+                    [
+                        (
+                            ";".join(str(v) for v in row[name])
+                            if name in self.list_offsets
+                            else row[name]
+                        )
+                        for name in names
+                    ]
+                )
+
+    @classmethod
+    def from_npz(cls, path: str) -> "ParamsBatch":
+        """Load a batch saved with :meth:`to_npz`."""
+        with np.load(path) as data:
+            columns: Dict[str, Any] = {}
+            for name in cls.MODEL.model_fields:
+                if f"{name}.offsets" in data:
+                    columns[name] = (data[f"{name}.values"], data[f"{name}.offsets"])
+                elif name in data:
+                    columns[name] = data[name]
+        return cls(**columns)
+
+    def to_npz(self, path: str) -> None:
+        """Save the batch as NPZ (list fields as values/offsets arrays)."""
+        arrays = {}
+        for name, column in self.columns.items():
+            if name in self.list_offsets:
+                arrays[f"{name}.values"] = column
+                arrays[f"{name}.offsets"] = self.list_offsets[name]
+            else:
+                arrays[name] = column
+        np.savez(path, **arrays)
+
+
+class HelixParamsBatch(ParamsBatch):
+    """Columnar batch of HelixParams."""
+
+    MODEL = HelixParams
+
+
+class HelixRectangleParamsBatch(ParamsBatch):
+    """Columnar batch of HelixRectangleParams."""
+
+    MODEL = HelixRectangleParams
@@ -0,0 +1,265 @@
+"""Standard benchmark workload for comparing machines.
+
+:func:`run_benchmark` draws circular and rectangular four-layer helices at
+several ``segment_number`` values and times each stage of producing a board:
+drawing, ``export``, ``save`` and SVG generation. The report is a plain dict
+(JSON-serializable) with per-stage timing and throughput, peak memory and
+the machine and version metadata needed to archive and compare runs::
+
+    kicad-draw bench --output report.json
+
+The workload is fixed by the package version, so reports of the same version
+on different machines measure the same work.
+"""
+
+import contextlib
+import datetime
+import io
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+import pydantic
+
+from kicad_draw.models import HelixParams, HelixRectangleParams
+from kicad_draw.PCBmodule import PCBdraw
+from kicad_draw.version import code_version, get_version
+
+STANDARD_SEGMENTS = (100, 1000, 10000)
+STACKUP = "default_4layer"
+TEMPLATE = '(kicad_pcb\n\t(version 20241229)\n\t(net 0 "")\n)\n'
+STAGES = ("draw", "export", "save", "svg")
+
+
+def standard_coil(shape: str, segment_number: int):
+    """Coil of the standard workload.
+
+    Args:
+        shape: "helix" or "helix_rectangle"
+        segment_number: Number of segments for curved sections
+
+    Returns:
+        Parameter model of a four-layer coil
+
+    """
+    common = {
+        "x0": 150.0,
+        "y0": 100.0,
+        "layer_index_list": [0, 1, 2, 3],
+        "track_width": 0.5,
+        "connect_width": 0.3,
+        "drill_size": 0.2,
+        "via_size": 0.4,
+        "net_number": 1,
+        "port_gap": 1.0,
+        "segment_number": segment_number,
+    }
+    if shape == "helix":
+        return HelixParams(radius=10.0, tab_gap=2.0, angle_step=0.1, **common)
+    if shape == "helix_rectangle":
+        return HelixRectangleParams(
+            width=20.0, height=12.0, corner_radius=2.0, tab_gap=1.0, **common
+        )
+    raise ValueError(f"Unknown coil shape: {shape}")
+
+
+def _best_time(function: Callable[[], Any], repeat: int) -> Tuple[float, Any]:
+    """Fastest of several runs and the result of the last one."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def _throughput(elements: int, seconds: float, size: int) -> Dict[str, Any]:
+    """Timing of a stage that produced ``size`` bytes for ``elements``."""
+    return {
+        "seconds": seconds,
+        "bytes": size,
+        "elements_per_second": elements / seconds if seconds > 0 else None,
+        "mb_per_second": size / 1e6 / seconds if seconds > 0 else None,
+    }
+
+
+def _run_case(params, directory: str, template: str, repeat: int) -> Dict[str, Any]:
+    """Time the stages of one coil."""
+
+    def draw() -> PCBdraw:
+        pcb = PCBdraw(STACKUP, mode="file")
+        pcb.draw(params)
+        return pcb
+
+    output = os.path.join(directory, "bench.kicad_pcb")
+    timings: Dict[str, Tuple[float, int]] = {}
+    seconds, pcb = _best_time(draw, repeat)
+    seconds_export, text = _best_time(pcb.export, repeat)
+    size = len(text.encode())
+    timings["draw"] = (seconds, size)
+    timings["export"] = (seconds_export, size)
+    seconds, _ = _best_time(lambda: pcb.save(output, template), repeat)
+    timings["save"] = (seconds, os.path.getsize(output))
+    seconds, svg = _best_time(pcb.get_svg, repeat)
+    timings["svg"] = (seconds, len(svg.encode()))
+
+    elements = len(pcb.elements)
+    stages = {
+        stage: _throughput(elements, seconds, size)
+        for stage, (seconds, size) in timings.items()
+    }
+    return {"elements": elements, "stages": stages}
+
+
+def _peak_memory(params, directory: str, template: str) -> int:
+    """Peak traced allocation in bytes while producing one board."""
+    tracemalloc.start()
+    try:
+        pcb = PCBdraw(STACKUP, mode="file")
+        pcb.draw(params)
+        pcb.save(os.path.join(directory, "bench.kicad_pcb"), template)
+        pcb.get_svg()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _max_rss() -> int:
+    """Peak resident set size of the process in bytes (0 if unavailable)."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return 0
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+def _processor() -> str:
+    """Processor model name, from /proc/cpuinfo where Python has none."""
+    name = platform.processor()
+    if not name and os.path.exists("/proc/cpuinfo"):
+        with open("/proc/cpuinfo") as f:
+            for line in f:
+                if line.startswith("model name"):
+                    return line.split(":", 1)[1].strip()
+    return name
+
+
+def metadata() -> Dict[str, Any]:
+    """Machine and software versions the benchmark ran on."""
+    return {
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "kicad_draw": get_version(),
+        "code_version": code_version(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "numpy": np.__version__,
+        "pydantic": pydantic.VERSION,
+        "system": platform.system(),
+        "release": platform.release(),
+        "machine": platform.machine(),
+        "processor": _processor(),
+        "node": platform.node(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def run_benchmark(
+    segment_numbers: Sequence[int] = STANDARD_SEGMENTS,
+    shapes: Sequence[str] = ("helix", "helix_rectangle"),
+    repeat: int = 3,
+    memory: bool = True,
+) -> Dict[str, Any]:
+    """Run the standard workload.
+
+    Stages are timed by their fastest of ``repeat`` runs. Peak memory is
+    measured in a separate run with tracemalloc, which slows Python down and
+    would distort the timings.
+
+    Args:
+        segment_numbers: ``segment_number`` values of the coils
+        shapes: Coil shapes ("helix", "helix_rectangle")
+        repeat: Runs per stage
+        memory: Whether to measure the peak traced memory per coil
+
+    Returns:
+        Report with "metadata", "workload", "cases" (one per shape and
+        segment number) and "totals" (per-stage sums over all cases)
+
+    """
+    if repeat < 1:
+        raise ValueError(f"repeat must be positive, got {repeat}")
+    cases: List[Dict[str, Any]] = []
+    # save() reports every written file on standard output
+    with (
+        tempfile.TemporaryDirectory() as directory,
+        contextlib.redirect_stdout(io.StringIO()),
+    ):
+        template = os.path.join(directory, "template.kicad_pcb")
+        with open(template, "w") as f:
+            f.write(TEMPLATE)
+        for shape in shapes:
+            for segment_number in segment_numbers:
+                params = standard_coil(shape, segment_number)
+                case = {"shape": shape, "segment_number": segment_number}
+                case.update(_run_case(params, directory, template, repeat))
+                if memory:
+                    case["peak_traced_bytes"] = _peak_memory(
+                        params, directory, template
+                    )
+                cases.append(case)
+
+    elements = sum(case["elements"] for case in cases)
+    totals = {}
+    for stage in STAGES:
+        seconds = sum(case["stages"][stage]["seconds"] for case in cases)
+        size = sum(case["stages"][stage]["bytes"] for case in cases)
+        totals[stage] = _throughput(elements, seconds, size)
+    report = {
+        "metadata": metadata(),
+        "workload": {
+            "stackup": STACKUP,
+            "shapes": list(shapes),
+            "segment_numbers": list(segment_numbers),
+            "repeat": repeat,
+        },
+        "cases": cases,
+        "totals": {"elements": elements, "stages": totals},
+        "peak_rss_bytes": _max_rss(),
+    }
+    if memory:
+        report["peak_traced_bytes"] = max(c["peak_traced_bytes"] for c in cases)
+    return report
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """Human-readable summary of a benchmark report."""
+    lines = [
+        f"kicad-draw {report['metadata']['kicad_draw']} on "
+        f"{report['metadata']['machine']} ({report['metadata']['processor']}), "
+        f"Python {report['metadata']['python']}"
+    ]
+    header = f"{'case':<24}{'elements':>10}"
+    header += "".join(f"{stage + ' (ms)':>13}" for stage in STAGES)
+    lines.append(header)
+    for case in report["cases"]:
+        name = f"{case['shape']}/{case['segment_number']}"
+        line = f"{name:<24}{case['elements']:>10}"
+        for stage in STAGES:
+            line += f"{case['stages'][stage]['seconds'] * 1e3:>13.2f}"
+        lines.append(line)
+    totals = report["totals"]
+    for stage in STAGES:
+        rate = totals["stages"][stage]["elements_per_second"] or 0.0
+        mb = totals["stages"][stage]["mb_per_second"] or 0.0
+        lines.append(f"{stage:<8}{rate:>14.0f} elements/s{mb:>10.1f} MB/s")
+    lines.append(f"peak RSS {report['peak_rss_bytes'] / 1e6:.1f} MB")
+    if "peak_traced_bytes" in report:
+        lines[-1] += f", peak traced {report['peak_traced_bytes'] / 1e6:.1f} MB"
+    return "\n".join(lines)
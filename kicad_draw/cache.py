@@ -0,0 +1,332 @@
+"""Content-addressed disk cache of generated coil outputs.
+
+Each entry holds the formatted KiCad element block of one coil and,
+optionally, its visualizer elements (from which the SVG is rendered). Entries
+are keyed by a SHA-256 digest of everything that determines the output: the
+parameter model, the stackup layers, the template digest, the formatter and
+the code version (package version plus a digest of the package sources, see
+:func:`kicad_draw.version.code_version`). Changing any of them simply
+produces a new key, so entries never need to be invalidated.
+
+The cache is bounded by total size on disk. Reading an entry refreshes its
+modification time and the least recently used entries are evicted first.
+:class:`MemoryCoilCache` keeps entries in memory instead, for long-running
+processes such as ``kicad-draw serve``.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from pydantic import BaseModel
+
+from kicad_draw.constants import Defaults
+from kicad_draw.models import params_type_name
+from kicad_draw.version import code_version
+
+BLOCK_SUFFIX = ".kicad"
+SVG_SUFFIX = ".svg.json"
+
+
+class CacheEntry(NamedTuple):
+    """Cached output of one coil."""
+
+    elements: List[str]
+    svg_elements: Optional[List[dict]]
+
+
+def file_digest(path: str) -> str:
+    """Return the SHA-256 hex digest of a file's content."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@lru_cache(maxsize=None)
+def _umask() -> int:
+    """Get the process umask (read once, as reading it briefly resets it)."""
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+class BaseCoilCache:
+    """Keys and hit statistics shared by the coil caches.
+
+    Subclasses store the entries and implement :meth:`get`, :meth:`put` and
+    :meth:`clear`.
+    """
+
+    def __init__(self):
+        """Initialize the statistics and the code version used in keys."""
+        self.hits = 0
+        self.misses = 0
+        self._version = code_version()
+
+    def key(
+        self,
+        params: BaseModel,
+        layers: List[str],
+        template_digest: Optional[str] = None,
+        formatter: Any = None,
+    ) -> str:
+        """Compute the cache key of a coil.
+
+        Args:
+            params: Coil parameter model
+            layers: Layer names of the stackup, in index order
+            template_digest: Digest of the KiCad template, if the output
+                depends on it
+            formatter: Formatter producing the s-expressions (its class and
+                instance attributes are part of the key)
+
+        Returns:
+            Hex digest identifying the coil output
+
+        """
+        payload = {
+            "type": params_type_name(params),
+            "params": params.model_dump(mode="json"),
+            "layers": list(layers),
+            "template": template_digest,
+            "formatter": (
+                None
+                if formatter is None
+                else [type(formatter).__qualname__, sorted(vars(formatter).items())]
+            ),
+            "version": self._version,
+        }
+        encoded = json.dumps(payload, sort_keys=True, default=repr).encode()
+        return hashlib.sha256(encoded).hexdigest()
+
+    def get(self, key: str, svg: bool = False) -> Optional[CacheEntry]:
+        """Look up a coil output.
+
+        Args:
+            key: Key from :meth:`key`
+            svg: Whether the visualizer elements are needed too (entries
+                stored without them count as misses)
+
+        Returns:
+            The cached entry, or None on a miss
+
+        """
+        raise NotImplementedError
+
+    def put(
+        self, key: str, elements: List[str], svg_elements: Optional[List[dict]] = None
+    ) -> None:
+        """Store a coil output.
+
+        Args:
+            key: Key from :meth:`key`
+            elements: Formatted s-expressions of the coil
+            svg_elements: Visualizer elements of the coil, if available
+
+        """
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, int]:
+        """Hit and miss counts of this cache object."""
+        return {"hits": self.hits, "misses": self.misses}
+
+
+class CoilCache(BaseCoilCache):
+    """Size-bounded LRU cache of coil outputs stored in a directory."""
+
+    def __init__(self, directory: str, max_bytes: int = Defaults.CACHE_MAX_BYTES):
+        """Initialize the cache.
+
+        Args:
+            directory: Cache directory (created if missing)
+            max_bytes: Total size of entries kept on disk before evicting
+
+        """
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be positive")
+        super().__init__()
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._total: Optional[int] = None  # Bytes on disk, scanned on first write
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str, suffix: str) -> str:
+        """Path of an entry file, sharded by the first key characters."""
+        return os.path.join(self.directory, key[:2], key + suffix)
+
+    def get(self, key: str, svg: bool = False) -> Optional[CacheEntry]:
+        """Look up a coil output.
+
+        Args:
+            key: Key from :meth:`key`
+            svg: Whether the visualizer elements are needed too (entries
+                stored without them count as misses)
+
+        Returns:
+            The cached entry, or None on a miss
+
+        """
+        block_path = self._path(key, BLOCK_SUFFIX)
+        svg_path = self._path(key, SVG_SUFFIX)
+        try:
+            with open(block_path, "r") as f:
+                block = f.read()
+            svg_elements = None
+            if svg:
+                with open(svg_path, "r") as f:
+                    svg_elements = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+
+        # Refresh the entry for LRU eviction
+        for path in (block_path, svg_path) if svg else (block_path,):
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+        self.hits += 1
+        return CacheEntry(block.split("\n") if block else [], svg_elements)
+
+    def put(
+        self, key: str, elements: List[str], svg_elements: Optional[List[dict]] = None
+    ) -> None:
+        """Store a coil output.
+
+        Args:
+            key: Key from :meth:`key`
+            elements: Formatted s-expressions of the coil
+            svg_elements: Visualizer elements of the coil, if available
+
+        """
+        written = self._write(self._path(key, BLOCK_SUFFIX), "\n".join(elements))
+        if svg_elements is not None:
+            written += self._write(
+                self._path(key, SVG_SUFFIX), json.dumps(svg_elements)
+            )
+        if self._total is None:
+            self._total = sum(size for _, _, size in self._entries())
+        else:
+            self._total += written
+        if self._total > self.max_bytes:
+            self._evict()
+
+    def _write(self, path: str, content: str) -> int:
+        """Write a file atomically and return its size."""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            f.write(content)
+        # mkstemp creates private files; use the permissions open() would
+        os.chmod(tmp_path, 0o666 & ~_umask())
+        os.replace(tmp_path, path)
+        return os.path.getsize(path)
+
+    def _entries(self) -> List[Tuple[str, float, int]]:
+        """List (path, mtime, size) of all entry files."""
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if not name.endswith((BLOCK_SUFFIX, SVG_SUFFIX)):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((path, stat.st_mtime, stat.st_size))
+        return entries
+
+    def _evict(self) -> None:
+        """Remove least recently used entries until under the size limit."""
+        entries = sorted(self._entries(), key=lambda entry: entry[1])
+        total = sum(size for _, _, size in entries)
+        for path, _, size in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+        self._total = total
+
+    def size(self) -> int:
+        """Total size of the entries on disk in bytes."""
+        return sum(size for _, _, size in self._entries())
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        for path, _, _ in self._entries():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        self._total = 0
+
+
+class MemoryCoilCache(BaseCoilCache):
+    """In-memory LRU cache of coil outputs, bounded by entry count.
+
+    Keys are computed like those of :class:`CoilCache`; ``len(cache)`` is the
+    number of cached coils. The cache can be shared by PCBs drawn in several
+    threads.
+    """
+
+    def __init__(self, max_entries: int = Defaults.MEMORY_CACHE_ENTRIES):
+        """Initialize the cache.
+
+        Args:
+            max_entries: Number of coils kept before evicting
+
+        """
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+        super().__init__()
+        self.max_entries = max_entries
+        self._items: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Number of cached coils."""
+        return len(self._items)
+
+    def get(self, key: str, svg: bool = False) -> Optional[CacheEntry]:
+        """Look up a coil output (see :meth:`BaseCoilCache.get`)."""
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is None or (svg and entry.svg_elements is None):
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(
+        self, key: str, elements: List[str], svg_elements: Optional[List[dict]] = None
+    ) -> None:
+        """Store a coil output (see :meth:`BaseCoilCache.put`)."""
+        with self._lock:
+            previous = self._items.get(key)
+            if svg_elements is None and previous is not None:
+                svg_elements = previous.svg_elements
+            self._items[key] = CacheEntry(list(elements), svg_elements)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._items.clear()
@@ -0,0 +1,214 @@
+"""Hierarchical cells placed by reference.
+
+A :class:`Cell` holds geometry drawn once (an
+:class:`~kicad_draw.group.ElementGroup`) and references to other cells. Boards
+place cells with :meth:`PCBdraw.place <kicad_draw.PCBmodule.PCBdraw.place>`,
+which only records a :class:`CellReference` (a translation, rotation and
+optional net), so memory grows with the number of distinct shapes rather than
+with the number of placements. References are flattened at export time, with
+one vectorized transform per distinct cell.
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from kicad_draw.group import ElementGroup
+from kicad_draw.transform import flip_layers, identity, mirror_x, rotate, translate
+
+
+def placement_matrix(
+    x: float, y: float, rotation: float, flip: bool = False
+) -> np.ndarray:
+    """Build the affine matrix of a placement.
+
+    The geometry is mirrored left to right (if flipped), rotated about the
+    origin and then translated.
+
+    Args:
+        x: X translation
+        y: Y translation
+        rotation: Counter-clockwise rotation in radians
+        flip: Whether to mirror across the Y axis first
+
+    Returns:
+        3x3 affine matrix
+
+    """
+    matrix = translate(x, y) @ rotate(rotation)
+    return matrix @ mirror_x() if flip else matrix
+
+
+class CellReference:
+    """Placement of a cell with a translation, rotation and optional net."""
+
+    def __init__(
+        self,
+        cell: "Cell",
+        x: float = 0.0,
+        y: float = 0.0,
+        rotation: float = 0.0,
+        net: Optional[int] = None,
+        flip: bool = False,
+    ):
+        """Initialize a reference.
+
+        Args:
+            cell: Referenced cell
+            x: X position of the cell origin
+            y: Y position of the cell origin
+            rotation: Counter-clockwise rotation about the cell origin in radians
+            net: Net for every element of the placed cell, including nested
+                references (None keeps the cell's nets)
+            flip: Place the cell on the other board side: mirrored across its
+                Y axis with the stackup reversed (F.Cu and B.Cu swap)
+
+        """
+        if net is not None and net < 0:
+            raise ValueError(f"Net must be non-negative, got {net}")
+        self.cell = cell
+        self.x = x
+        self.y = y
+        self.rotation = rotation
+        self.net = net
+        self.flip = flip
+
+    def __repr__(self) -> str:
+        """Short description of the reference."""
+        return (
+            f"CellReference({self.cell.name!r}, x={self.x}, y={self.y}, "
+            f"rotation={self.rotation}, net={self.net}, flip={self.flip})"
+        )
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """3x3 affine matrix of the placement."""
+        return placement_matrix(self.x, self.y, self.rotation, self.flip)
+
+
+class Cell:
+    """Named geometry drawn once and reused by reference."""
+
+    def __init__(self, name: str, group: Optional[ElementGroup] = None):
+        """Initialize a cell.
+
+        Args:
+            name: Cell name
+            group: Geometry of the cell in its own coordinates (empty if None)
+
+        """
+        self.name = name
+        self.group = ElementGroup() if group is None else group
+        self.references: List[CellReference] = []
+
+    def __repr__(self) -> str:
+        """Short description of the cell."""
+        return (
+            f"Cell({self.name!r}, {len(self.group)} elements, "
+            f"{len(self.references)} references)"
+        )
+
+    def add(
+        self,
+        cell: "Cell",
+        x: float = 0.0,
+        y: float = 0.0,
+        rotation: float = 0.0,
+        net: Optional[int] = None,
+        flip: bool = False,
+    ) -> CellReference:
+        """Place another cell inside this one.
+
+        Args:
+            cell: Cell to place
+            x: X position of its origin in this cell's coordinates
+            y: Y position of its origin in this cell's coordinates
+            rotation: Counter-clockwise rotation in radians
+            net: Net override for the placed cell (see :class:`CellReference`)
+            flip: Place the cell on the other board side
+
+        Returns:
+            The new reference
+
+        """
+        if cell is self or self in cell.descendants():
+            raise ValueError(f"Placing {cell.name!r} in {self.name!r} creates a cycle")
+        reference = CellReference(cell, x, y, rotation, net, flip)
+        self.references.append(reference)
+        return reference
+
+    def descendants(self) -> List["Cell"]:
+        """All cells referenced directly or indirectly, each listed once."""
+        found: Dict[int, Cell] = {}
+        pending = [reference.cell for reference in self.references]
+        while pending:
+            cell = pending.pop()
+            if id(cell) not in found:
+                found[id(cell)] = cell
+                pending.extend(reference.cell for reference in cell.references)
+        return list(found.values())
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the cell's own geometry in bytes."""
+        return self.group.nbytes
+
+    def flatten(self, layer_count: Optional[int] = None) -> ElementGroup:
+        """Flatten the cell and everything it references into one group.
+
+        Args:
+            layer_count: Number of stackup layers, needed for flipped references
+
+        Returns:
+            The flattened geometry
+
+        """
+        return flatten([CellReference(self)], layer_count)
+
+
+def flatten(
+    references: Sequence[CellReference], layer_count: Optional[int] = None
+) -> ElementGroup:
+    """Flatten cell references into a single group.
+
+    All placements of a cell (including nested ones) on the same board side
+    are collected first and transformed together with
+    :meth:`ElementGroup.tile`. The output holds the cells in order of their
+    first placement, each with its instances in placement order.
+
+    Args:
+        references: Top-level references
+        layer_count: Number of stackup layers, needed to flip references
+
+    Returns:
+        The flattened geometry
+
+    """
+    instances: Dict[Tuple[int, bool], Tuple[Cell, bool, List, List]] = {}
+
+    # Depth-first walk in placement order, composing transforms on the way
+    stack = [(reference, identity(), None, False) for reference in reversed(references)]
+    while stack:
+        reference, parent, net, flipped = stack.pop()
+        matrix = parent @ reference.matrix
+        if net is None:
+            net = reference.net
+        flipped ^= bool(reference.flip)
+        cell = reference.cell
+        if len(cell.group):
+            entry = instances.setdefault((id(cell), flipped), (cell, flipped, [], []))
+            entry[2].append(matrix)
+            entry[3].append(-1 if net is None else net)
+        stack.extend(
+            (child, matrix, net, flipped) for child in reversed(cell.references)
+        )
+
+    groups = []
+    for cell, flipped, matrices, nets in instances.values():
+        group = cell.group
+        if flipped:
+            if layer_count is None:
+                raise ValueError("Flipped references need the stackup layer count")
+            group = group.remap_layers(flip_layers(layer_count))
+        groups.append(group.tile(np.array(matrices), nets=np.array(nets)))
+    return ElementGroup.concatenate(groups)
@@ -1,17 +1,10 @@
 """Command-line interface for kicad-draw."""
 
-import importlib.metadata
 import sys
 
 import click
 
-
-def get_version() -> str:
-    """Get the package version."""
-    try:
-        return importlib.metadata.version("kicad-draw")
-    except importlib.metadata.PackageNotFoundError:
-        return "unknown"
+from kicad_draw.version import get_version
 
 
 @click.group()
@@ -27,5 +20,283 @@ def version() -> None:
     sys.exit(0)
 
 
+@main.command()
+@click.argument(
+    "params_files",
+    nargs=-1,
+    required=True,
+    type=click.Path(exists=True, dir_okay=False),
+)
+@click.option("--stackup", default=None, help="Stackup name (overrides the files).")
+@click.option(
+    "--template",
+    type=click.Path(exists=True, dir_okay=False),
+    default=None,
+    help="KiCad PCB template (overrides the files).",
+)
+@click.option(
+    "--output-dir",
+    "-o",
+    type=click.Path(file_okay=False),
+    default=None,
+    help="Directory for the generated boards.",
+)
+@click.option("--svg", is_flag=True, help="Also write an SVG preview per board.")
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Number of worker processes (default: all CPUs).",
+)
+@click.option(
+    "--dry-run", is_flag=True, help="Only report element counts, write nothing."
+)
+@click.option(
+    "--cache-dir",
+    type=click.Path(file_okay=False),
+    envvar="KICAD_DRAW_CACHE_DIR",
+    default=None,
+    help="Reuse coils generated by earlier runs from this directory.",
+)
+@click.option(
+    "--cache-size",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Cache size limit in MB (least recently used entries are evicted).",
+)
+def generate(
+    params_files,
+    stackup,
+    template,
+    output_dir,
+    svg,
+    jobs,
+    dry_run,
+    cache_dir,
+    cache_size,
+) -> None:
+    """Generate KiCad PCB boards from YAML parameter files.
+
+    Each file is either a single coil parameter set or a board manifest with
+    a list of coil placements; every file produces one board.
+    """
+    from kicad_draw.generate import generate_boards
+    from kicad_draw.spec import load_board_spec
+
+    try:
+        cache = None
+        if cache_dir is not None:
+            from kicad_draw.cache import CoilCache
+
+            if cache_size is None:
+                cache = CoilCache(cache_dir)
+            else:
+                cache = CoilCache(cache_dir, max_bytes=cache_size * 1024 * 1024)
+        specs = [load_board_spec(path) for path in params_files]
+        summaries = generate_boards(
+            specs,
+            stackup=stackup,
+            template_path=template,
+            output_dir=output_dir,
+            svg=svg,
+            jobs=jobs,
+            dry_run=dry_run,
+            cache=cache,
+        )
+    except (OSError, ValueError) as e:
+        raise click.ClickException(str(e)) from None
+
+    for summary in summaries:
+        line = (
+            f"{summary['name']}: {summary['coil_count']} coils, "
+            f"{summary['element_count']} elements ({summary['stackup']})"
+        )
+        if cache is not None:
+            line += f" [{summary['cache_hits']} cached]"
+        if summary["outputs"]:
+            line += " -> " + ", ".join(summary["outputs"].values())
+        click.echo(line)
+
+
+@main.command()
+@click.argument(
+    "params_files",
+    nargs=-1,
+    required=True,
+    type=click.Path(exists=True, dir_okay=False),
+)
+@click.option("--stackup", default=None, help="Stackup name (overrides the files).")
+@click.option(
+    "--template",
+    type=click.Path(exists=True, dir_okay=False),
+    default=None,
+    help="KiCad PCB template (overrides the files).",
+)
+@click.option(
+    "--output-dir",
+    "-o",
+    type=click.Path(file_okay=False),
+    default=None,
+    help="Directory for the generated boards.",
+)
+@click.option("--svg", is_flag=True, help="Also write an SVG preview per board.")
+@click.option(
+    "--interval",
+    type=click.FloatRange(min=0.05),
+    default=0.5,
+    show_default=True,
+    help="Polling interval in seconds.",
+)
+def watch(params_files, stackup, template, output_dir, svg, interval) -> None:
+    """Regenerate boards whenever their YAML files change.
+
+    Only coils whose parameters changed are redrawn; the others are reused
+    from the previous run. Stop with Ctrl-C.
+    """
+    from kicad_draw.watch import IncrementalBoard, watch_boards
+
+    boards = [
+        IncrementalBoard(
+            path,
+            stackup=stackup,
+            template_path=template,
+            output_dir=output_dir,
+            svg=svg,
+        )
+        for path in params_files
+    ]
+
+    def on_update(board, summary, elapsed):
+        click.echo(
+            f"{summary['name']}: drew {summary['drawn']}, "
+            f"reused {summary['reused']}, removed {summary['removed']} coils, "
+            f"{summary['element_count']} elements in {elapsed:.2f}s -> "
+            + ", ".join(summary["outputs"].values())
+        )
+
+    def on_error(board, error):
+        click.echo(f"Error: {error}", err=True)
+
+    click.echo(f"Watching {len(boards)} file(s), press Ctrl-C to stop")
+    try:
+        watch_boards(boards, on_update, on_error, interval=interval)
+    except KeyboardInterrupt:
+        pass
+
+
+@main.command()
+@click.option(
+    "--segments",
+    default="100,1000,10000",
+    show_default=True,
+    help="Comma-separated segment_number values of the coils.",
+)
+@click.option(
+    "--repeat",
+    type=click.IntRange(min=1),
+    default=3,
+    show_default=True,
+    help="Runs per stage (the fastest is reported).",
+)
+@click.option(
+    "--output",
+    "-o",
+    type=click.Path(dir_okay=False),
+    default=None,
+    help="Write the JSON report to this file instead of standard output.",
+)
+@click.option("--no-memory", is_flag=True, help="Skip the peak memory measurement.")
+def bench(segments, repeat, output, no_memory) -> None:
+    """Run the standard benchmark workload and report it as JSON.
+
+    Circular and rectangular helices are drawn, exported, saved and rendered
+    to SVG; the report holds per-stage timing, throughput, peak memory and
+    machine and version metadata.
+    """
+    import json
+
+    from kicad_draw.bench import format_report, run_benchmark
+
+    try:
+        segment_numbers = [int(n) for n in segments.split(",") if n.strip()]
+        if not segment_numbers or min(segment_numbers) < 1:
+            raise ValueError(f"Invalid segment numbers: {segments}")
+        report = run_benchmark(segment_numbers, repeat=repeat, memory=not no_memory)
+        text = json.dumps(report, indent=2)
+        if output is None:
+            click.echo(text)
+            return
+        with open(output, "w") as f:
+            f.write(text + "\n")
+    except (OSError, ValueError) as e:
+        raise click.ClickException(str(e)) from None
+    click.echo(format_report(report))
+    click.echo(f"Report written to {output}")
+
+
+@main.command()
+@click.option(
+    "--socket",
+    "socket_path",
+    type=click.Path(dir_okay=False),
+    default=None,
+    help="Listen on this Unix socket.",
+)
+@click.option("--host", default="127.0.0.1", show_default=True, help="TCP host.")
+@click.option(
+    "--port",
+    type=click.IntRange(min=0, max=65535),
+    default=None,
+    help="Listen on this TCP port instead of a Unix socket.",
+)
+@click.option(
+    "--stackup",
+    default="default_4layer",
+    show_default=True,
+    help="Stackup of requests that do not name one.",
+)
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=4,
+    show_default=True,
+    help="Requests generated at the same time.",
+)
+@click.option(
+    "--cache-entries",
+    type=click.IntRange(min=1),
+    default=256,
+    show_default=True,
+    help="Drawn coils kept in memory.",
+)
+def serve(socket_path, host, port, stackup, workers, cache_entries) -> None:
+    """Serve coil generation requests over a local socket.
+
+    Requests and responses are JSON objects, one per line (see
+    kicad_draw.server). Stop with Ctrl-C.
+    """
+    from kicad_draw.server import CoilServer
+
+    if (socket_path is None) == (port is None):
+        raise click.UsageError("Give exactly one of --socket and --port.")
+    address = socket_path if port is None else (host, port)
+    try:
+        server = CoilServer(address, stackup, workers, cache_entries)
+    except (OSError, ValueError) as e:
+        raise click.ClickException(str(e)) from None
+
+    listening = server.address
+    if not isinstance(listening, str):
+        listening = f"{listening[0]}:{listening[1]}"
+    click.echo(f"Serving on {listening} with {workers} workers, press Ctrl-C to stop")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+
 if __name__ == "__main__":
     main()
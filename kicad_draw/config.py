@@ -5,8 +5,13 @@ for common PCB types used in the drawing operations.
 """
 
 default_layers = {
-    "default_4layer": {"layer_list": ["F.Cu", "In1.Cu", "In2.Cu", "B.Cu"]},
+    "default_4layer": {
+        "layer_list": ["F.Cu", "In1.Cu", "In2.Cu", "B.Cu"],
+        # Distances between consecutive copper layers (mm), 1.6 mm board
+        "layer_spacing": [0.25, 1.1, 0.25],
+    },
     "default_6layer": {
-        "layer_list": ["F.Cu", "In1.Cu", "In2.Cu", "In3.Cu", "In4.Cu", "B.Cu"]
+        "layer_list": ["F.Cu", "In1.Cu", "In2.Cu", "In3.Cu", "In4.Cu", "B.Cu"],
+        "layer_spacing": [0.2, 0.35, 0.5, 0.35, 0.2],
     },
 }
@@ -46,6 +46,9 @@ class Angle:
     HALF_PI = np.pi / 2
     THREE_HALF_PI = 3 * np.pi / 2
     TWO_PI = 2 * np.pi
+    # Arcs spanning (nearly) a full circle cannot be drawn with a single SVG
+    # arc command because their endpoints coincide.
+    ARC_CLOSURE_TOLERANCE = 1e-3
 
 
 class Defaults:
@@ -54,7 +57,15 @@ class Defaults:
     CANVAS_WIDTH = 800
     CANVAS_HEIGHT = 600
     SEGMENT_COUNT = 100
-    ARC_SEGMENTS = 32
     LEGEND_MARGIN = 50  # pixels
     LEGEND_X = 20
     LEGEND_Y = 30
+    RASTER_DPI = 150
+    RASTER_MARGIN = 10  # pixels
+    SCENE_QUANTUM = 0.001  # mm
+    CACHE_MAX_BYTES = 512 * 1024 * 1024
+    MEMORY_CACHE_ENTRIES = 256
+    SAVE_CHUNK_ELEMENTS = 10_000  # Elements joined per piece of a saved board
+    COPPER_THICKNESS = 0.035  # mm (1 oz)
+    QUADRATURE_ORDER = 4  # Gauss-Legendre points per segment in inductance terms
+    INDUCTANCE_CHUNK_PAIRS = 1 << 16  # Segment pairs evaluated at once
@@ -0,0 +1,208 @@
+"""KiCad footprint output for coils.
+
+A coil can be written as a footprint (``.kicad_mod``) instead of raw segments
+and vias: straight tracks become copper ``fp_line`` items, arcs become single
+``fp_arc`` items instead of their tessellation, and vias become plated
+through-hole pads. Boards place such footprints with
+:meth:`PCBdraw.place_footprint <kicad_draw.PCBmodule.PCBdraw.place_footprint>`;
+the footprint body is formatted once per cell and shared by every placement.
+"""
+
+import math
+from typing import List, NamedTuple, Optional, Sequence
+
+from kicad_draw.cells import Cell, CellReference
+from kicad_draw.constants import Angle
+from kicad_draw.group import VISUAL_LINE, ElementGroup
+
+FOOTPRINT_VERSION = 20241229
+GENERATOR = "kicad_draw"
+LIBRARY = "kicad_draw"
+
+_TEXT_EFFECTS = "(effects (font (size 1 1) (thickness 0.15)))"
+_ATTRIBUTES = "(attr board_only exclude_from_pos_files exclude_from_bom)"
+
+
+class FootprintPad(NamedTuple):
+    """Plated through-hole pad standing in for a via."""
+
+    x: float
+    y: float
+    size: float
+    drill: float
+    net: int
+
+
+class FootprintBody(NamedTuple):
+    """Formatted graphic items and pads of a footprint."""
+
+    graphics: List[str]
+    pads: List[FootprintPad]
+
+
+class FootprintReference(CellReference):
+    """Placement of a cell as a footprint."""
+
+    def __init__(
+        self,
+        cell: Cell,
+        x: float = 0.0,
+        y: float = 0.0,
+        rotation: float = 0.0,
+        net: Optional[int] = None,
+        reference: str = "",
+    ):
+        """Initialize a footprint placement.
+
+        Args:
+            cell: Cell providing the footprint geometry
+            x: X position of the footprint anchor
+            y: Y position of the footprint anchor
+            rotation: Counter-clockwise rotation in radians (as for cells)
+            net: Net of all pads (None keeps the nets of the vias)
+            reference: Reference designator, e.g. "L1"
+
+        """
+        super().__init__(cell, x, y, rotation, net)
+        self.reference = reference
+
+
+def _arc_pieces(span: float) -> int:
+    """Number of fp_arc items for an arc (closed arcs must be split)."""
+    if abs(span) < 2 * math.pi - Angle.ARC_CLOSURE_TOLERANCE:
+        return 1
+    return math.ceil(abs(span) / math.pi)
+
+
+def footprint_body(group: ElementGroup, layers: Sequence[str]) -> FootprintBody:
+    """Convert a group into footprint items in the group's coordinates.
+
+    Args:
+        group: Coil geometry, typically drawn around the origin
+        layers: Layer names of the stackup, in index order
+
+    Returns:
+        The formatted graphic items and the pads
+
+    """
+    graphics = []
+    lines = group.segments[group.visual["index"][group.visual["kind"] == VISUAL_LINE]]
+    for x1, y1, x2, y2, width, layer, _ in lines.tolist():
+        graphics.append(
+            f"(fp_line (start {x1} {y1}) (end {x2} {y2}) "
+            f"(stroke (width {width}) (type solid)) "
+            f'(layer "{layers[layer]}"))'
+        )
+
+    for cx, cy, radius, start, end, width, layer in group.arcs.tolist():
+        pieces = _arc_pieces(end - start)
+        step = (end - start) / pieces
+        for k in range(pieces):
+            a0, a1 = start + k * step, start + (k + 1) * step
+            points = [
+                (cx + radius * math.cos(a), cy + radius * math.sin(a))
+                for a in (a0, (a0 + a1) / 2, a1)
+            ]
+            (sx, sy), (mx, my), (ex, ey) = points
+            graphics.append(
+                f"(fp_arc (start {sx} {sy}) (mid {mx} {my}) (end {ex} {ey}) "
+                f"(stroke (width {width}) (type solid)) "
+                f'(layer "{layers[layer]}"))'
+            )
+
+    v = group.vias
+    pads = [
+        FootprintPad(*row)
+        for row in zip(
+            v["x"].tolist(),
+            v["y"].tolist(),
+            v["size"].tolist(),
+            v["drill"].tolist(),
+            v["net"].tolist(),
+        )
+    ]
+    return FootprintBody(graphics, pads)
+
+
+def _format_pad(pad: FootprintPad, angle: float, net: Optional[int]) -> str:
+    """Format a pad, with its net when placed on a board."""
+    at = f"(at {pad.x} {pad.y} {angle})" if angle else f"(at {pad.x} {pad.y})"
+    text = (
+        f'(pad "1" thru_hole circle {at} (size {pad.size} {pad.size}) '
+        f'(drill {pad.drill}) (layers "*.Cu")'
+    )
+    if net is not None:
+        text += f' (net {net} "")'
+    return text + ")"
+
+
+def _properties(reference: str, value: str) -> List[str]:
+    """Hidden reference and value properties."""
+    return [
+        f'(property "Reference" "{reference}" (at 0 0 0) (layer "F.SilkS") '
+        f"(hide yes) {_TEXT_EFFECTS})",
+        f'(property "Value" "{value}" (at 0 0 0) (layer "F.Fab") '
+        f"(hide yes) {_TEXT_EFFECTS})",
+    ]
+
+
+def format_kicad_mod(name: str, body: FootprintBody) -> str:
+    """Format a footprint library file (``.kicad_mod``).
+
+    Args:
+        name: Footprint name
+        body: Items from :func:`footprint_body`
+
+    Returns:
+        The file content
+
+    """
+    lines = [
+        f'(footprint "{name}"',
+        f"\t(version {FOOTPRINT_VERSION})",
+        f'\t(generator "{GENERATOR}")',
+        '\t(layer "F.Cu")',
+    ]
+    lines += ["\t" + item for item in _properties("REF**", name)]
+    lines.append("\t" + _ATTRIBUTES)
+    lines += ["\t" + item for item in body.graphics]
+    lines += ["\t" + _format_pad(pad, 0, None) for pad in body.pads]
+    lines.append(")")
+    return "\n".join(lines) + "\n"
+
+
+def format_footprint_instance(
+    name: str, body: FootprintBody, placement: FootprintReference
+) -> str:
+    """Format a footprint placed on a board.
+
+    Footprint items keep their local coordinates; KiCad applies the
+    footprint position and orientation. KiCad angles are in degrees and, with
+    the Y axis pointing down, opposite to the placement rotation.
+
+    Args:
+        name: Footprint name (placed as ``kicad_draw:<name>``)
+        body: Items from :func:`footprint_body`
+        placement: Position, rotation, net and reference of the footprint
+
+    Returns:
+        The footprint s-expression
+
+    """
+    angle = round(-math.degrees(placement.rotation), 9) % 360.0
+    at = (
+        f"(at {placement.x} {placement.y} {angle})"
+        if angle
+        else f"(at {placement.x} {placement.y})"
+    )
+    lines = [f'(footprint "{LIBRARY}:{name}"', '\t(layer "F.Cu")', f"\t{at}"]
+    lines += ["\t" + item for item in _properties(placement.reference, name)]
+    lines.append("\t" + _ATTRIBUTES)
+    lines += ["\t" + item for item in body.graphics]
+    lines += [
+        "\t"
+        + _format_pad(pad, angle, pad.net if placement.net is None else placement.net)
+        for pad in body.pads
+    ]
+    lines.append(")")
+    return "\n".join(lines)
@@ -1,6 +1,6 @@
 """KiCad output formatting."""
 
-from typing import List
+from typing import List, Sequence
 
 from kicad_draw.geometry import Line, Via
 
@@ -29,3 +29,55 @@ class KiCadFormatter:
             f"(net {net}) "
             f"(tstamp 0))"
         )
+
+    def format_segments(
+        self,
+        x1: Sequence[float],
+        y1: Sequence[float],
+        x2: Sequence[float],
+        y2: Sequence[float],
+        widths: Sequence[float],
+        layers: Sequence[str],
+        nets: Sequence[int],
+    ) -> List[str]:
+        """Format many line segments, one value of each sequence per segment.
+
+        Produces the same text as :meth:`format_segment` for every segment.
+        """
+        return [
+            f"(segment (start {a} {b}) "
+            f"(end {c} {d}) "
+            f"(width {width}) "
+            f'(layer "{layer}") '
+            f"(net {net}) "
+            f"(tstamp 0))"
+            for a, b, c, d, width, layer, net in zip(
+                x1, y1, x2, y2, widths, layers, nets
+            )
+        ]
+
+    def format_vias(
+        self,
+        x: Sequence[float],
+        y: Sequence[float],
+        sizes: Sequence[float],
+        drills: Sequence[float],
+        layers_1: Sequence[str],
+        layers_2: Sequence[str],
+        nets: Sequence[int],
+    ) -> List[str]:
+        """Format many vias, one value of each sequence per via.
+
+        Produces the same text as :meth:`format_via` for every via.
+        """
+        return [
+            f"(via (at {a} {b}) "
+            f"(size {size}) "
+            f"(drill {drill}) "
+            f'(layers "{layer_1}" "{layer_2}") '
+            f"(net {net}) "
+            f"(tstamp 0))"
+            for a, b, size, drill, layer_1, layer_2, net in zip(
+                x, y, sizes, drills, layers_1, layers_2, nets
+            )
+        ]
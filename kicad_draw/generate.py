@@ -0,0 +1,202 @@
+"""Board generation from YAML specifications.
+
+Each board spec (see :mod:`kicad_draw.spec`) is drawn coil by coil. Coils of
+all boards are spread across a process pool and the results are assembled
+per board in spec order, so the generated files do not depend on the number
+of workers.
+"""
+
+import os
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from kicad_draw.cache import BaseCoilCache, file_digest
+from kicad_draw.config import default_layers
+from kicad_draw.formatter import KiCadFormatter
+from kicad_draw.models import PARAMS_TYPES, params_type_name
+from kicad_draw.PCBmodule import PCBdraw
+from kicad_draw.pool import map_tasks
+from kicad_draw.spec import BoardSpec
+
+DEFAULT_STACKUP = "default_4layer"
+
+
+def draw_coil_task(task: Tuple) -> Tuple[List[str], Optional[List[dict]]]:
+    """Draw a single coil, e.g. in a worker process.
+
+    Args:
+        task: Tuple of the parameter type name (see
+            :func:`kicad_draw.models.params_type_name`), the parameter fields,
+            the stackup and whether to record visualizer elements
+
+    Returns:
+        The coil's s-expressions, and its visualizer elements (or None)
+
+    """
+    type_name, params_dict, stackup, svg = task
+    # Parameters were validated when the spec was loaded
+    params = PARAMS_TYPES[type_name].model_construct(**params_dict)
+
+    pcb = PCBdraw(stackup, mode="file", enable_visualization=svg)
+    pcb.draw(params)
+    return pcb.elements, pcb.visualizer.elements if svg else None
+
+
+def board_paths(
+    spec: BoardSpec, output_dir: Optional[str], svg: bool
+) -> Dict[str, str]:
+    """Work out the output files of a board.
+
+    Args:
+        spec: Board specification
+        output_dir: Directory overriding the spec's output location, if any
+        svg: Whether an SVG preview is written next to the board
+
+    Returns:
+        Output path per format ("kicad_pcb", and "svg" if requested)
+
+    """
+    output = spec.output or os.path.join(
+        os.path.dirname(os.path.abspath(spec.source)), f"{spec.name}.kicad_pcb"
+    )
+    if output_dir is not None:
+        output = os.path.join(output_dir, os.path.basename(output))
+    paths = {"kicad_pcb": output}
+    if svg:
+        paths["svg"] = os.path.splitext(output)[0] + ".svg"
+    return paths
+
+
+def generate_boards(
+    specs: Sequence[BoardSpec],
+    stackup: Optional[str] = None,
+    template_path: Optional[str] = None,
+    output_dir: Optional[str] = None,
+    svg: bool = False,
+    jobs: Optional[int] = None,
+    dry_run: bool = False,
+    cache: Optional[BaseCoilCache] = None,
+) -> List[Dict[str, Any]]:
+    """Generate one KiCad PCB file per board specification.
+
+    Options passed here take precedence over the values in the spec files.
+    Boards are written next to their spec file unless the spec or
+    ``output_dir`` says otherwise.
+
+    Args:
+        specs: Board specifications, e.g. from :func:`kicad_draw.spec.load_board_spec`
+        stackup: The PCB stackup configuration (None uses the spec's, then
+            "default_4layer")
+        template_path: KiCad PCB template (None uses the spec's)
+        output_dir: Directory for the generated files (created if missing)
+        svg: Also write an SVG preview of every board
+        jobs: Number of worker processes (None uses all CPUs, 1 runs inline)
+        dry_run: Only draw the boards and report element counts
+        cache: Optional coil cache; coils found in it are not redrawn and
+            newly drawn coils are added to it
+
+    Returns:
+        One summary per board with its name, stackup, coil, element and
+        cache hit counts and the output paths (empty on a dry run)
+
+    """
+    boards = []
+    for spec in specs:
+        board_stackup = stackup or spec.stackup or DEFAULT_STACKUP
+        if board_stackup not in default_layers:
+            raise ValueError(f"Unknown stackup: {board_stackup}")
+        board_template = template_path or spec.template
+        if board_template is None and not dry_run:
+            raise ValueError(f"{spec.source}: no template given for the board")
+        boards.append((spec, board_stackup, board_template))
+
+    if not dry_run:
+        # Boards with the same output file would silently overwrite each other
+        sources: Dict[str, str] = {}
+        for spec, _, _ in boards:
+            for path in board_paths(spec, output_dir, svg).values():
+                path = os.path.abspath(path)
+                if path in sources:
+                    raise ValueError(
+                        f"{spec.source} and {sources[path]} both write {path}"
+                    )
+                sources[path] = spec.source
+
+    svg = svg and not dry_run
+    tasks = [
+        (params_type_name(params), params.model_dump(), board_stackup, svg)
+        for spec, board_stackup, _ in boards
+        for params in spec.coils
+    ]
+
+    # Look up every coil in the cache first; only the misses are drawn
+    results: List[Optional[Tuple]] = [None] * len(tasks)
+    keys: List[Optional[str]] = [None] * len(tasks)
+    hits = [False] * len(tasks)
+    if cache is not None:
+        formatter = KiCadFormatter()
+        digests = {}
+        index = 0
+        for spec, board_stackup, board_template in boards:
+            if board_template is not None and board_template not in digests:
+                digests[board_template] = file_digest(board_template)
+            layers = default_layers[board_stackup]["layer_list"]
+            for params in spec.coils:
+                keys[index] = cache.key(
+                    params, layers, digests.get(board_template), formatter
+                )
+                entry = cache.get(keys[index], svg=svg)
+                if entry is not None:
+                    results[index] = tuple(entry)
+                    hits[index] = True
+                index += 1
+
+    pending = [i for i, result in enumerate(results) if result is None]
+    drawn = map_tasks(draw_coil_task, [tasks[i] for i in pending], jobs)
+    for i, result in zip(pending, drawn):
+        results[i] = result
+        if cache is not None:
+            cache.put(keys[i], *result)
+
+    templates: Dict[str, str] = {}
+    summaries = []
+    index = 0
+    for spec, board_stackup, board_template in boards:
+        pcb = PCBdraw(board_stackup, mode="file", enable_visualization=svg)
+        start = index
+        for _ in spec.coils:
+            elements, svg_elements = results[index]
+            index += 1
+            pcb.elements.extend(elements)
+            if svg:
+                pcb.visualizer.add_elements(svg_elements)
+
+        outputs = {} if dry_run else board_paths(spec, output_dir, svg)
+        if "kicad_pcb" in outputs:
+            if board_template not in templates:
+                with open(board_template, "r") as f:
+                    templates[board_template] = f.read()
+            content = pcb._merge_template(templates[board_template])
+            if content is None:
+                raise ValueError(f"Invalid template file format: {board_template}")
+            os.makedirs(
+                os.path.dirname(os.path.abspath(outputs["kicad_pcb"])), exist_ok=True
+            )
+            with open(outputs["kicad_pcb"], "w") as f:
+                f.write(content)
+        if "svg" in outputs:
+            with open(outputs["svg"], "w") as f:
+                f.write(pcb.get_svg())
+
+        summaries.append(
+            {
+                "name": spec.name,
+                "source": spec.source,
+                "stackup": board_stackup,
+                "coil_count": len(spec.coils),
+                "element_count": len(pcb.elements),
+                "cache_hits": sum(hits[start:index]),
+                "outputs": outputs,
+            }
+        )
+
+    return summaries
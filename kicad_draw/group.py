@@ -0,0 +1,515 @@
+"""Structured capture of drawn elements.
+
+An :class:`ElementGroup` holds the geometry produced by drawing calls as NumPy
+record arrays instead of formatted s-expressions: segments and vias for the
+KiCad output, plus the true arcs the visualizer draws in place of tessellated
+segments. Layers are stored as stackup indices, so a group can be
+transformed, re-netted and formatted in bulk without redrawing.
+"""
+
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+SEGMENT_DTYPE = np.dtype(
+    [
+        ("x1", np.float64),
+        ("y1", np.float64),
+        ("x2", np.float64),
+        ("y2", np.float64),
+        ("width", np.float64),
+        ("layer", np.int16),
+        ("net", np.int32),
+    ]
+)
+VIA_DTYPE = np.dtype(
+    [
+        ("x", np.float64),
+        ("y", np.float64),
+        ("size", np.float64),
+        ("drill", np.float64),
+        ("layer1", np.int16),
+        ("layer2", np.int16),
+        ("net", np.int32),
+    ]
+)
+ARC_DTYPE = np.dtype(
+    [
+        ("cx", np.float64),
+        ("cy", np.float64),
+        ("radius", np.float64),
+        ("start_angle", np.float64),
+        ("end_angle", np.float64),
+        ("width", np.float64),
+        ("layer", np.int16),
+    ]
+)
+# Visualizer elements in drawing order: kind and row in the matching array
+VISUAL_DTYPE = np.dtype([("kind", np.uint8), ("index", np.int32)])
+
+# Kinds of output elements (``ElementGroup.order``)
+SEGMENT = 0
+VIA = 1
+
+# Kinds of visualizer elements (``ElementGroup.visual["kind"]``)
+VISUAL_LINE = 0
+VISUAL_ARC = 1
+VISUAL_VIA = 2
+
+# Relative tolerance when checking that a transform preserves arcs
+SIMILARITY_TOLERANCE = 1e-9
+
+
+def as_affine(matrix) -> np.ndarray:
+    """Validate a 3x3 affine transform matrix or a stack of them.
+
+    Args:
+        matrix: Array-like 3x3 matrix acting on column vectors (x, y, 1), or
+            an (N, 3, 3) stack of such matrices
+
+    Returns:
+        The matrix (or stack) as a float array
+
+    """
+    m = np.asarray(matrix, dtype=np.float64)
+    if m.ndim not in (2, 3) or m.shape[-2:] != (3, 3):
+        raise ValueError(f"Transform must be a 3x3 matrix, got shape {m.shape}")
+    if not np.allclose(m[..., 2, :], (0.0, 0.0, 1.0)):
+        raise ValueError("Transform must be affine (last row 0, 0, 1)")
+    if not np.all(np.isfinite(m)):
+        raise ValueError("Transform must be finite")
+    return m
+
+
+def similarity(linear: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Decompose linear transforms that map circles to circles.
+
+    Args:
+        linear: 2x2 linear part of an affine transform, or an (N, 2, 2) stack
+
+    Returns:
+        Tuple of (scale, rotation angle in radians, whether it reflects), as
+        arrays with one entry per transform
+
+    """
+    gram = np.swapaxes(linear, -1, -2) @ linear
+    scale_sq = (gram[..., 0, 0] + gram[..., 1, 1]) / 2
+    deviation = np.abs(gram - scale_sq[..., None, None] * np.eye(2))
+    if np.any(scale_sq == 0) or np.any(
+        deviation > SIMILARITY_TOLERANCE * scale_sq[..., None, None]
+    ):
+        raise ValueError(
+            "Arcs can only be transformed by rotations, reflections, "
+            "translations and uniform scaling"
+        )
+    return (
+        np.sqrt(scale_sq),
+        np.arctan2(linear[..., 1, 0], linear[..., 0, 0]),
+        np.linalg.det(linear) < 0,
+    )
+
+
+def as_text(*columns: np.ndarray) -> List[List[str]]:
+    """Convert numeric columns to text, converting each distinct value once.
+
+    Floats are written as ``str(float)`` (shortest round-trip form) and ints
+    as ``str(int)``, the same text f-strings produce.
+
+    Args:
+        *columns: Arrays of one dtype and equal length
+
+    Returns:
+        One list of strings per column
+
+    """
+    values = np.concatenate(columns)
+    if values.dtype.kind == "f":
+        # Compare bit patterns so that -0.0 keeps its sign
+        unique, inverse = np.unique(
+            values.astype(np.float64).view(np.int64), return_inverse=True
+        )
+        unique = unique.view(np.float64)
+    else:
+        unique, inverse = np.unique(values, return_inverse=True)
+    text = np.array([str(value) for value in unique.tolist()], dtype=object)
+    text = text[inverse]
+    size = len(columns[0])
+    return [text[i * size : (i + 1) * size].tolist() for i in range(len(columns))]
+
+
+class ElementGroup:
+    """Elements of one or more drawing calls stored as record arrays.
+
+    Attributes:
+        segments: Track segments (``SEGMENT_DTYPE``)
+        vias: Vias (``VIA_DTYPE``)
+        arcs: True arcs shown by the visualizer (``ARC_DTYPE``); their
+            tessellation is part of ``segments``
+        order: Kind (``SEGMENT`` or ``VIA``) of each output element in order
+        visual: Visualizer elements in order (``VISUAL_DTYPE``)
+
+    """
+
+    def __init__(
+        self,
+        segments: Optional[np.ndarray] = None,
+        vias: Optional[np.ndarray] = None,
+        arcs: Optional[np.ndarray] = None,
+        order: Optional[np.ndarray] = None,
+        visual: Optional[np.ndarray] = None,
+    ):
+        """Initialize a group from record arrays.
+
+        Args:
+            segments: Track segments; empty if omitted
+            vias: Vias; empty if omitted
+            arcs: Visualizer arcs; empty if omitted
+            order: Output element kinds; all segments then all vias if omitted
+            visual: Visualizer elements; none if omitted
+
+        """
+        self.segments = np.zeros(0, SEGMENT_DTYPE) if segments is None else segments
+        self.vias = np.zeros(0, VIA_DTYPE) if vias is None else vias
+        self.arcs = np.zeros(0, ARC_DTYPE) if arcs is None else arcs
+        if order is None:
+            order = np.repeat(
+                np.array([SEGMENT, VIA], dtype=np.uint8),
+                [len(self.segments), len(self.vias)],
+            )
+        self.order = order
+        self.visual = np.zeros(0, VISUAL_DTYPE) if visual is None else visual
+
+    def __len__(self) -> int:
+        """Number of output elements."""
+        return len(self.order)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the group's arrays in bytes."""
+        return sum(
+            a.nbytes
+            for a in (self.segments, self.vias, self.arcs, self.order, self.visual)
+        )
+
+    def copy(self) -> "ElementGroup":
+        """Return a deep copy of the group."""
+        return ElementGroup(
+            self.segments.copy(),
+            self.vias.copy(),
+            self.arcs.copy(),
+            self.order.copy(),
+            self.visual.copy(),
+        )
+
+    def transformed(self, matrix) -> "ElementGroup":
+        """Return the group with an affine transform applied to its geometry.
+
+        Coordinates are transformed; track widths and via sizes are kept.
+        Groups containing arcs only accept transforms that map circles to
+        circles (rotation, reflection, translation and uniform scaling).
+
+        Args:
+            matrix: 3x3 affine matrix acting on column vectors (x, y, 1)
+
+        Returns:
+            A new, transformed group
+
+        """
+        m = as_affine(matrix)
+        if m.ndim != 2:
+            raise ValueError("transformed() takes a single matrix, use tile()")
+        return self.tile(m[None])
+
+    def tile(self, matrices, nets=None) -> "ElementGroup":
+        """Return transformed copies of the group, computed in one pass.
+
+        Every column is broadcast against the whole stack of transforms at
+        once; the copies are stored one after another.
+
+        Args:
+            matrices: (N, 3, 3) stack of affine matrices, one per copy
+            nets: Optional net number per copy; negative entries keep the
+                group's own nets
+
+        Returns:
+            A group holding the N copies
+
+        """
+        m = as_affine(matrices)
+        if m.ndim != 3:
+            raise ValueError("tile() takes an (N, 3, 3) stack of matrices")
+        n = len(m)
+
+        def apply(x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+            x, y = x[None, :], y[None, :]
+            return (
+                (
+                    m[:, 0, 0, None] * x + m[:, 0, 1, None] * y + m[:, 0, 2, None]
+                ).ravel(),
+                (
+                    m[:, 1, 0, None] * x + m[:, 1, 1, None] * y + m[:, 1, 2, None]
+                ).ravel(),
+            )
+
+        s, v, a = self.segments, self.vias, self.arcs
+        segments = np.tile(s, n)
+        segments["x1"], segments["y1"] = apply(s["x1"], s["y1"])
+        segments["x2"], segments["y2"] = apply(s["x2"], s["y2"])
+        vias = np.tile(v, n)
+        vias["x"], vias["y"] = apply(v["x"], v["y"])
+        arcs = np.tile(a, n)
+        if len(a):
+            scale, rotation, reflected = similarity(m[:, :2, :2])
+            arcs["cx"], arcs["cy"] = apply(a["cx"], a["cy"])
+            arcs["radius"] = (scale[:, None] * a["radius"]).ravel()
+            for field in ("start_angle", "end_angle"):
+                angle = a[field][None, :]
+                arcs[field] = np.where(
+                    reflected[:, None],
+                    rotation[:, None] - angle,
+                    angle + rotation[:, None],
+                ).ravel()
+
+        if nets is not None:
+            nets = np.asarray(nets, dtype=np.int64)
+            if nets.shape != (n,):
+                raise ValueError(f"Expected {n} nets, got shape {nets.shape}")
+            for array, count in ((segments, len(s)), (vias, len(v))):
+                per_row = np.repeat(nets, count)
+                array["net"] = np.where(per_row >= 0, per_row, array["net"])
+
+        visual = np.tile(self.visual, n)
+        if len(visual):
+            # Point each copy's visual elements at that copy's rows
+            counts = np.zeros(max(VISUAL_LINE, VISUAL_ARC, VISUAL_VIA) + 1, np.int64)
+            counts[[VISUAL_LINE, VISUAL_ARC, VISUAL_VIA]] = len(s), len(a), len(v)
+            copy_index = np.repeat(np.arange(n), len(self.visual))
+            visual["index"] += copy_index * counts[visual["kind"]]
+        return ElementGroup(segments, vias, arcs, np.tile(self.order, n), visual)
+
+    @classmethod
+    def concatenate(cls, groups: Sequence["ElementGroup"]) -> "ElementGroup":
+        """Join groups into one, keeping their drawing order.
+
+        Args:
+            groups: Groups to join
+
+        Returns:
+            A new group with the elements of all groups
+
+        """
+        if not groups:
+            return cls()
+        counts = np.zeros(max(VISUAL_LINE, VISUAL_ARC, VISUAL_VIA) + 1, np.int64)
+        visual = []
+        for group in groups:
+            shifted = group.visual.copy()
+            shifted["index"] += counts[shifted["kind"]]
+            visual.append(shifted)
+            counts[[VISUAL_LINE, VISUAL_ARC, VISUAL_VIA]] += (
+                len(group.segments),
+                len(group.arcs),
+                len(group.vias),
+            )
+        return cls(
+            np.concatenate([group.segments for group in groups]),
+            np.concatenate([group.vias for group in groups]),
+            np.concatenate([group.arcs for group in groups]),
+            np.concatenate([group.order for group in groups]),
+            np.concatenate(visual),
+        )
+
+    def remap_layers(self, mapping) -> "ElementGroup":
+        """Return a copy of the group with layer indices replaced.
+
+        Via layer pairs are kept in stackup order after remapping.
+
+        Args:
+            mapping: Array-like giving the new index of every layer index,
+                e.g. :func:`kicad_draw.transform.flip_layers`
+
+        Returns:
+            A new group on the remapped layers
+
+        """
+        lookup = np.asarray(mapping, dtype=np.int64)
+        group = self.copy()
+        used = np.concatenate(
+            (self.segments["layer"], self.vias["layer1"], self.vias["layer2"])
+        )
+        if used.size and used.max() >= len(lookup):
+            raise ValueError(
+                f"Layer mapping has {len(lookup)} entries, "
+                f"group uses layer {int(used.max())}"
+            )
+        group.segments["layer"] = lookup[self.segments["layer"]]
+        group.arcs["layer"] = lookup[self.arcs["layer"]]
+        layer1 = lookup[self.vias["layer1"]]
+        layer2 = lookup[self.vias["layer2"]]
+        group.vias["layer1"] = np.minimum(layer1, layer2)
+        group.vias["layer2"] = np.maximum(layer1, layer2)
+        return group
+
+    def with_net(self, net: int) -> "ElementGroup":
+        """Return a copy of the group with every element on one net."""
+        group = self.copy()
+        group.segments["net"] = net
+        group.vias["net"] = net
+        return group
+
+    def format(self, layers: Sequence[str], formatter) -> List[str]:
+        """Format the group as KiCad s-expressions in drawing order.
+
+        Numbers are written exactly as the formatter writes Python floats and
+        ints, but each distinct value is converted to text only once.
+
+        Args:
+            layers: Layer names of the stackup, in index order
+            formatter: KiCadFormatter producing the s-expressions
+
+        Returns:
+            One s-expression per output element
+
+        """
+        s, v = self.segments, self.vias
+        names = np.asarray(layers, dtype=object)
+        segments = formatter.format_segments(
+            *as_text(s["x1"], s["y1"], s["x2"], s["y2"]),
+            *as_text(s["width"]),
+            names[s["layer"]].tolist(),
+            *as_text(s["net"]),
+        )
+        if not len(v):
+            return segments
+        vias = formatter.format_vias(
+            *as_text(v["x"], v["y"]),
+            *as_text(v["size"], v["drill"]),
+            names[v["layer1"]].tolist(),
+            names[v["layer2"]].tolist(),
+            *as_text(v["net"]),
+        )
+        elements = np.empty(len(self.order), dtype=object)
+        elements[self.order == SEGMENT] = segments
+        elements[self.order == VIA] = vias
+        return elements.tolist()
+
+    def visual_elements(self, layers: Sequence[str]) -> List[dict]:
+        """Build the visualizer element dicts of the group in drawing order.
+
+        Args:
+            layers: Layer names of the stackup, in index order
+
+        Returns:
+            Element dicts as stored in ``PCBVisualizer.elements``
+
+        """
+        s = self.segments[self.visual["index"][self.visual["kind"] == VISUAL_LINE]]
+        a = self.arcs[self.visual["index"][self.visual["kind"] == VISUAL_ARC]]
+        v = self.vias[self.visual["index"][self.visual["kind"] == VISUAL_VIA]]
+        lines = [
+            {
+                "type": "line",
+                "x1": x1,
+                "y1": y1,
+                "x2": x2,
+                "y2": y2,
+                "width": width,
+                "layer": layers[layer],
+            }
+            for x1, y1, x2, y2, width, layer, _ in s.tolist()
+        ]
+        arcs = [
+            {
+                "type": "arc",
+                "cx": cx,
+                "cy": cy,
+                "radius": radius,
+                "start_angle": start,
+                "end_angle": end,
+                "width": width,
+                "layer": layers[layer],
+            }
+            for cx, cy, radius, start, end, width, layer in a.tolist()
+        ]
+        vias = [
+            {"type": "via", "x": x, "y": y, "size": size}
+            for x, y, size, _, _, _, _ in v.tolist()
+        ]
+        elements = np.empty(len(self.visual), dtype=object)
+        kinds = self.visual["kind"]
+        for kind, items in (
+            (VISUAL_LINE, lines),
+            (VISUAL_ARC, arcs),
+            (VISUAL_VIA, vias),
+        ):
+            if items:
+                elements[kinds == kind] = items
+        return elements.tolist()
+
+
+class GroupBuilder:
+    """Collects drawing calls into an :class:`ElementGroup`."""
+
+    def __init__(self):
+        """Initialize an empty builder."""
+        self._segments = []
+        self._vias = []
+        self._arcs = []
+        self._order = []
+        self._visual = []
+
+    def add_segment(
+        self,
+        x1: float,
+        y1: float,
+        x2: float,
+        y2: float,
+        width: float,
+        layer: int,
+        net: int,
+        visual: bool = False,
+    ) -> None:
+        """Record a track segment, optionally also shown as a visualizer line."""
+        if visual:
+            self._visual.append((VISUAL_LINE, len(self._segments)))
+        self._segments.append((x1, y1, x2, y2, width, layer, net))
+        self._order.append(SEGMENT)
+
+    def add_arc(
+        self,
+        cx: float,
+        cy: float,
+        radius: float,
+        start_angle: float,
+        end_angle: float,
+        width: float,
+        layer: int,
+    ) -> None:
+        """Record a visualizer arc (its tessellation is added as segments)."""
+        self._visual.append((VISUAL_ARC, len(self._arcs)))
+        self._arcs.append((cx, cy, radius, start_angle, end_angle, width, layer))
+
+    def add_via(
+        self,
+        x: float,
+        y: float,
+        size: float,
+        drill: float,
+        layer1: int,
+        layer2: int,
+        net: int,
+    ) -> None:
+        """Record a via, shown by the visualizer too."""
+        self._visual.append((VISUAL_VIA, len(self._vias)))
+        self._vias.append((x, y, size, drill, layer1, layer2, net))
+        self._order.append(VIA)
+
+    def build(self) -> ElementGroup:
+        """Create the group from the recorded calls."""
+        return ElementGroup(
+            np.array(self._segments, dtype=SEGMENT_DTYPE),
+            np.array(self._vias, dtype=VIA_DTYPE),
+            np.array(self._arcs, dtype=ARC_DTYPE),
+            np.array(self._order, dtype=np.uint8),
+            np.array(self._visual, dtype=VISUAL_DTYPE),
+        )
@@ -10,6 +10,7 @@ class LayerManager:
 
     def __init__(self, stackup: Literal[tuple(default_layers)]):
         """Initialize with a specific stackup."""
+        self.stackup = stackup
         self.layers = default_layers[stackup]["layer_list"]
 
     def validate_layer(self, index: int) -> bool:
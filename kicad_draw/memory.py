@@ -0,0 +1,143 @@
+"""Memory accounting for the element stores of a PCB.
+
+:meth:`PCBdraw.memory_usage <kicad_draw.PCBmodule.PCBdraw.memory_usage>`
+reports the bytes held by each store (the s-expressions in
+``PCBdraw.elements``, the visualizer elements, the per-node output and
+geometry kept for editing, cell geometry, and spilled elements not written to
+disk yet). Sizes are estimated from the objects' ``sys.getsizeof``; strings
+shared between stores (node output is the same string objects as
+``PCBdraw.elements``, layer names are shared by all visualizer elements) are
+counted once.
+
+A memory budget (:meth:`PCBdraw.set_memory_budget
+<kicad_draw.PCBmodule.PCBdraw.set_memory_budget>`) is checked after every
+high-level drawing call. Measuring is linear in the number of elements, so
+between full measurements the usage is extrapolated from the element count
+and re-measured only when it has grown noticeably or gets close to the
+budget; the checks cost O(1) amortized per call.
+"""
+
+import sys
+import tracemalloc
+from typing import Callable, Dict, Iterable, List, Optional
+
+MB = 1024 * 1024
+# Full re-measurement after the element count grew by this fraction
+REMEASURE_GROWTH = 0.1
+# ... or when the extrapolated usage is within this fraction of the budget
+REMEASURE_MARGIN = 0.1
+
+_POINTER = 8  # List slot per item
+
+STORES = ("elements", "visualizer", "nodes", "cells", "spill")
+
+
+def strings_bytes(strings: Iterable[str]) -> int:
+    """Bytes held by a list of strings (list slots and string objects)."""
+    return sum(sys.getsizeof(s) + _POINTER for s in strings)
+
+
+def visual_bytes(elements: Iterable[dict]) -> int:
+    """Bytes held by a list of visualizer element dicts.
+
+    The type and layer strings are shared by all elements and not counted.
+    """
+    total = 0
+    for element in elements:
+        total += sys.getsizeof(element) + _POINTER
+        total += sum(
+            sys.getsizeof(value)
+            for value in element.values()
+            if not isinstance(value, str)
+        )
+    return total
+
+
+def format_usage(usage: Dict[str, int]) -> str:
+    """One-line summary of a memory usage dict, in MB."""
+    stores = ", ".join(f"{name} {usage[name] / MB:.1f} MB" for name in STORES)
+    return f"{usage['total'] / MB:.1f} MB held ({stores})"
+
+
+def top_allocations(limit: int = 5) -> List[str]:
+    """Largest allocation sites by line, if tracemalloc is tracing."""
+    if not tracemalloc.is_tracing():
+        return []
+    statistics = tracemalloc.take_snapshot().statistics("lineno")
+    return [str(stat) for stat in statistics[:limit]]
+
+
+class MemoryBudgetExceeded(MemoryError):
+    """The element stores of a PCB outgrew its memory budget."""
+
+    def __init__(self, budget: int, usage: Dict[str, int]):
+        """Initialize the error.
+
+        Args:
+            budget: Budget in bytes
+            usage: Memory usage per store when the budget was exceeded
+
+        """
+        self.budget = budget
+        self.usage = usage
+        self.allocations = top_allocations()
+        message = f"Memory budget of {budget / MB:.1f} MB exceeded: "
+        message += format_usage(usage)
+        if self.allocations:
+            message += "\nLargest allocations:\n  " + "\n  ".join(self.allocations)
+        super().__init__(message)
+
+
+class MemoryBudget:
+    """Budget for the element stores, checked incrementally."""
+
+    POLICIES = ("raise", "drop_visualization", "spill")
+
+    def __init__(self, limit: int, on_exceed: str = "raise"):
+        """Initialize a budget.
+
+        Args:
+            limit: Budget in bytes
+            on_exceed: "raise" to fail fast with :class:`MemoryBudgetExceeded`,
+                "drop_visualization" to free the visualizer elements first
+                and only raise if that is not enough, or "spill" to move
+                later drawing calls to disk (see :mod:`kicad_draw.spill`)
+
+        """
+        if limit <= 0:
+            raise ValueError(f"Memory budget must be positive, got {limit}")
+        if on_exceed not in self.POLICIES:
+            raise ValueError(
+                f"on_exceed must be one of {', '.join(self.POLICIES)}, "
+                f"got {on_exceed!r}"
+            )
+        self.limit = limit
+        self.on_exceed = on_exceed
+        self._count = 0
+        self._total = 0
+
+    def check(
+        self,
+        count: int,
+        measure: Callable[[], Dict[str, int]],
+        force: bool = False,
+    ) -> Optional[Dict[str, int]]:
+        """Check the usage of stores holding ``count`` elements.
+
+        Args:
+            count: Current number of elements in the stores
+            measure: Function returning the full memory usage
+            force: Measure even if the extrapolation is within budget
+
+        Returns:
+            The measured usage if it exceeds the budget, otherwise None
+
+        """
+        small = self._count and count <= self._count * (1 + REMEASURE_GROWTH)
+        if small and not force:
+            estimate = self._total * count / self._count
+            if estimate <= self.limit * (1 - REMEASURE_MARGIN):
+                return None
+        usage = measure()
+        self._count, self._total = count, usage["total"]
+        return usage if usage["total"] > self.limit else None
@@ -4,7 +4,7 @@ This module contains Pydantic models that define the parameters
 for various PCB drawing operations, ensuring type safety and validation.
 """
 
-from typing import List, Literal
+from typing import Dict, List, Literal, Type, Union
 
 from pydantic import BaseModel
 
@@ -91,3 +91,22 @@ class HelixRectangleParams(BaseModel):
     segment_number: int = 100
     port_gap: float = 0.0  # Gap size for ports (0 means no ports)
     tab_gap: float = 0.0  # Extension distance for connection tabs
+
+
+# Union of all coil parameter models accepted by PCBdraw.draw()
+CoilParams = Union[HelixParams, HelixRectangleParams]
+
+# Registry of coil parameter models by type name, used for serialized
+# parameter sets (sweeps, parameter files)
+PARAMS_TYPES: Dict[str, Type[BaseModel]] = {
+    "helix": HelixParams,
+    "helix_rectangle": HelixRectangleParams,
+}
+
+
+def params_type_name(params: BaseModel) -> str:
+    """Get the registry type name of a coil parameter model."""
+    for name, model in PARAMS_TYPES.items():
+        if type(params) is model:
+            return name
+    raise TypeError(f"Unsupported parameter model: {type(params).__name__}")
@@ -0,0 +1,208 @@
+"""Retained-mode handles for high-level drawing calls.
+
+In file mode, every high-level drawing call of :class:`~kicad_draw.PCBmodule.PCBdraw`
+(``draw``, ``draw_helix``, ``draw_helix_rectangle``) returns a
+:class:`DrawNode` that owns the range of elements the call produced. Editing
+a node (its parameters, transform, net or visibility) only marks it dirty;
+the next ``export()``/``save()`` regenerates the dirty nodes and reuses the
+output of all others.
+"""
+
+from typing import TYPE_CHECKING, Callable, List, Optional
+
+import numpy as np
+
+from kicad_draw.group import ElementGroup, as_affine
+from kicad_draw.transform import apply, identity, mirror_x
+
+if TYPE_CHECKING:
+    from kicad_draw.models import CoilParams
+    from kicad_draw.PCBmodule import PCBdraw
+
+
+class DrawNode:
+    """Editable handle to the elements of one high-level drawing call."""
+
+    def __init__(
+        self,
+        pcb: "PCBdraw",
+        params: "CoilParams",
+        attached: bool = True,
+        layout: Optional[Callable[["CoilParams"], np.ndarray]] = None,
+        net_step: int = 0,
+    ):
+        """Initialize a node.
+
+        Args:
+            pcb: The PCBdraw instance owning the node
+            params: Parameter model the node is drawn from
+            attached: False for nodes drawn in print mode, whose output was
+                already printed and cannot be edited
+            layout: For arrays, function returning the (N, 3, 3) transforms of
+                the copies for the current parameters
+            net_step: Net number increment between array copies
+
+        """
+        self._pcb = pcb
+        self._params = params
+        self._attached = attached
+        self._layout = layout
+        self._net_step = net_step
+        self._transform: Optional[np.ndarray] = None
+        self._net: Optional[int] = None
+        self._visible = True
+        self._flipped = False
+        self._removed = False
+        self._dirty = attached
+        # Captured geometry, kept while a transform or net override needs it
+        self._group: Optional[ElementGroup] = None
+        # Rendered output and its ranges in the PCB and visualizer buffers
+        self._elements: List[str] = []
+        self._svg_elements: List[dict] = []
+        self._span = (0, 0)
+        self._svg_span = (0, 0)
+
+    def __repr__(self) -> str:
+        """Short description of the node."""
+        state = "dirty" if self._dirty else f"{len(self._elements)} elements"
+        return f"DrawNode({type(self._params).__name__}, {state})"
+
+    def _touch(self) -> None:
+        """Mark the node dirty after an edit."""
+        if not self._attached or self._removed:
+            raise RuntimeError(
+                "Only nodes drawn in file mode and not removed can be edited"
+            )
+        self._dirty = True
+        self._pcb._dirty_nodes = True
+
+    @property
+    def params(self) -> "CoilParams":
+        """Parameter model the node is drawn from."""
+        return self._params
+
+    @params.setter
+    def params(self, params: "CoilParams") -> None:
+        self._touch()
+        self._params = params
+        self._group = None
+
+    def update(self, **changes) -> "DrawNode":
+        """Replace some parameter fields (validated like the model itself).
+
+        Args:
+            **changes: Field values to change
+
+        Returns:
+            The node, for chaining
+
+        """
+        fields = {**self._params.model_dump(), **changes}
+        self.params = type(self._params)(**fields)
+        return self
+
+    @property
+    def count(self) -> int:
+        """Number of coil copies drawn by the node (1 unless it is an array)."""
+        return 1 if self._layout is None else len(self._layout(self._params))
+
+    def _copies(self) -> Optional[tuple]:
+        """Transforms and nets of the array copies, or None for a single coil."""
+        if self._layout is None:
+            return None
+        matrices = self._layout(self._params)
+        nets = self._params.net_number + self._net_step * np.arange(len(matrices))
+        return matrices, nets
+
+    @property
+    def transform(self) -> Optional[np.ndarray]:
+        """3x3 affine transform applied to the node's geometry, or None."""
+        return None if self._transform is None else self._transform.copy()
+
+    @transform.setter
+    def transform(self, matrix) -> None:
+        matrix = None if matrix is None else as_affine(matrix)
+        self._touch()
+        self._transform = matrix
+
+    def apply_transform(self, matrix) -> "DrawNode":
+        """Apply a transform on top of the node's current transform.
+
+        Args:
+            matrix: 3x3 affine matrix (see :mod:`kicad_draw.transform`)
+
+        Returns:
+            The node, for chaining
+
+        """
+        current = identity() if self._transform is None else self._transform
+        self.transform = as_affine(matrix) @ current
+        return self
+
+    @property
+    def flipped(self) -> bool:
+        """Whether the node's layers are reversed (moved to the other side)."""
+        return self._flipped
+
+    @flipped.setter
+    def flipped(self, flipped: bool) -> None:
+        self._touch()
+        self._flipped = bool(flipped)
+
+    def flip(self, x: Optional[float] = None) -> "DrawNode":
+        """Move the node to the other board side, like flipping a footprint.
+
+        The geometry is mirrored across a vertical line and the layers are
+        reversed (F.Cu and B.Cu swap); flipping twice restores the node.
+
+        Args:
+            x: X-coordinate of the mirror line (default: the coil center)
+
+        Returns:
+            The node, for chaining
+
+        """
+        if x is None:
+            current = identity() if self._transform is None else self._transform
+            x = float(apply(current, self._params.x0, self._params.y0)[0])
+        self.apply_transform(mirror_x(x))
+        self.flipped = not self._flipped
+        return self
+
+    @property
+    def net(self) -> int:
+        """Net of the node's elements (the parameters' net unless overridden)."""
+        return self._params.net_number if self._net is None else self._net
+
+    @net.setter
+    def net(self, net: Optional[int]) -> None:
+        if net is not None and (not isinstance(net, int) or net < 0):
+            raise ValueError(f"Net must be a non-negative integer, got {net!r}")
+        self._touch()
+        self._net = net
+
+    @property
+    def visible(self) -> bool:
+        """Whether the node's elements are part of the output."""
+        return self._visible
+
+    @visible.setter
+    def visible(self, visible: bool) -> None:
+        self._touch()
+        self._visible = bool(visible)
+
+    @property
+    def dirty(self) -> bool:
+        """Whether the node was edited since it was last rendered."""
+        return self._dirty
+
+    @property
+    def elements(self) -> List[str]:
+        """S-expressions of the node (empty while hidden)."""
+        self._pcb.refresh()
+        return list(self._elements) if self._visible else []
+
+    def remove(self) -> None:
+        """Remove the node and its elements from the PCB."""
+        self._touch()
+        self._removed = True
@@ -0,0 +1,61 @@
+"""Order-preserving process pool shared by the batch entry points.
+
+Board generation, parameter sweeps and inductance batches all run one task
+per coil or variant. :func:`map_tasks` runs them inline or across worker
+processes and always returns the results in task order, so outputs do not
+depend on the number of workers.
+"""
+
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Iterable, List, Optional, Sequence, TypeVar
+
+T = TypeVar("T")
+
+# Chunks per worker when no chunk size is given, to balance uneven tasks
+CHUNKS_PER_WORKER = 4
+
+
+def worker_count(jobs: Optional[int] = None) -> int:
+    """Number of workers to use (None: all CPUs)."""
+    return jobs or os.cpu_count() or 1
+
+
+def map_tasks(
+    function: Callable[[Any], T],
+    tasks: Iterable[Any],
+    jobs: Optional[int] = None,
+    chunksize: Optional[int] = None,
+    initializer: Optional[Callable[..., None]] = None,
+    initargs: Sequence[Any] = (),
+) -> List[T]:
+    """Call a picklable function for every task, possibly in worker processes.
+
+    Args:
+        function: Module-level function taking one task
+        tasks: Picklable task arguments
+        jobs: Number of worker processes (None uses all CPUs, 1 runs inline)
+        chunksize: Tasks sent to a worker at once (None picks a size that
+            gives each worker about four chunks)
+        initializer: Called with ``initargs`` in every worker before its
+            first task (or once in this process when running inline)
+        initargs: Arguments of the initializer
+
+    Returns:
+        The function's results, in task order
+
+    """
+    tasks = list(tasks)
+    jobs = worker_count(jobs)
+    if jobs == 1 or len(tasks) <= 1:
+        if initializer is not None:
+            initializer(*initargs)
+        return [function(task) for task in tasks]
+
+    chunksize = chunksize or max(1, math.ceil(len(tasks) / (jobs * CHUNKS_PER_WORKER)))
+    with ProcessPoolExecutor(
+        max_workers=jobs, initializer=initializer, initargs=tuple(initargs)
+    ) as executor:
+        # map() yields results in task order regardless of completion order
+        return list(executor.map(function, tasks, chunksize=chunksize))
@@ -0,0 +1,125 @@
+"""Progressive previews for Jupyter notebooks.
+
+A progressive preview shows a low-detail raster rendering immediately and
+then generates the full SVG in a background thread, replacing the coarse
+image in the same notebook display once it is ready. Starting a new preview
+(e.g. after changing parameters) cancels the pending refinement.
+"""
+
+import copy
+import threading
+from typing import List, Optional
+
+from .constants import Defaults
+from .visualizer import PCBVisualizer
+
+
+class ProgressivePreview:
+    """Coarse-then-refine preview of a PCBVisualizer in a notebook display."""
+
+    def __init__(
+        self,
+        visualizer: PCBVisualizer,
+        layer_order: Optional[List[str]] = None,
+        coarse_size: Optional[int] = None,
+    ):
+        """Initialize progressive preview.
+
+        The visualizer state is snapshotted, so drawing more elements while
+        the preview refines does not affect it.
+
+        Args:
+            visualizer: PCBVisualizer holding the elements to preview
+            layer_order: Optional stackup layer order for the SVG legend
+            coarse_size: Longest side in pixels of the coarse raster preview
+                (defaults to the visualizer canvas size)
+
+        """
+        self.visualizer = self._snapshot(visualizer)
+        self.layer_order = layer_order
+        self.coarse_size = coarse_size or int(max(visualizer.width, visualizer.height))
+        self.handle = None
+        self.svg: Optional[str] = None
+        self._cancelled = threading.Event()
+        self._done = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _snapshot(visualizer: PCBVisualizer) -> PCBVisualizer:
+        """Copy the visualizer state needed for rendering."""
+        snapshot = copy.copy(visualizer)
+        snapshot.elements = list(visualizer.elements)
+        snapshot.bounds = list(visualizer.bounds) if visualizer.bounds else None
+        snapshot.visible_layers = set(visualizer.visible_layers)
+        return snapshot
+
+    def start(self) -> "ProgressivePreview":
+        """Display the coarse preview and start refining in the background.
+
+        Outside Jupyter (IPython not available), the full SVG is generated
+        and printed synchronously instead.
+        """
+        try:
+            from IPython.display import Image, display
+        except ImportError:
+            self._refine()
+            print("SVG content (save to .svg file to view):")
+            print(self.svg)
+            return self
+
+        from .raster import PCBRasterizer
+
+        coarse = PCBRasterizer(
+            self.visualizer, dpi=Defaults.RASTER_DPI, max_size=self.coarse_size
+        ).to_png()
+        self.handle = display(Image(data=coarse, format="png"), display_id=True)
+
+        self._thread = threading.Thread(target=self._refine, daemon=True)
+        self._thread.start()
+        return self
+
+    def _refine(self) -> None:
+        """Generate the full SVG and update the display unless cancelled."""
+        try:
+            if self._cancelled.is_set():
+                return
+            svg = self.visualizer.generate_svg(self.layer_order)
+            if self._cancelled.is_set():
+                return
+            self.svg = svg
+            if self.handle is not None:
+                from IPython.display import SVG
+
+                self.handle.update(SVG(svg))
+        finally:
+            self._done.set()
+
+    def cancel(self) -> None:
+        """Cancel the pending refinement.
+
+        A render that is already running finishes in the background, but its
+        result is discarded and the display is left unchanged.
+        """
+        self._cancelled.set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait for the refinement to finish.
+
+        Args:
+            timeout: Maximum time to wait in seconds (None waits indefinitely)
+
+        Returns:
+            True if the refinement finished (or was cancelled) in time
+
+        """
+        return self._done.wait(timeout)
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether the preview was cancelled."""
+        return self._cancelled.is_set()
+
+    @property
+    def done(self) -> bool:
+        """Whether the refinement has finished."""
+        return self._done.is_set()
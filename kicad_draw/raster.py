@@ -0,0 +1,371 @@
+"""Raster (PNG) rendering for PCB visualizations.
+
+This module renders the contents of a PCBVisualizer into a NumPy RGBA
+buffer and encodes it as PNG using only the standard library's zlib.
+Unlike SVG output, the cost of a raster preview is dominated by the
+number of pixels, which makes it suitable for thumbnails of very large
+designs, CI artifacts and report pages.
+"""
+
+import math
+import struct
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .constants import Defaults
+from .visualizer import PCBVisualizer
+
+MM_PER_INCH = 25.4
+
+# Long segments are split into pieces of at most this many pixels so that
+# every piece can be rasterized inside a small square tile.
+MAX_PIECE_LENGTH = 8.0
+
+# Maximum chord error (in pixels) when tessellating arcs, and a cap on the
+# number of segments per arc.
+ARC_TOLERANCE = 0.25
+MAX_ARC_SEGMENTS = 4096
+
+# Tile sizes are rounded up to a multiple of this many pixels.
+TILE_STEP = 4
+
+# Upper bound on the number of pixel samples evaluated per chunk.
+MAX_CHUNK_SAMPLES = 1 << 22
+
+
+def hex_to_rgb(color: str) -> Tuple[float, float, float]:
+    """Convert a "#RRGGBB" color string to RGB floats in [0, 1]."""
+    color = color.lstrip("#")
+    return tuple(int(color[i : i + 2], 16) / 255.0 for i in (0, 2, 4))
+
+
+def encode_png(rgba: np.ndarray, compress_level: int = 6) -> bytes:
+    """Encode an RGBA image as PNG bytes.
+
+    Args:
+        rgba: Image array of shape (height, width, 4) and dtype uint8
+        compress_level: zlib compression level (0-9)
+
+    Returns:
+        PNG file contents
+
+    """
+    if rgba.ndim != 3 or rgba.shape[2] != 4 or rgba.dtype != np.uint8:
+        raise ValueError("Expected a uint8 array of shape (height, width, 4)")
+
+    height, width = rgba.shape[:2]
+
+    def chunk(tag: bytes, data: bytes) -> bytes:
+        return (
+            struct.pack(">I", len(data))
+            + tag
+            + data
+            + struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF)
+        )
+
+    # Every scanline is prefixed with filter type 0 (None)
+    raw = np.zeros((height, width * 4 + 1), dtype=np.uint8)
+    raw[:, 1:] = rgba.reshape(height, width * 4)
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0)
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", header)
+        + chunk(b"IDAT", zlib.compress(raw.tobytes(), compress_level))
+        + chunk(b"IEND", b"")
+    )
+
+
+class PCBRasterizer:
+    """CPU raster renderer for PCBVisualizer contents.
+
+    Traces are drawn as thick segments with round caps and vias as filled
+    disks, using the same layer colors, render order and visibility state
+    as the SVG output.
+    """
+
+    def __init__(
+        self,
+        visualizer: PCBVisualizer,
+        dpi: float = Defaults.RASTER_DPI,
+        antialias: bool = True,
+        max_size: Optional[int] = None,
+    ):
+        """Initialize rasterizer.
+
+        Args:
+            visualizer: PCBVisualizer holding the elements to render
+            dpi: Output resolution in dots per inch
+            antialias: Whether to blend partially covered pixels
+            max_size: Optional limit for the longest image side in pixels;
+                the resolution (and for tiny sizes the margin) is lowered to
+                fit (useful for thumbnails)
+
+        """
+        if max_size is not None and max_size < 1:
+            raise ValueError(f"max_size must be at least 1 pixel, got {max_size}")
+        self.visualizer = visualizer
+        self.dpi = dpi
+        self.antialias = antialias
+        self.max_size = max_size
+
+    def _pixel_transform(self) -> Tuple[float, float, float, int, int]:
+        """Calculate scale, offsets and image size in pixels."""
+        margin = Defaults.RASTER_MARGIN
+        min_x, min_y, max_x, max_y = self.visualizer.bounds
+        content_width = max_x - min_x
+        content_height = max_y - min_y
+
+        scale = self.dpi / MM_PER_INCH
+        if self.max_size is not None:
+            # Keep at least half of a small image for the content
+            margin = min(margin, self.max_size // 4)
+            longest = max(content_width, content_height)
+            if longest > 0:
+                # Shrink slightly so rounding up cannot exceed max_size
+                available = (self.max_size - 2 * margin) * (1 - 1e-9)
+                scale = min(scale, available / longest)
+
+        width = max(1, math.ceil(content_width * scale) + 2 * margin)
+        height = max(1, math.ceil(content_height * scale) + 2 * margin)
+        offset_x = margin - min_x * scale
+        offset_y = margin - min_y * scale
+        return scale, offset_x, offset_y, width, height
+
+    def _collect(self, scale: float) -> Tuple[Dict[str, List[Tuple]], List[Tuple]]:
+        """Group visualizer elements into per-layer segments and vias.
+
+        Arcs are tessellated with a chord error below ARC_TOLERANCE pixels.
+        """
+        layers: Dict[str, List[Tuple]] = {}
+        vias: List[Tuple] = []
+        for element in self.visualizer.elements:
+            if element["type"] == "via":
+                vias.append((element["x"], element["y"], element["size"]))
+            elif element["type"] == "line":
+                layers.setdefault(element["layer"], []).append(
+                    (
+                        element["x1"],
+                        element["y1"],
+                        element["x2"],
+                        element["y2"],
+                        element["width"],
+                    )
+                )
+            elif element["type"] == "arc":
+                layers.setdefault(element["layer"], []).extend(
+                    self._tessellate_arc(element, scale)
+                )
+        return layers, vias
+
+    @staticmethod
+    def _tessellate_arc(element: dict, scale: float) -> List[Tuple]:
+        """Split an arc element into segments fine enough for the resolution."""
+        radius_px = element["radius"] * scale
+        span = element["end_angle"] - element["start_angle"]
+        if radius_px > ARC_TOLERANCE:
+            step = 2 * math.acos(1 - ARC_TOLERANCE / radius_px)
+            segments = min(MAX_ARC_SEGMENTS, max(1, math.ceil(abs(span) / step)))
+        else:
+            segments = 1
+        angles = np.linspace(element["start_angle"], element["end_angle"], segments + 1)
+        x = element["cx"] + element["radius"] * np.cos(angles)
+        y = element["cy"] + element["radius"] * np.sin(angles)
+        width = np.full(segments, element["width"])
+        return list(zip(x[:-1], y[:-1], x[1:], y[1:], width))
+
+    def _coverage(
+        self, segments: np.ndarray, scale: float, offset: Tuple[float, float], shape
+    ) -> np.ndarray:
+        """Rasterize thick segments into a coverage buffer.
+
+        Args:
+            segments: Array of shape (n, 5) with x1, y1, x2, y2, width in mm
+            scale: Pixels per mm
+            offset: Pixel offset (x, y) applied after scaling
+            shape: Output buffer shape (height, width)
+
+        Returns:
+            Float32 coverage buffer with values in [0, 1]
+
+        """
+        height, width = shape
+        coverage = np.zeros(height * width, dtype=np.float32)
+        if len(segments) == 0:
+            return coverage.reshape(shape)
+
+        ax = segments[:, 0] * scale + offset[0]
+        ay = segments[:, 1] * scale + offset[1]
+        bx = segments[:, 2] * scale + offset[0]
+        by = segments[:, 3] * scale + offset[1]
+        # Keep hairlines visible at low resolution
+        radius = np.maximum(segments[:, 4] * scale / 2, 0.5)
+
+        # Split long segments into short pieces; the union of the round-capped
+        # pieces equals the original round-capped segment.
+        length = np.hypot(bx - ax, by - ay)
+        pieces = np.maximum(1, np.ceil(length / MAX_PIECE_LENGTH)).astype(np.int64)
+        owner = np.repeat(np.arange(len(segments)), pieces)
+        first = np.cumsum(pieces) - pieces
+        index = np.arange(len(owner)) - np.repeat(first, pieces)
+        t0 = index / pieces[owner]
+        t1 = (index + 1) / pieces[owner]
+        dx = bx[owner] - ax[owner]
+        dy = by[owner] - ay[owner]
+        px1 = ax[owner] + dx * t0
+        py1 = ay[owner] + dy * t0
+        px2 = ax[owner] + dx * t1
+        py2 = ay[owner] + dy * t1
+        radius = radius[owner]
+
+        # Bucket pieces by tile size (multiples of TILE_STEP) to bound wasted samples
+        extent = np.maximum(np.abs(px2 - px1), np.abs(py2 - py1)) + 2 * radius + 3
+        tile = (np.ceil(extent / TILE_STEP) * TILE_STEP).astype(np.int64)
+
+        for size in np.unique(tile):
+            selected = np.nonzero(tile == size)[0]
+            chunk_size = max(1, MAX_CHUNK_SAMPLES // (size * size))
+            grid = np.arange(size, dtype=np.float32) + 0.5
+            for start in range(0, len(selected), chunk_size):
+                sel = selected[start : start + chunk_size]
+                self._splat(
+                    coverage,
+                    px1[sel],
+                    py1[sel],
+                    px2[sel],
+                    py2[sel],
+                    radius[sel],
+                    grid,
+                    shape,
+                )
+
+        return coverage.reshape(shape)
+
+    def _splat(
+        self,
+        coverage: np.ndarray,
+        x1: np.ndarray,
+        y1: np.ndarray,
+        x2: np.ndarray,
+        y2: np.ndarray,
+        radius: np.ndarray,
+        grid: np.ndarray,
+        shape,
+    ) -> None:
+        """Accumulate coverage of a chunk of equally sized tiles."""
+        height, width = shape
+        origin_x = np.floor(np.minimum(x1, x2) - radius - 1).astype(np.int64)
+        origin_y = np.floor(np.minimum(y1, y2) - radius - 1).astype(np.int64)
+
+        # Pixel center coordinates relative to the segment start: (n, size)
+        rel_x = ((origin_x - x1)[:, None] + grid[None, :]).astype(np.float32)
+        rel_y = ((origin_y - y1)[:, None] + grid[None, :]).astype(np.float32)
+        rel_x = rel_x[:, None, :]
+        rel_y = rel_y[:, :, None]
+
+        dx = (x2 - x1).astype(np.float32)[:, None, None]
+        dy = (y2 - y1).astype(np.float32)[:, None, None]
+        length_sq = dx * dx + dy * dy
+        with np.errstate(invalid="ignore", divide="ignore"):
+            t = np.where(
+                length_sq > 0, (rel_x * dx + rel_y * dy) / length_sq, 0.0
+            ).clip(0.0, 1.0)
+        dist = np.hypot(rel_x - t * dx, rel_y - t * dy)
+
+        r = radius.astype(np.float32)[:, None, None]
+        if self.antialias:
+            value = np.clip(r + 0.5 - dist, 0.0, 1.0)
+        else:
+            value = (dist <= r).astype(np.float32)
+
+        size = len(grid)
+        ix = np.broadcast_to(
+            origin_x[:, None, None] + np.arange(size)[None, None, :], value.shape
+        )
+        iy = np.broadcast_to(
+            origin_y[:, None, None] + np.arange(size)[None, :, None], value.shape
+        )
+        mask = (value > 0) & (ix >= 0) & (ix < width) & (iy >= 0) & (iy < height)
+        np.maximum.at(coverage, iy[mask] * width + ix[mask], value[mask])
+
+    def render(self) -> np.ndarray:
+        """Render visible layers and vias into an RGBA buffer.
+
+        Returns:
+            Array of shape (height, width, 4) and dtype uint8
+
+        """
+        background = np.array(
+            hex_to_rgb(self.visualizer.BACKGROUND_COLOR), dtype=np.float32
+        )
+        if not self.visualizer.bounds:
+            image = np.empty(
+                (Defaults.RASTER_MARGIN * 2, Defaults.RASTER_MARGIN * 2, 3)
+            )
+            image[...] = background
+            return self._to_rgba(image)
+
+        scale, offset_x, offset_y, width, height = self._pixel_transform()
+        shape = (height, width)
+        image = np.empty((height, width, 3), dtype=np.float32)
+        image[...] = background
+
+        layers, vias = self._collect(scale)
+
+        # Render layers (bottom to top) - only visible layers
+        for layer_name in self.visualizer.RENDER_ORDER:
+            if (
+                layer_name not in layers
+                or layer_name not in self.visualizer.visible_layers
+            ):
+                continue
+            color = hex_to_rgb(self.visualizer.LAYER_COLORS.get(layer_name, "#888888"))
+            coverage = self._coverage(
+                np.asarray(layers[layer_name], dtype=np.float64),
+                scale,
+                (offset_x, offset_y),
+                shape,
+            )
+            self._blend(image, coverage, color)
+
+        # Render vias on top (if enabled) as zero-length segments
+        if vias and self.visualizer.show_vias:
+            via_array = np.asarray(vias, dtype=np.float64)
+            segments = np.column_stack(
+                [via_array[:, 0], via_array[:, 1], via_array[:, 0], via_array[:, 1]]
+                + [via_array[:, 2]]
+            )
+            coverage = self._coverage(segments, scale, (offset_x, offset_y), shape)
+            self._blend(image, coverage, hex_to_rgb(self.visualizer.VIA_COLOR))
+
+        return self._to_rgba(image)
+
+    @staticmethod
+    def _blend(image: np.ndarray, coverage: np.ndarray, color) -> None:
+        """Blend a solid color into the image where coverage is non-zero."""
+        covered = np.nonzero(coverage.ravel())[0]
+        pixels = image.reshape(-1, 3)
+        alpha = coverage.ravel()[covered][:, None]
+        pixels[covered] = pixels[covered] * (1 - alpha) + (
+            np.asarray(color, dtype=np.float32) * alpha
+        )
+
+    @staticmethod
+    def _to_rgba(image: np.ndarray) -> np.ndarray:
+        """Convert a float RGB image to opaque uint8 RGBA."""
+        rgba = np.empty(image.shape[:2] + (4,), dtype=np.uint8)
+        rgba[..., :3] = np.clip(np.rint(image * 255), 0, 255).astype(np.uint8)
+        rgba[..., 3] = 255
+        return rgba
+
+    def to_png(self) -> bytes:
+        """Render and encode as PNG bytes."""
+        return encode_png(self.render())
+
+    def save_png(self, filename: str) -> None:
+        """Render and save PNG to file."""
+        with open(filename, "wb") as f:
+            f.write(self.to_png())
+        print(f"PNG saved to {filename}")
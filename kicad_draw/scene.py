@@ -0,0 +1,461 @@
+"""Compact scene export and self-contained HTML viewer.
+
+This module converts the contents of a PCBVisualizer into a compact scene
+description: per-layer typed arrays of polyline coordinates, arcs and vias,
+optionally quantized to a fixed grid and delta-encoded. Arrays are stored as
+base64 strings inside JSON (optionally deflate-compressed), so the scene can
+be embedded in a single HTML file whose canvas viewer pans, zooms and toggles
+layers without any external resources.
+"""
+
+import base64
+import json
+import zlib
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .constants import Defaults
+from .visualizer import PCBVisualizer
+
+SCENE_FORMAT = "kicad-draw-scene"
+SCENE_VERSION = 1
+
+
+def encode_array(array: np.ndarray, compress: bool = False) -> Dict[str, str]:
+    """Encode a 1-D array as a base64 typed-array entry.
+
+    Args:
+        array: Array to encode (stored little-endian)
+        compress: Whether to deflate-compress the bytes
+
+    Returns:
+        Dictionary with dtype, encoding and base64 data
+
+    """
+    array = np.ascontiguousarray(array)
+    data = array.astype(array.dtype.newbyteorder("<"), copy=False).tobytes()
+    if compress:
+        data = zlib.compress(data, 9)
+    return {
+        "dtype": array.dtype.name,
+        "encoding": "deflate" if compress else "raw",
+        "data": base64.b64encode(data).decode("ascii"),
+    }
+
+
+def decode_array(entry: Dict[str, str]) -> np.ndarray:
+    """Decode a typed-array entry produced by :func:`encode_array`."""
+    data = base64.b64decode(entry["data"])
+    if entry["encoding"] == "deflate":
+        data = zlib.decompress(data)
+    return np.frombuffer(data, dtype=np.dtype(entry["dtype"]).newbyteorder("<"))
+
+
+def _polylines(segments: np.ndarray):
+    """Merge consecutive connected segments of equal width into polylines.
+
+    Args:
+        segments: Array of shape (n, 5) with x1, y1, x2, y2, width
+
+    Returns:
+        Tuple of (points (m, 2), points per polyline, width per polyline)
+
+    """
+    x1, y1, x2, y2, width = segments.T
+    starts = np.ones(len(segments), dtype=bool)
+    starts[1:] = (x1[1:] != x2[:-1]) | (y1[1:] != y2[:-1]) | (width[1:] != width[:-1])
+
+    # Each polyline contributes its start point plus every segment end point
+    end_index = np.arange(len(segments)) + np.cumsum(starts)
+    points = np.empty((len(segments) + int(starts.sum()), 2))
+    points[end_index] = np.column_stack([x2, y2])
+    points[end_index[starts] - 1] = np.column_stack([x1[starts], y1[starts]])
+
+    run_starts = np.nonzero(starts)[0]
+    run_lengths = np.diff(np.append(run_starts, len(segments))) + 1
+    return points, run_lengths, width[run_starts]
+
+
+def _encode_points(
+    points: np.ndarray,
+    origin: np.ndarray,
+    quantum: Optional[float],
+    compress: bool,
+) -> Dict[str, str]:
+    """Encode points relative to origin, quantized and delta-encoded if requested."""
+    relative = points - origin
+    if quantum is None:
+        return encode_array(relative.astype(np.float32).ravel(), compress)
+
+    grid = np.rint(relative / quantum).astype(np.int64)
+    delta = np.diff(grid, axis=0, prepend=np.zeros((1, 2), dtype=np.int64))
+    if np.abs(delta).max(initial=0) > np.iinfo(np.int32).max:
+        raise ValueError(f"Quantum {quantum} is too fine for the design extent")
+    return encode_array(delta.astype(np.int32).ravel(), compress)
+
+
+def decode_points(
+    entry: Dict[str, str], scene: Dict, origin: Optional[List[float]] = None
+) -> np.ndarray:
+    """Decode an encoded point array of a scene back to absolute coordinates.
+
+    Args:
+        entry: Encoded point array
+        scene: Scene dictionary the entry belongs to
+        origin: Coordinate origin (defaults to the scene origin)
+
+    Returns:
+        Array of shape (n, 2) in mm
+
+    """
+    origin = np.asarray(scene["origin"] if origin is None else origin)
+    values = decode_array(entry).reshape(-1, 2)
+    if scene["quantum"] is None:
+        return values.astype(np.float64) + origin
+    return np.cumsum(values, axis=0, dtype=np.int64) * scene["quantum"] + origin
+
+
+def build_scene(
+    visualizer: PCBVisualizer,
+    quantum: Optional[float] = Defaults.SCENE_QUANTUM,
+    compress: bool = False,
+    layer_order: Optional[List[str]] = None,
+) -> Dict:
+    """Build a compact scene description from a visualizer.
+
+    Line elements are merged into polylines per layer and width. With a
+    quantum, coordinates are snapped to that grid (in mm) and stored as
+    int32 deltas; without one, they are stored as float32 offsets from the
+    scene origin.
+
+    Args:
+        visualizer: PCBVisualizer holding the elements to export
+        quantum: Grid size in mm for quantization, or None for float32 storage
+        compress: Whether to deflate-compress the typed arrays
+        layer_order: Optional stackup layer order used for the layer list
+
+    Returns:
+        JSON-serializable scene dictionary
+
+    """
+    lines: Dict[str, List] = {}
+    arcs: Dict[str, List] = {}
+    vias: List = []
+    for element in visualizer.elements:
+        if element["type"] == "line":
+            lines.setdefault(element["layer"], []).append(
+                (
+                    element["x1"],
+                    element["y1"],
+                    element["x2"],
+                    element["y2"],
+                    element["width"],
+                )
+            )
+        elif element["type"] == "arc":
+            arcs.setdefault(element["layer"], []).append(
+                (
+                    element["cx"],
+                    element["cy"],
+                    element["radius"],
+                    element["start_angle"],
+                    element["end_angle"],
+                    element["width"],
+                )
+            )
+        elif element["type"] == "via":
+            vias.append((element["x"], element["y"], element["size"]))
+
+    bounds = list(visualizer.bounds) if visualizer.bounds else [0.0, 0.0, 0.0, 0.0]
+    origin = np.array(bounds[:2])
+
+    used_layers = set(lines) | set(arcs)
+    order = layer_order if layer_order is not None else visualizer.RENDER_ORDER[::-1]
+    names = [layer for layer in order if layer in used_layers]
+    names += sorted(used_layers - set(names))
+
+    layers = []
+    for name in names:
+        layer = {
+            "name": name,
+            "color": visualizer.LAYER_COLORS.get(name, "#888888"),
+            "visible": name in visualizer.visible_layers,
+            "polyline_count": 0,
+            "arc_count": 0,
+        }
+        if name in lines:
+            points, lengths, widths = _polylines(np.asarray(lines[name]))
+            layer["polyline_count"] = len(lengths)
+            layer["points"] = _encode_points(points, origin, quantum, compress)
+            layer["lengths"] = encode_array(lengths.astype(np.uint32), compress)
+            layer["widths"] = encode_array(widths.astype(np.float32), compress)
+        if name in arcs:
+            arc_array = np.asarray(arcs[name])
+            arc_array[:, :2] -= origin
+            layer["arc_count"] = len(arc_array)
+            layer["arcs"] = encode_array(arc_array.astype(np.float32).ravel(), compress)
+        layers.append(layer)
+
+    scene = {
+        "format": SCENE_FORMAT,
+        "version": SCENE_VERSION,
+        "units": "mm",
+        "quantum": quantum,
+        "origin": origin.tolist(),
+        "bounds": bounds,
+        "background": visualizer.BACKGROUND_COLOR,
+        "render_order": visualizer.RENDER_ORDER,
+        "layers": layers,
+        "vias": {
+            "count": len(vias),
+            "visible": visualizer.show_vias,
+            "color": visualizer.VIA_COLOR,
+        },
+    }
+    if vias:
+        via_array = np.asarray(vias)
+        scene["vias"]["points"] = _encode_points(
+            via_array[:, :2], origin, quantum, compress
+        )
+        scene["vias"]["sizes"] = encode_array(
+            via_array[:, 2].astype(np.float32), compress
+        )
+    return scene
+
+
+def scene_to_json(scene: Dict) -> str:
+    """Serialize a scene to compact JSON."""
+    return json.dumps(scene, separators=(",", ":"))
+
+
+def scene_to_html(scene: Dict, title: str = "KiCad-draw viewer") -> str:
+    """Build a self-contained HTML page that renders a scene on a canvas.
+
+    Args:
+        scene: Scene dictionary from :func:`build_scene`
+        title: Page title
+
+    Returns:
+        HTML document as a string
+
+    """
+    payload = scene_to_json(scene).replace("</", "<\\/")
+    return (
+        HTML_TEMPLATE.replace("__TITLE__", title.replace("<", "&lt;"))
+        .replace("__BACKGROUND__", scene["background"])
+        .replace("__SCENE__", payload)
+    )
+
+
+HTML_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>__TITLE__</title>
+<style>
+  html, body { margin: 0; height: 100%; overflow: hidden; background: __BACKGROUND__; }
+  canvas { display: block; width: 100vw; height: 100vh; cursor: grab; }
+  canvas.dragging { cursor: grabbing; }
+  #panel { position: fixed; left: 10px; top: 10px; padding: 8px 12px;
+           background: rgba(0,0,0,0.8); border: 1px solid #666; border-radius: 5px;
+           color: white; font: 12px Arial, sans-serif; user-select: none; }
+  #panel b { display: block; font-size: 14px; margin-bottom: 4px; }
+  #panel label { display: block; line-height: 20px; }
+  .swatch { display: inline-block; width: 16px; height: 12px; margin: 0 6px; vertical-align: middle; }
+  #status { margin-top: 4px; color: #999; }
+</style>
+</head>
+<body>
+<canvas id="view"></canvas>
+<div id="panel"><b>Layers</b><div id="layers"></div>
+<div id="status">Drag to pan, wheel to zoom, double-click to fit</div></div>
+<script id="scene" type="application/json">__SCENE__</script>
+<script>
+(async function () {
+  "use strict";
+  const scene = JSON.parse(document.getElementById("scene").textContent);
+  const TYPES = { int32: Int32Array, uint32: Uint32Array, float32: Float32Array };
+
+  async function decode(entry) {
+    let bytes = Uint8Array.from(atob(entry.data), (c) => c.charCodeAt(0));
+    if (entry.encoding === "deflate") {
+      const stream = new Blob([bytes]).stream().pipeThrough(new DecompressionStream("deflate"));
+      bytes = new Uint8Array(await new Response(stream).arrayBuffer());
+    }
+    return new TYPES[entry.dtype](bytes.buffer, bytes.byteOffset, bytes.byteLength / 4);
+  }
+
+  async function points(entry) {
+    const values = await decode(entry);
+    const out = new Float64Array(values.length);
+    if (scene.quantum === null) {
+      out.set(values);
+      return out;
+    }
+    let x = 0, y = 0;
+    for (let i = 0; i < values.length; i += 2) {
+      x += values[i]; y += values[i + 1];
+      out[i] = x * scene.quantum; out[i + 1] = y * scene.quantum;
+    }
+    return out;
+  }
+
+  // Build one Path2D per (layer, width) so each frame costs few stroke calls
+  const layers = [];
+  for (const layer of scene.layers) {
+    const paths = new Map();
+    const pathFor = (w) => { if (!paths.has(w)) paths.set(w, new Path2D()); return paths.get(w); };
+    if (layer.polyline_count) {
+      const pts = await points(layer.points);
+      const lengths = await decode(layer.lengths);
+      const widths = await decode(layer.widths);
+      let p = 0;
+      for (let i = 0; i < lengths.length; i++) {
+        const path = pathFor(widths[i]);
+        path.moveTo(pts[p], pts[p + 1]);
+        for (let k = 1; k < lengths[i]; k++) path.lineTo(pts[p + 2 * k], pts[p + 2 * k + 1]);
+        p += 2 * lengths[i];
+      }
+    }
+    if (layer.arc_count) {
+      const a = await decode(layer.arcs);
+      for (let i = 0; i < a.length; i += 6) {
+        const path = pathFor(a[i + 5]);
+        path.moveTo(a[i] + a[i + 2] * Math.cos(a[i + 3]), a[i + 1] + a[i + 2] * Math.sin(a[i + 3]));
+        path.arc(a[i], a[i + 1], a[i + 2], a[i + 3], a[i + 4], a[i + 4] < a[i + 3]);
+      }
+    }
+    layers.push({ name: layer.name, color: layer.color, visible: layer.visible, paths });
+  }
+
+  const vias = { visible: scene.vias.visible, color: scene.vias.color, path: new Path2D() };
+  if (scene.vias.count) {
+    const pts = await points(scene.vias.points);
+    const sizes = await decode(scene.vias.sizes);
+    for (let i = 0; i < sizes.length; i++) {
+      const r = sizes[i] / 2;
+      vias.path.moveTo(pts[2 * i] + r, pts[2 * i + 1]);
+      vias.path.arc(pts[2 * i], pts[2 * i + 1], r, 0, 2 * Math.PI);
+    }
+  }
+
+  // Layer toggles
+  const panel = document.getElementById("layers");
+  function addToggle(label, color, target) {
+    const row = document.createElement("label");
+    const box = document.createElement("input");
+    box.type = "checkbox";
+    box.checked = target.visible;
+    box.addEventListener("change", () => { target.visible = box.checked; render(); });
+    const swatch = document.createElement("span");
+    swatch.className = "swatch";
+    swatch.style.background = color;
+    row.append(box, swatch, label);
+    panel.append(row);
+  }
+  for (const layer of layers) addToggle(layer.name, layer.color, layer);
+  if (scene.vias.count) addToggle("Vias", vias.color, vias);
+
+  // View state: screen = world * scale + offset (CSS pixels)
+  const canvas = document.getElementById("view");
+  const ctx = canvas.getContext("2d");
+  const cache = document.createElement("canvas");
+  const view = { scale: 1, x: 0, y: 0 };
+  let cached = null;
+  let idleTimer = null;
+
+  function fit() {
+    const w = canvas.clientWidth, h = canvas.clientHeight, margin = 50;
+    const width = Math.max(scene.bounds[2] - scene.bounds[0], 1e-9);
+    const height = Math.max(scene.bounds[3] - scene.bounds[1], 1e-9);
+    view.scale = Math.min((w - 2 * margin) / width, (h - 2 * margin) / height);
+    view.x = (w - width * view.scale) / 2;
+    view.y = (h - height * view.scale) / 2;
+  }
+
+  function resize() {
+    const dpr = window.devicePixelRatio || 1;
+    canvas.width = cache.width = Math.round(canvas.clientWidth * dpr);
+    canvas.height = cache.height = Math.round(canvas.clientHeight * dpr);
+    render();
+  }
+
+  // Full-quality render, snapshotted so interaction can reuse it
+  function render() {
+    const dpr = window.devicePixelRatio || 1;
+    ctx.setTransform(1, 0, 0, 1, 0, 0);
+    ctx.fillStyle = scene.background;
+    ctx.fillRect(0, 0, canvas.width, canvas.height);
+    ctx.setTransform(dpr * view.scale, 0, 0, dpr * view.scale, dpr * view.x, dpr * view.y);
+    ctx.lineCap = ctx.lineJoin = "round";
+    const order = scene.render_order;
+    const sorted = layers.slice().sort((a, b) => {
+      const ia = order.indexOf(a.name), ib = order.indexOf(b.name);
+      return (ia < 0 ? -1 : ia) - (ib < 0 ? -1 : ib);
+    });
+    for (const layer of sorted) {
+      if (!layer.visible) continue;
+      ctx.strokeStyle = layer.color;
+      for (const [w, path] of layer.paths) {
+        ctx.lineWidth = Math.max(w, 1 / view.scale);
+        ctx.stroke(path);
+      }
+    }
+    if (vias.visible && scene.vias.count) {
+      ctx.fillStyle = vias.color;
+      ctx.fill(vias.path);
+    }
+    cache.getContext("2d").drawImage(canvas, 0, 0);
+    cached = { scale: view.scale, x: view.x, y: view.y };
+  }
+
+  // During interaction, transform the cached bitmap; re-render when idle
+  let frame = null;
+  function interact() {
+    if (frame === null) frame = requestAnimationFrame(() => {
+      frame = null;
+      const dpr = window.devicePixelRatio || 1;
+      const k = view.scale / cached.scale;
+      ctx.setTransform(1, 0, 0, 1, 0, 0);
+      ctx.fillStyle = scene.background;
+      ctx.fillRect(0, 0, canvas.width, canvas.height);
+      ctx.setTransform(k, 0, 0, k, dpr * (view.x - cached.x * k), dpr * (view.y - cached.y * k));
+      ctx.drawImage(cache, 0, 0);
+    });
+    clearTimeout(idleTimer);
+    idleTimer = setTimeout(render, 150);
+  }
+
+  let drag = null;
+  canvas.addEventListener("pointerdown", (e) => {
+    drag = { x: e.clientX, y: e.clientY };
+    canvas.setPointerCapture(e.pointerId);
+    canvas.classList.add("dragging");
+  });
+  canvas.addEventListener("pointermove", (e) => {
+    if (!drag) return;
+    view.x += e.clientX - drag.x;
+    view.y += e.clientY - drag.y;
+    drag = { x: e.clientX, y: e.clientY };
+    interact();
+  });
+  canvas.addEventListener("pointerup", () => { drag = null; canvas.classList.remove("dragging"); });
+  canvas.addEventListener("wheel", (e) => {
+    e.preventDefault();
+    const k = Math.exp(-e.deltaY * 0.0015);
+    view.x = e.offsetX - (e.offsetX - view.x) * k;
+    view.y = e.offsetY - (e.offsetY - view.y) * k;
+    view.scale *= k;
+    interact();
+  }, { passive: false });
+  canvas.addEventListener("dblclick", () => { fit(); render(); });
+  window.addEventListener("resize", resize);
+
+  fit();
+  resize();
+})();
+</script>
+</body>
+</html>
+"""
@@ -0,0 +1,284 @@
+"""Warm worker process generating coils on request over a local socket.
+
+``kicad-draw serve`` keeps one process with NumPy, Pydantic and the drawing
+code loaded, and answers requests on a Unix socket or a TCP port. Every
+request and every response is one JSON object on one line; a connection may
+send any number of requests::
+
+    {"id": 1, "type": "helix", "params": {"x0": 150.0, ...}, "output": "svg"}
+    {"id": 1, "ok": true, "svg": "<svg ...>"}
+
+Request fields:
+
+- ``params``: coil parameter fields (required)
+- ``type``: ``helix`` or ``helix_rectangle``, inferred from the fields if
+  omitted
+- ``stackup``: stackup name (default: the server's)
+- ``output``: one or a list of ``sexpr`` (the coil's s-expressions), ``svg``
+  (SVG preview) and ``board`` (the coil merged into ``template``); default
+  ``sexpr``
+- ``template``: KiCad PCB template path on the server, for ``board``
+- ``id``: any value, echoed in the response
+
+Failed requests get ``{"ok": false, "error": "..."}``. A request
+``{"op": "stats"}`` returns cache statistics.
+
+Drawn coils are kept in a :class:`~kicad_draw.cache.MemoryCoilCache` and
+templates are read once (and again when they change on disk). At most
+``workers`` requests are generated at the same time; further requests wait
+for a free slot.
+"""
+
+import json
+import os
+import socket
+import socketserver
+import threading
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from kicad_draw.cache import MemoryCoilCache
+from kicad_draw.config import default_layers
+from kicad_draw.constants import Defaults
+from kicad_draw.PCBmodule import PCBdraw
+from kicad_draw.spec import parse_coil
+
+OUTPUTS = ("sexpr", "svg", "board")
+# Longest accepted request line
+MAX_REQUEST_BYTES = 1024 * 1024
+
+Address = Union[str, Tuple[str, int]]
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    """Answers the JSON line requests of one connection."""
+
+    def handle(self) -> None:
+        while True:
+            line = self.rfile.readline(MAX_REQUEST_BYTES + 1)
+            if not line:
+                return
+            if len(line) > MAX_REQUEST_BYTES:
+                self._reply({"ok": False, "error": "Request too long"})
+                return
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+            except ValueError as e:
+                self._reply({"ok": False, "error": f"Invalid JSON: {e}"})
+                continue
+            self._reply(self.server.coil_server.handle(request))
+
+    def _reply(self, response: Dict[str, Any]) -> None:
+        self.wfile.write(json.dumps(response).encode() + b"\n")
+        self.wfile.flush()
+
+
+class _TCPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+if hasattr(socketserver, "ThreadingUnixStreamServer"):
+
+    class _UnixServer(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+
+else:  # pragma: no cover - Windows
+    _UnixServer = None
+
+
+class CoilServer:
+    """Generates coils for JSON line requests on a socket."""
+
+    def __init__(
+        self,
+        address: Address,
+        stackup: str = "default_4layer",
+        workers: int = 4,
+        cache_entries: int = Defaults.MEMORY_CACHE_ENTRIES,
+    ):
+        """Bind the server socket.
+
+        Args:
+            address: Socket path, or (host, port) for TCP (port 0 picks a
+                free port)
+            stackup: Stackup of requests that do not name one
+            workers: Number of requests generated at the same time
+            cache_entries: Number of drawn coils kept in memory
+
+        """
+        if stackup not in default_layers:
+            raise ValueError(f"Unknown stackup: {stackup}")
+        if workers < 1:
+            raise ValueError(f"workers must be positive, got {workers}")
+        self.stackup = stackup
+        self.workers = workers
+        self.cache = MemoryCoilCache(cache_entries)
+        self.requests = 0
+        self._slots = threading.BoundedSemaphore(workers)
+        self._templates: Dict[str, Tuple[float, str]] = {}
+        self._lock = threading.Lock()
+        if isinstance(address, str):
+            if _UnixServer is None:
+                raise ValueError("Unix sockets are not supported on this platform")
+            if os.path.exists(address):
+                os.remove(address)  # Stale socket of a previous server
+            self._server = _UnixServer(address, _Handler)
+        else:
+            self._server = _TCPServer(address, _Handler)
+        self._server.coil_server = self
+
+    @property
+    def address(self) -> Address:
+        """Bound socket path, or (host, port)."""
+        return self._server.server_address
+
+    def serve_forever(self) -> None:
+        """Answer requests until :meth:`shutdown` is called."""
+        self._server.serve_forever()
+
+    def shutdown(self) -> None:
+        """Stop serving (from another thread) and close the socket."""
+        self._server.shutdown()
+        self.close()
+
+    def close(self) -> None:
+        """Close the socket, removing a Unix socket file."""
+        self._server.server_close()
+        if isinstance(self.address, str) and os.path.exists(self.address):
+            os.remove(self.address)
+
+    def __enter__(self) -> "CoilServer":
+        """Use the server as a context manager, closing it on exit."""
+        return self
+
+    def __exit__(self, *exc) -> None:
+        """Close the server."""
+        self.close()
+
+    def stats(self) -> Dict[str, int]:
+        """Request count and cache statistics."""
+        return {
+            "requests": self.requests,
+            "cached_coils": len(self.cache),
+            "templates": len(self._templates),
+            **self.cache.stats(),
+        }
+
+    def handle(self, request: Any) -> Dict[str, Any]:
+        """Answer one decoded request.
+
+        Args:
+            request: JSON object of the request
+
+        Returns:
+            JSON object of the response
+
+        """
+        if not isinstance(request, dict):
+            return {"ok": False, "error": "Request must be a JSON object"}
+        response: Dict[str, Any] = {}
+        if "id" in request:
+            response["id"] = request["id"]
+        with self._lock:
+            self.requests += 1
+        try:
+            if request.get("op", "generate") == "stats":
+                response.update(self.stats())
+            elif request.get("op", "generate") == "generate":
+                with self._slots:
+                    response.update(self._generate(request))
+            else:
+                raise ValueError(f"Unknown op: {request['op']}")
+        except (OSError, TypeError, ValueError) as e:
+            response.update(ok=False, error=str(e))
+            return response
+        response["ok"] = True
+        return response
+
+    def _generate(self, request: Dict[str, Any]) -> Dict[str, str]:
+        """Draw the coil of a request and build the requested outputs."""
+        outputs = request.get("output", "sexpr")
+        outputs = [outputs] if isinstance(outputs, str) else list(outputs)
+        unknown = set(outputs) - set(OUTPUTS)
+        if unknown:
+            raise ValueError(f"Unknown outputs {sorted(unknown)} (expected {OUTPUTS})")
+        stackup = request.get("stackup") or self.stackup
+        if stackup not in default_layers:
+            raise ValueError(f"Unknown stackup: {stackup}")
+        params = request.get("params")
+        if not isinstance(params, dict):
+            raise ValueError("'params' must be an object of coil parameters")
+        entry = dict(params)
+        if "type" in request:
+            entry["type"] = request["type"]
+        coil = parse_coil(entry, "params")
+
+        pcb = PCBdraw(
+            stackup,
+            mode="file",
+            enable_visualization="svg" in outputs,
+            cache=self.cache,
+        )
+        pcb.draw(coil)
+        result = {}
+        if "sexpr" in outputs:
+            result["sexpr"] = pcb.export()
+        if "svg" in outputs:
+            result["svg"] = pcb.get_svg()
+        if "board" in outputs:
+            template = request.get("template")
+            if not template:
+                raise ValueError("'board' output needs a 'template' path")
+            board = pcb._merge_template(self._template(template))
+            if board is None:
+                raise ValueError(f"Invalid template file format: {template}")
+            result["board"] = board
+        return result
+
+    def _template(self, path: str) -> str:
+        """Template content, read again only when the file changed."""
+        mtime = os.path.getmtime(path)
+        with self._lock:
+            cached = self._templates.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        with open(path, "r") as f:
+            content = f.read()
+        with self._lock:
+            self._templates[path] = (mtime, content)
+        return content
+
+
+def request(
+    address: Address,
+    requests: Union[Dict[str, Any], List[Dict[str, Any]]],
+    timeout: Optional[float] = 60.0,
+) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
+    """Send requests to a server over one connection.
+
+    Args:
+        address: Socket path, or (host, port)
+        requests: One request, or a list of them
+        timeout: Socket timeout in seconds
+
+    Returns:
+        The response, or the list of responses in request order
+
+    """
+    many = isinstance(requests, list)
+    family = socket.AF_UNIX if isinstance(address, str) else socket.AF_INET
+    with socket.socket(family, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(address)
+        with sock.makefile("rwb") as stream:
+            responses = []
+            for item in requests if many else [requests]:
+                stream.write(json.dumps(item).encode() + b"\n")
+                stream.flush()
+                line = stream.readline()
+                if not line:
+                    raise ConnectionError("Server closed the connection")
+                responses.append(json.loads(line))
+    return responses if many else responses[0]
@@ -0,0 +1,179 @@
+"""Sharded drawing for concurrent producers.
+
+A :class:`~kicad_draw.PCBmodule.PCBdraw` is not thread-safe: drawing appends
+to its element buffers and visualizer without synchronization. A
+:class:`ShardedBuilder` lets several threads draw parts of one board anyway.
+Every shard is a private file-mode PCB with the target's stackup, so producers
+never share mutable state and draw without locks; :meth:`ShardedBuilder.merge`
+then splices the shards into the target in ascending key order. The result
+does not depend on thread scheduling, and nodes stay editable after the
+merge::
+
+    builder = ShardedBuilder(pcb)
+
+    def produce(row):
+        shard = builder.shard(row)
+        for params in coils[row]:
+            shard.draw(params)
+
+    with ThreadPoolExecutor() as executor:
+        list(executor.map(produce, range(len(coils))))
+    builder.merge()
+
+:meth:`ShardedBuilder.map` does the same for a list of items, giving every
+worker a contiguous range of them, so the merged board equals drawing the
+items one after the other.
+
+Each shard must be used by one thread at a time. Shards share the target's
+formatter and cache (:class:`~kicad_draw.cache.MemoryCoilCache` is
+thread-safe). Default footprint designators ("L1", ...) are numbered per
+shard, so pass ``reference`` to ``place_footprint`` when shards place
+footprints.
+"""
+
+import math
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence
+
+from kicad_draw.PCBmodule import PCBdraw
+
+
+class ShardedBuilder:
+    """Per-producer shards of a PCB, merged deterministically."""
+
+    def __init__(self, pcb: PCBdraw):
+        """Initialize a builder.
+
+        Args:
+            pcb: File-mode PCB the shards are merged into; shards get its
+                stackup, cache and visualization setting
+
+        """
+        if pcb.mode != "file":
+            raise ValueError("Sharded drawing needs a PCB in file mode")
+        self.pcb = pcb
+        self._shards: Dict[Hashable, PCBdraw] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Number of shards not merged yet."""
+        return len(self._shards)
+
+    def shard(self, key: Hashable) -> PCBdraw:
+        """Get the shard of a key, creating it on first use.
+
+        Args:
+            key: Shard key; keys of a builder must be mutually comparable
+                (e.g. all ints), as shards are merged in ascending key order
+
+        Returns:
+            The shard, a PCB in file mode to draw on from one thread at a time
+
+        """
+        shard = self._shards.get(key)
+        if shard is not None:
+            return shard
+        with self._lock:
+            shard = self._shards.get(key)
+            if shard is None:
+                shard = PCBdraw(
+                    self.pcb.layer_manager.stackup,
+                    mode="file",
+                    enable_visualization=self.pcb.visualizer is not None,
+                    cache=self.pcb.cache,
+                )
+                shard.formatter = self.pcb.formatter
+                self._shards[key] = shard
+        return shard
+
+    def map(
+        self,
+        function: Callable[[PCBdraw, Any], Any],
+        items: Sequence[Any],
+        workers: Optional[int] = None,
+    ) -> List[Any]:
+        """Call a drawing function for every item on a pool of threads.
+
+        The items are split into one contiguous range per worker, drawn in
+        order into the worker's shard, so after :meth:`merge` the board is the
+        same as when drawing all items in order on one thread.
+
+        Args:
+            function: Called as ``function(shard, item)``, e.g.
+                ``lambda shard, params: shard.draw(params)``
+            items: Items to draw
+            workers: Number of threads (default: the number of CPUs)
+
+        Returns:
+            The function's return values, in item order
+
+        """
+        if workers is not None and workers < 1:
+            raise ValueError(f"workers must be positive, got {workers}")
+        if not items:
+            return []
+        size = math.ceil(len(items) / (workers or os.cpu_count() or 1))
+        count = math.ceil(len(items) / size)
+        base = len(self._shards)
+
+        def draw(index: int) -> List[Any]:
+            shard = self.shard(base + index)
+            start = index * size
+            return [function(shard, item) for item in items[start : start + size]]
+
+        with ThreadPoolExecutor(count) as executor:
+            ranges = list(executor.map(draw, range(count)))
+        return [result for results in ranges for result in results]
+
+    def merge(self) -> PCBdraw:
+        """Append the shards to the PCB in ascending key order.
+
+        The shards' elements follow whatever the PCB already holds; their
+        nodes, cells, cell references and footprints move to the PCB. The
+        builder is empty afterwards and can be reused.
+
+        Returns:
+            The PCB
+
+        """
+        pcb = self.pcb
+        if pcb.spill is not None:
+            raise ValueError("Cannot merge shards into a PCB that spills to disk")
+        with self._lock:
+            shards = [self._shards[key] for key in sorted(self._shards)]
+            cells = dict(pcb.cells)
+            for shard in shards:
+                for name, cell in shard.cells.items():
+                    if cells.setdefault(name, cell) is not cell:
+                        raise ValueError(f"Cell {name!r} is defined in two shards")
+            with pcb._stage("merge"):
+                for shard in shards:
+                    self._append(shard)
+            pcb.cells = cells
+            self._shards.clear()
+        pcb._check_memory()
+        return pcb
+
+    def _append(self, shard: PCBdraw) -> None:
+        """Move the output of one shard to the end of the PCB."""
+        pcb = self.pcb
+        shard.refresh()
+        offset = len(pcb.elements)
+        pcb.elements.extend(shard.elements)
+        svg_offset = 0
+        if pcb.visualizer is not None:
+            svg_offset = len(pcb.visualizer.elements)
+            if shard.visualizer is not None:
+                pcb.visualizer.add_elements(shard.visualizer.elements)
+        for node in shard.nodes:
+            node._pcb = pcb
+            node._span = (node._span[0] + offset, node._span[1] + offset)
+            node._svg_span = (
+                node._svg_span[0] + svg_offset,
+                node._svg_span[1] + svg_offset,
+            )
+            pcb.nodes.append(node)
+        pcb.references.extend(shard.references)
+        pcb.footprints.extend(shard.footprints)
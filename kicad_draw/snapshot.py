@@ -0,0 +1,215 @@
+"""Binary snapshots of generated geometry.
+
+A snapshot holds the geometry of a whole board as the record arrays of an
+:class:`~kicad_draw.group.ElementGroup` (segments, vias, visualizer arcs and
+drawing order) together with the stackup and its layer names, in an
+uncompressed NPZ file. Every array is stored as a contiguous ``.npy`` member,
+so :func:`read_snapshot` can memory-map them in place: opening a
+million-segment snapshot only reads the headers, and the data is paged in
+when it is used for rendering, design rule checks or diffing::
+
+    pcb.save_snapshot("board.npz")
+    snapshot = read_snapshot("board.npz")
+    wide = snapshot.group.segments["width"] > 0.5
+
+:meth:`PCBdraw.load_snapshot <kicad_draw.PCBmodule.PCBdraw.load_snapshot>`
+restores a PCB from a snapshot. The files are plain NPZ archives that
+:func:`numpy.load` reads too.
+"""
+
+import re
+import struct
+import zipfile
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from kicad_draw.formatter import KiCadFormatter
+from kicad_draw.group import (
+    ARC_DTYPE,
+    SEGMENT_DTYPE,
+    VIA_DTYPE,
+    VISUAL_DTYPE,
+    ElementGroup,
+    GroupBuilder,
+)
+
+SNAPSHOT_VERSION = 1
+
+# Record array members and their dtypes
+ARRAYS = {
+    "segments": SEGMENT_DTYPE,
+    "vias": VIA_DTYPE,
+    "arcs": ARC_DTYPE,
+    "order": np.dtype(np.uint8),
+    "visual": VISUAL_DTYPE,
+}
+
+_SEGMENT = re.compile(
+    r"\(segment \(start (\S+) (\S+)\) \(end (\S+) (\S+)\) \(width (\S+)\) "
+    r'\(layer "([^"]*)"\) \(net (-?\d+)\)'
+)
+_VIA = re.compile(
+    r"\(via \(at (\S+) (\S+)\) \(size (\S+)\) \(drill (\S+)\) "
+    r'\(layers "([^"]*)" "([^"]*)"\) \(net (-?\d+)\)'
+)
+# Local file header of a ZIP member: fixed part, then name and extra field
+_ZIP_HEADER = struct.Struct("<4s22xHH")
+
+
+class Snapshot:
+    """Board geometry with its stackup, as stored in a snapshot file."""
+
+    def __init__(
+        self,
+        stackup: str,
+        layers: Sequence[str],
+        group: ElementGroup,
+        footprints: Optional[List[str]] = None,
+    ):
+        """Initialize a snapshot.
+
+        Args:
+            stackup: Name of the stackup (see :mod:`kicad_draw.config`)
+            layers: Layer names of the stackup, in index order
+            group: Segments, vias and visualizer geometry of the board
+            footprints: Formatted footprint instances placed on the board
+
+        """
+        self.stackup = stackup
+        self.layers = list(layers)
+        self.group = group
+        self.footprints = footprints or []
+
+    def __repr__(self) -> str:
+        """Short description of the snapshot."""
+        return (
+            f"Snapshot({self.stackup!r}, {len(self.group.segments)} segments, "
+            f"{len(self.group.vias)} vias)"
+        )
+
+    def elements(self, formatter: Optional[KiCadFormatter] = None) -> List[str]:
+        """KiCad s-expressions of the board, footprint instances last."""
+        formatter = formatter or KiCadFormatter()
+        return self.group.format(self.layers, formatter) + self.footprints
+
+    def visual_elements(self) -> List[dict]:
+        """Visualizer element dicts of the board."""
+        return self.group.visual_elements(self.layers)
+
+
+def parse_elements(elements: Sequence[str], layers: Sequence[str]) -> ElementGroup:
+    """Read formatted segments and vias back into a group.
+
+    Args:
+        elements: Segment and via s-expressions as written by KiCadFormatter
+        layers: Layer names of the stackup, in index order
+
+    Returns:
+        The elements' geometry, with every element also shown by the
+        visualizer
+
+    """
+    index = {name: i for i, name in enumerate(layers)}
+    builder = GroupBuilder()
+    for element in elements:
+        try:
+            match = _SEGMENT.match(element)
+            if match:
+                *numbers, layer, net = match.groups()
+                builder.add_segment(
+                    *map(float, numbers), index[layer], int(net), visual=True
+                )
+                continue
+            match = _VIA.match(element)
+            if match:
+                *numbers, layer1, layer2, net = match.groups()
+                builder.add_via(
+                    *map(float, numbers), index[layer1], index[layer2], int(net)
+                )
+                continue
+        except KeyError as e:
+            raise ValueError(f"Layer {e} is not in the stackup") from None
+        raise ValueError(f"Cannot store element in a snapshot: {element[:80]}")
+    return builder.build()
+
+
+def write_snapshot(path: str, snapshot: Snapshot) -> None:
+    """Write a snapshot as an uncompressed NPZ file.
+
+    Args:
+        path: Output file path (used as is, no ".npz" is appended)
+        snapshot: Snapshot to write
+
+    """
+    arrays = {name: getattr(snapshot.group, name) for name in ARRAYS}
+    arrays["version"] = np.array(SNAPSHOT_VERSION)
+    arrays["stackup"] = np.array(snapshot.stackup)
+    arrays["layers"] = np.array(snapshot.layers, dtype=str)
+    arrays["footprints"] = np.array(snapshot.footprints, dtype=str)
+    with open(path, "wb") as f:
+        np.savez(f, **arrays)
+
+
+def _map_member(path: str, info: zipfile.ZipInfo) -> Optional[np.ndarray]:
+    """Memory-map a stored ``.npy`` member of a ZIP file, if possible."""
+    if info.compress_type != zipfile.ZIP_STORED:
+        return None
+    with open(path, "rb") as f:
+        f.seek(info.header_offset)
+        signature, name_length, extra_length = _ZIP_HEADER.unpack(
+            f.read(_ZIP_HEADER.size)
+        )
+        if signature != b"PK\x03\x04":
+            return None
+        f.seek(name_length + extra_length, 1)
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran, dtype = np.lib.format.read_array_header_1_0(f)
+        else:
+            shape, fortran, dtype = np.lib.format.read_array_header_2_0(f)
+        offset = f.tell()
+    if dtype.hasobject:
+        return None
+    if not np.prod(shape, dtype=np.int64):
+        return np.zeros(shape, dtype)
+    order = "F" if fortran else "C"
+    return np.memmap(path, dtype, "r", offset, shape, order)
+
+
+def read_snapshot(path: str, mmap: bool = True) -> Snapshot:
+    """Read a snapshot file.
+
+    Args:
+        path: Snapshot file path
+        mmap: Memory-map the geometry arrays (read-only) instead of reading
+            them into memory
+
+    Returns:
+        The snapshot
+
+    """
+    arrays = {}
+    with zipfile.ZipFile(path) as archive:
+        for info in archive.infolist():
+            name = info.filename[: -len(".npy")]
+            array = _map_member(path, info) if mmap and name in ARRAYS else None
+            if array is None:
+                with archive.open(info) as f:
+                    array = np.lib.format.read_array(f)
+            arrays[name] = array
+    version = int(arrays.get("version", -1))
+    if version != SNAPSHOT_VERSION:
+        raise ValueError(
+            f"Unsupported snapshot version {version} (expected {SNAPSHOT_VERSION})"
+        )
+    for name, dtype in ARRAYS.items():
+        if arrays[name].dtype != dtype:
+            raise ValueError(f"Snapshot array {name!r} has dtype {arrays[name].dtype}")
+    group = ElementGroup(**{name: arrays[name] for name in ARRAYS})
+    return Snapshot(
+        str(arrays["stackup"]),
+        arrays["layers"].tolist(),
+        group,
+        arrays["footprints"].tolist(),
+    )
@@ -0,0 +1,168 @@
+"""Board specifications loaded from YAML parameter files.
+
+Two layouts are accepted. A single coil parameter file holds the fields of
+one parameter model plus an optional ``type`` (``helix`` or
+``helix_rectangle``; inferred from the fields when omitted) and the optional
+board keys ``stackup``, ``template`` and ``output``::
+
+    type: helix_rectangle
+    stackup: default_6layer
+    x0: 150.0
+    y0: 100.0
+    width: 30.0
+    ...
+
+A board manifest places many coils on one board. ``defaults`` are merged
+into every coil entry, and relative ``template``/``output`` paths are
+resolved against the manifest's directory::
+
+    stackup: default_6layer
+    template: ../assets/asset.kicad_pcb
+    output: coils.kicad_pcb
+    defaults:
+      track_width: 0.5
+    coils:
+      - type: helix
+        x0: 100.0
+        ...
+"""
+
+import os
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, ValidationError
+
+from kicad_draw.config import default_layers
+from kicad_draw.models import PARAMS_TYPES
+
+BOARD_KEYS = {"stackup", "template", "output"}
+MANIFEST_KEYS = BOARD_KEYS | {"defaults", "coils"}
+
+
+@dataclass
+class BoardSpec:
+    """A board to generate: stackup, template, output and coil placements.
+
+    Attributes:
+        source: Path of the YAML file the spec was loaded from
+        coils: Coil parameter models, in drawing order
+        stackup: The PCB stackup configuration (None to use the caller's default)
+        template: KiCad PCB template path, if given in the file
+        output: Output PCB path, if given in the file
+
+    """
+
+    source: str
+    coils: List[BaseModel] = field(default_factory=list)
+    stackup: Optional[str] = None
+    template: Optional[str] = None
+    output: Optional[str] = None
+
+    @property
+    def name(self) -> str:
+        """Base name of the spec file without extension."""
+        return os.path.splitext(os.path.basename(self.source))[0]
+
+
+def parse_coil(entry: Dict[str, Any], where: str = "coil") -> BaseModel:
+    """Build a coil parameter model from a mapping with an optional type.
+
+    Args:
+        entry: Parameter fields, optionally with a ``type`` key
+        where: Location used in error messages
+
+    Returns:
+        Validated HelixParams or HelixRectangleParams
+
+    Raises:
+        ValueError: If the type is unknown or the parameters are invalid
+
+    """
+    entry = dict(entry)
+    type_name = entry.pop("type", None)
+    if type_name is None:
+        # Infer the type from the fields that only one model has
+        candidates = [
+            name
+            for name, model in PARAMS_TYPES.items()
+            if set(entry) <= set(model.model_fields)
+        ]
+        if len(candidates) != 1:
+            raise ValueError(f"{where}: cannot infer coil type, set 'type'")
+        type_name = candidates[0]
+    if type_name not in PARAMS_TYPES:
+        raise ValueError(
+            f"{where}: unknown coil type '{type_name}' "
+            f"(expected one of {sorted(PARAMS_TYPES)})"
+        )
+    model = PARAMS_TYPES[type_name]
+    unknown = set(entry) - set(model.model_fields)
+    if unknown:
+        raise ValueError(f"{where}: unknown {model.__name__} fields {sorted(unknown)}")
+    try:
+        return model.model_validate(entry)
+    except ValidationError as e:
+        raise ValueError(f"{where}: {e}") from None
+
+
+def parse_board_spec(data: Any, source: str) -> BoardSpec:
+    """Build a BoardSpec from parsed YAML data.
+
+    Args:
+        data: Parsed YAML document
+        source: Path of the YAML file (for relative paths and messages)
+
+    Returns:
+        The board specification
+
+    """
+    if not isinstance(data, dict):
+        raise ValueError(f"{source}: expected a mapping at the top level")
+
+    base_dir = os.path.dirname(os.path.abspath(source))
+
+    def resolve(path: Optional[str]) -> Optional[str]:
+        return None if path is None else os.path.normpath(os.path.join(base_dir, path))
+
+    stackup = data.get("stackup")
+    if stackup is not None and stackup not in default_layers:
+        raise ValueError(f"{source}: unknown stackup '{stackup}'")
+
+    if "coils" in data:
+        unknown = set(data) - MANIFEST_KEYS
+        if unknown:
+            raise ValueError(f"{source}: unknown manifest keys {sorted(unknown)}")
+        defaults = data.get("defaults") or {}
+        coils = [
+            parse_coil({**defaults, **entry}, f"{source}: coils[{i}]")
+            for i, entry in enumerate(data["coils"] or [])
+        ]
+    else:
+        entry = {key: value for key, value in data.items() if key not in BOARD_KEYS}
+        coils = [parse_coil(entry, source)]
+
+    return BoardSpec(
+        source=source,
+        coils=coils,
+        stackup=stackup,
+        template=resolve(data.get("template")),
+        output=resolve(data.get("output")),
+    )
+
+
+def load_board_spec(path: str) -> BoardSpec:
+    """Load a board specification from a YAML file.
+
+    Raises:
+        ValueError: If the file is not valid YAML or not a valid spec
+
+    """
+    import yaml
+
+    with open(path, "r") as f:
+        try:
+            data = yaml.safe_load(f)
+        except yaml.YAMLError as e:
+            raise ValueError(f"{path}: invalid YAML: {e}") from None
+    return parse_board_spec(data, path)
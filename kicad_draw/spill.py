@@ -0,0 +1,195 @@
+"""Disk-backed, append-only store for element geometry.
+
+A :class:`SpillStore` keeps the output geometry of element groups (segments,
+vias and their drawing order) in a directory, one file per column
+(``segments.x1``, ``vias.net``, ...), so memory use no longer grows with the
+number of elements. Groups are buffered in memory and written in chunks of
+about ``chunk_elements`` output elements; reading maps the column files with
+``numpy.memmap`` and yields one chunk at a time, so a board can be exported
+with memory bounded by the chunk size::
+
+    store = pcb.spill_to("/scratch/panel")
+    pcb.draw_array(params, grid=(300, 300), pitch=(25.0, 25.0))
+    pcb.save("panel.kicad_pcb", "template.kicad_pcb")  # Streams the chunks
+
+Only what the KiCad output needs is stored: visualizer arcs are dropped, so
+spilled elements are not part of SVG previews.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import weakref
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from kicad_draw.group import SEGMENT, SEGMENT_DTYPE, VIA, VIA_DTYPE, ElementGroup
+
+DEFAULT_CHUNK_ELEMENTS = 1 << 18
+
+# Column files of each record array; "order" is a plain uint8 column
+COLUMNS = {"segments": SEGMENT_DTYPE, "vias": VIA_DTYPE}
+ORDER_DTYPE = np.dtype(np.uint8)
+INDEX_FILE = "chunks.json"
+
+
+class SpillStore:
+    """Append-only columnar element store in a directory."""
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        chunk_elements: int = DEFAULT_CHUNK_ELEMENTS,
+    ):
+        """Create an empty store, or reopen the store in a directory.
+
+        Args:
+            directory: Directory of the column files; a temporary directory,
+                removed by :meth:`close`, if None
+            chunk_elements: Output elements buffered before a chunk is written
+
+        """
+        if chunk_elements < 1:
+            raise ValueError(f"chunk_elements must be positive, got {chunk_elements}")
+        self.chunk_elements = chunk_elements
+        self._temporary = directory is None
+        if directory is None:
+            directory = tempfile.mkdtemp(prefix="kicad_draw_spill_")
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self._buffer: List[ElementGroup] = []
+        self._buffered = 0
+        # (order, segments, vias) row ranges of every written chunk
+        self._chunks: List[Tuple[int, int, int, int, int, int]] = []
+        index = os.path.join(directory, INDEX_FILE)
+        if os.path.exists(index):
+            with open(index) as f:
+                self._chunks = [tuple(chunk) for chunk in json.load(f)["chunks"]]
+        self._finalizer = weakref.finalize(
+            self, shutil.rmtree, directory, ignore_errors=True
+        )
+        if not self._temporary:
+            self._finalizer.detach()
+
+    def __repr__(self) -> str:
+        """Short description of the store."""
+        return f"SpillStore({self.directory!r}, {len(self)} elements)"
+
+    def __len__(self) -> int:
+        """Number of output elements, written or buffered."""
+        written = self._chunks[-1][1] if self._chunks else 0
+        return written + self._buffered
+
+    def __enter__(self) -> "SpillStore":
+        """Use the store as a context manager, closing it on exit."""
+        return self
+
+    def __exit__(self, *exc) -> None:
+        """Close the store."""
+        self.close()
+
+    @property
+    def buffered_bytes(self) -> int:
+        """Memory held by groups not written yet."""
+        return sum(group.nbytes for group in self._buffer)
+
+    @property
+    def disk_bytes(self) -> int:
+        """Size of the column files."""
+        return sum(
+            os.path.getsize(os.path.join(self.directory, name))
+            for name in os.listdir(self.directory)
+        )
+
+    def append(self, group: ElementGroup) -> None:
+        """Add the output elements of a group.
+
+        Args:
+            group: Elements to store; its visualizer arcs are dropped
+
+        """
+        if not len(group):
+            return
+        self._buffer.append(ElementGroup(group.segments, group.vias, order=group.order))
+        self._buffered += len(group)
+        if self._buffered >= self.chunk_elements:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the buffered groups as chunks of at most ``chunk_elements``."""
+        if not self._buffer:
+            return
+        group = ElementGroup.concatenate(self._buffer)
+        self._buffer, self._buffered = [], 0
+        order = group.order
+        segment_ends = np.cumsum(order == SEGMENT)
+        via_ends = np.cumsum(order == VIA)
+        columns = {
+            f"{kind}.{field}": getattr(group, kind)[field]
+            for kind, dtype in COLUMNS.items()
+            for field in dtype.names
+        }
+        columns["order"] = order
+        for name, values in columns.items():
+            with open(os.path.join(self.directory, name), "ab") as f:
+                np.ascontiguousarray(values).tofile(f)
+
+        base = self._chunks[-1] if self._chunks else (0,) * 6
+        order_start, segment_start, via_start = base[1], base[3], base[5]
+        for start in range(0, len(order), self.chunk_elements):
+            stop = min(start + self.chunk_elements, len(order))
+            segments = (segment_ends[start - 1] if start else 0, segment_ends[stop - 1])
+            vias = (via_ends[start - 1] if start else 0, via_ends[stop - 1])
+            self._chunks.append(
+                (
+                    order_start + start,
+                    order_start + stop,
+                    segment_start + int(segments[0]),
+                    segment_start + int(segments[1]),
+                    via_start + int(vias[0]),
+                    via_start + int(vias[1]),
+                )
+            )
+        with open(os.path.join(self.directory, INDEX_FILE), "w") as f:
+            json.dump({"chunks": self._chunks}, f)
+
+    def _column(self, name: str, dtype: np.dtype, rows: int) -> np.ndarray:
+        """Memory-map a column file."""
+        if rows == 0:
+            return np.zeros(0, dtype)
+        path = os.path.join(self.directory, name)
+        return np.memmap(path, dtype=dtype, mode="r", shape=(rows,))
+
+    def chunks(self) -> Iterator[ElementGroup]:
+        """Yield the stored elements chunk by chunk, in insertion order.
+
+        Pending groups are written first. Each chunk is built from
+        memory-mapped columns, so only one chunk is held in memory at a time.
+        """
+        self.flush()
+        if not self._chunks:
+            return
+        last = self._chunks[-1]
+        order = self._column("order", ORDER_DTYPE, last[1])
+        columns = {}
+        for kind, dtype in COLUMNS.items():
+            rows = last[3] if kind == "segments" else last[5]
+            columns[kind] = {
+                field: self._column(f"{kind}.{field}", dtype[field], rows)
+                for field in dtype.names
+            }
+        for o0, o1, s0, s1, v0, v1 in self._chunks:
+            segments = np.empty(s1 - s0, SEGMENT_DTYPE)
+            for field, column in columns["segments"].items():
+                segments[field] = column[s0:s1]
+            vias = np.empty(v1 - v0, VIA_DTYPE)
+            for field, column in columns["vias"].items():
+                vias[field] = column[v0:v1]
+            yield ElementGroup(segments, vias, order=np.array(order[o0:o1]))
+
+    def close(self) -> None:
+        """Drop buffered groups and remove a temporary directory."""
+        self._buffer, self._buffered = [], 0
+        self._finalizer()
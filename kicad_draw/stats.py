@@ -0,0 +1,208 @@
+"""Opt-in timers and counters for drawing and output.
+
+Instrumentation is off by default: :class:`~kicad_draw.PCBmodule.PCBdraw`
+only checks whether its ``stats`` attribute is set before each stage, so the
+cost when disabled is one attribute test per stage (not per element). It is
+enabled for a block of code with :meth:`PCBdraw.instrument
+<kicad_draw.PCBmodule.PCBdraw.instrument>`::
+
+    with pcb.instrument() as stats:
+        pcb.draw_helix(params)
+        pcb.save("board.kicad_pcb", "template.kicad_pcb")
+    print(stats.to_json())
+
+Stage timers (``geometry``, ``format``, ``visualize``, ``cache``,
+``refresh``, ``export``, ``save``, ``svg``, ...) measure inclusive time, so a
+stage may contain others: ``export`` includes the ``refresh`` of edited
+nodes, which includes their ``geometry`` and ``format``. Call timers measure
+each high-level call (``draw_helix``, ``draw_helix_rectangle``, ``draw``,
+``draw_array``, ...). In print mode, geometry and formatting are interleaved
+element by element and only the call timers apply.
+
+With ``pcb.instrument(memory=True)``, every timer also records the peak
+memory allocated while it ran (above the memory in use when it started),
+measured with :mod:`tracemalloc`; tracing slows Python code down noticeably,
+so timings taken at the same time are pessimistic.
+"""
+
+import functools
+import json
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class TimerStats:
+    """Number of runs and total, shortest and longest time of a timer."""
+
+    __slots__ = ("count", "seconds", "min", "max", "peak_bytes")
+
+    def __init__(self):
+        """Initialize an empty timer."""
+        self.count = 0
+        self.seconds = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+        # Largest traced allocation of a run, if memory was traced
+        self.peak_bytes: Optional[int] = None
+
+    def add(self, seconds: float) -> None:
+        """Record one run."""
+        self.count += 1
+        self.seconds += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+
+    def add_peak(self, peak_bytes: int) -> None:
+        """Record the traced allocation peak of one run."""
+        self.peak_bytes = max(self.peak_bytes or 0, peak_bytes)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict of the timer."""
+        data = {
+            "count": self.count,
+            "seconds": self.seconds,
+            "min": self.min if self.count else 0.0,
+            "max": self.max,
+        }
+        if self.peak_bytes is not None:
+            data["peak_bytes"] = self.peak_bytes
+        return data
+
+
+class _Timer:
+    """Context manager adding its duration to a timer."""
+
+    __slots__ = ("_timer", "_start")
+
+    def __init__(self, timer: TimerStats):
+        self._timer = timer
+
+    def __enter__(self) -> "_Timer":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._timer.add(time.perf_counter() - self._start)
+
+
+class _MemoryTimer(_Timer):
+    """Timer also recording the traced allocation peak of its run.
+
+    tracemalloc has a single peak, so nested timers share a stack of open
+    frames: a timer folds the peak reached so far into its parent's frame
+    before resetting it, and passes its own peak up when it ends.
+    """
+
+    __slots__ = ("_frames",)
+
+    def __init__(self, timer: TimerStats, frames: List[List[int]]):
+        super().__init__(timer)
+        self._frames = frames
+
+    def __enter__(self) -> "_MemoryTimer":
+        if tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            if self._frames:
+                self._frames[-1][1] = max(self._frames[-1][1], peak)
+            tracemalloc.reset_peak()
+            self._frames.append([current, current])
+        else:
+            self._frames.append([])
+        return super().__enter__()
+
+    def __exit__(self, *exc) -> None:
+        super().__exit__(*exc)
+        frame = self._frames.pop()
+        if not frame or not tracemalloc.is_tracing():
+            return
+        start, peak = frame
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        self._timer.add_peak(peak - start)
+        if self._frames and self._frames[-1]:
+            self._frames[-1][1] = max(self._frames[-1][1], peak)
+
+
+class Stats:
+    """Timers per stage and per high-level call, and counters."""
+
+    def __init__(self, memory: bool = False):
+        """Initialize empty statistics.
+
+        Args:
+            memory: Whether timers also record traced allocation peaks (only
+                while tracemalloc is tracing)
+
+        """
+        self.memory = memory
+        self.stages: Dict[str, TimerStats] = {}
+        self.calls: Dict[str, TimerStats] = {}
+        self.counters: Dict[str, int] = {}
+        self._frames: List[List[int]] = []
+
+    def __repr__(self) -> str:
+        """Short description of the statistics."""
+        return (
+            f"Stats({len(self.stages)} stages, {len(self.calls)} calls, "
+            f"{len(self.counters)} counters)"
+        )
+
+    def stage(self, name: str) -> _Timer:
+        """Context manager timing a stage."""
+        timer = self.stages.get(name)
+        if timer is None:
+            timer = self.stages[name] = TimerStats()
+        return self._timer(timer)
+
+    def call(self, name: str) -> _Timer:
+        """Context manager timing a high-level call."""
+        timer = self.calls.get(name)
+        if timer is None:
+            timer = self.calls[name] = TimerStats()
+        return self._timer(timer)
+
+    def _timer(self, timer: TimerStats) -> _Timer:
+        """Context manager adding to a timer."""
+        return _MemoryTimer(timer, self._frames) if self.memory else _Timer(timer)
+
+    def count(self, name: str, n: int = 1) -> None:
+        """Increment a counter."""
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def reset(self) -> None:
+        """Clear all timers and counters."""
+        self.stages.clear()
+        self.calls.clear()
+        self.counters.clear()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict with "stages", "calls" and "counters"."""
+        return {
+            "stages": {name: t.to_dict() for name, t in self.stages.items()},
+            "calls": {name: t.to_dict() for name, t in self.calls.items()},
+            "counters": dict(self.counters),
+        }
+
+    def to_json(self, indent: int = 2) -> str:
+        """JSON text of :meth:`to_dict`."""
+        return json.dumps(self.to_dict(), indent=indent)
+
+
+def timed_call(method: F) -> F:
+    """Time a method of an object with a ``stats`` attribute as a call.
+
+    The method runs unchanged while ``stats`` is None.
+    """
+    name = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        stats = self.stats
+        if stats is None:
+            return method(self, *args, **kwargs)
+        with stats.call(name):
+            return method(self, *args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,177 @@
+"""Parameter sweeps over coil designs.
+
+This module expands parameter grids into lists of coil parameter models and
+generates one output per variant, spreading the work across a process pool.
+Variants are numbered in input order and results are collected in that
+order, so output names and the returned manifest do not depend on the
+number of workers.
+"""
+
+import itertools
+import json
+import os
+from typing import Any, Dict, Iterable, List, Literal, Optional, Sequence, Tuple
+
+from pydantic import BaseModel
+
+from kicad_draw.config import default_layers
+from kicad_draw.models import PARAMS_TYPES, CoilParams, params_type_name
+from kicad_draw.PCBmodule import PCBdraw
+from kicad_draw.pool import map_tasks
+
+OutputFormat = Literal["kicad_pcb", "svg"]
+
+# Template content shared by all tasks of a worker process
+_worker_template: Optional[str] = None
+
+
+def expand_grid(base: CoilParams, grid: Dict[str, Sequence[Any]]) -> List[CoilParams]:
+    """Expand a parameter grid into a list of parameter models.
+
+    Every combination of the grid values is applied on top of the base
+    model. Combinations are ordered like ``itertools.product`` over the grid
+    keys in insertion order (the last key varies fastest).
+
+    Args:
+        base: Parameter model providing the values that are not swept
+        grid: Mapping of field name to the values to sweep
+
+    Returns:
+        List of validated parameter models, one per combination
+
+    """
+    model = type(base)
+    unknown = set(grid) - set(model.model_fields)
+    if unknown:
+        raise ValueError(f"Unknown {model.__name__} fields: {sorted(unknown)}")
+
+    keys = list(grid)
+    base_values = base.model_dump()
+    return [
+        model(**{**base_values, **dict(zip(keys, values))})
+        for values in itertools.product(*(grid[key] for key in keys))
+    ]
+
+
+def _init_worker(template_content: Optional[str]) -> None:
+    """Store the template content in a worker process."""
+    global _worker_template
+    _worker_template = template_content
+
+
+def _generate_variant(task: Tuple) -> Dict[str, Any]:
+    """Generate the outputs of a single variant."""
+    index, name, type_name, params_dict, output_dir, stackup, formats = task
+    # Parameters were validated when the variants were built
+    params = PARAMS_TYPES[type_name].model_construct(**params_dict)
+
+    pcb = PCBdraw(stackup, mode="file", enable_visualization="svg" in formats)
+    pcb.draw(params)
+
+    outputs = {}
+    if "kicad_pcb" in formats:
+        path = os.path.join(output_dir, f"{name}.kicad_pcb")
+        with open(path, "w") as f:
+            f.write(pcb._merge_template(_worker_template))
+        outputs["kicad_pcb"] = path
+    if "svg" in formats:
+        path = os.path.join(output_dir, f"{name}.svg")
+        with open(path, "w") as f:
+            f.write(pcb.get_svg())
+        outputs["svg"] = path
+
+    return {
+        "index": index,
+        "name": name,
+        "type": type_name,
+        "params": params_dict,
+        "element_count": len(pcb.elements),
+        "outputs": outputs,
+    }
+
+
+def run_sweep(
+    variants: Iterable[CoilParams],
+    output_dir: str,
+    stackup: str = "default_4layer",
+    formats: Sequence[OutputFormat] = ("kicad_pcb",),
+    template_path: Optional[str] = None,
+    jobs: Optional[int] = None,
+    chunksize: Optional[int] = None,
+    prefix: str = "variant",
+) -> List[Dict[str, Any]]:
+    """Generate outputs for many coil variants in parallel.
+
+    Each variant is drawn on its own board and written as
+    ``<prefix>_<index>.kicad_pcb`` and/or ``<prefix>_<index>.svg`` in
+    ``output_dir``. A ``manifest.json`` describing all variants is written
+    alongside.
+
+    Args:
+        variants: Parameter models (e.g. from :func:`expand_grid`), or a
+            columnar batch such as :class:`kicad_draw.batch.HelixParamsBatch`
+        output_dir: Directory for the generated files (created if missing)
+        stackup: The PCB stackup configuration
+        formats: Output formats to write per variant
+        template_path: KiCad PCB template, required for "kicad_pcb" output
+        jobs: Number of worker processes (None uses all CPUs, 1 runs inline)
+        chunksize: Variants per task sent to a worker (None picks a size that
+            gives each worker about four chunks)
+        prefix: File name prefix for the variants
+
+    Returns:
+        Manifest entries, ordered like the input variants
+
+    """
+    if stackup not in default_layers:
+        raise ValueError(f"Unknown stackup: {stackup}")
+    unknown_formats = set(formats) - {"kicad_pcb", "svg"}
+    if unknown_formats:
+        raise ValueError(f"Unknown output formats: {sorted(unknown_formats)}")
+
+    template_content = None
+    if "kicad_pcb" in formats:
+        if template_path is None:
+            raise ValueError("template_path is required for kicad_pcb output")
+        with open(template_path, "r") as f:
+            template_content = f.read()
+        if template_content.rstrip().rfind(")") == -1:
+            raise ValueError(f"Invalid template file format: {template_path}")
+
+    os.makedirs(output_dir, exist_ok=True)
+    variants = list(variants)
+    width = max(5, len(str(len(variants) - 1)))
+    tasks = [
+        (
+            index,
+            f"{prefix}_{index:0{width}d}",
+            params_type_name(params),
+            params.model_dump(),
+            output_dir,
+            stackup,
+            tuple(formats),
+        )
+        for index, params in enumerate(variants)
+    ]
+
+    manifest = map_tasks(
+        _generate_variant,
+        tasks,
+        jobs,
+        chunksize,
+        initializer=_init_worker,
+        initargs=(template_content,),
+    )
+
+    with open(os.path.join(output_dir, "manifest.json"), "w") as f:
+        json.dump({"stackup": stackup, "variants": manifest}, f, indent=2)
+
+    return manifest
+
+
+def params_from_manifest(manifest: List[Dict[str, Any]]) -> List[BaseModel]:
+    """Rebuild the parameter models recorded in a sweep manifest."""
+    return [
+        PARAMS_TYPES[entry["type"]].model_validate(entry["params"])
+        for entry in manifest
+    ]
@@ -0,0 +1,183 @@
+"""Affine transforms for element groups, nodes and cell placements.
+
+Transforms are 3x3 matrices acting on column vectors ``(x, y, 1)`` and are
+combined with the ``@`` operator, the rightmost matrix being applied first::
+
+    matrix = translate(10, 0) @ rotate(np.pi / 2)  # Rotate, then move
+
+Geometry is transformed with :meth:`ElementGroup.transformed
+<kicad_draw.group.ElementGroup.transformed>` (one vectorized pass over all
+segments, vias and arcs). Moving a coil to the bottom side also needs its
+layers reversed, see :func:`flip_layers`.
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+from kicad_draw.group import as_affine
+
+
+def identity() -> np.ndarray:
+    """Identity transform."""
+    return np.eye(3)
+
+
+def translate(dx: float, dy: float) -> np.ndarray:
+    """Translation by (dx, dy)."""
+    return np.array([[1.0, 0.0, dx], [0.0, 1.0, dy], [0.0, 0.0, 1.0]])
+
+
+def rotate(angle: float, cx: float = 0.0, cy: float = 0.0) -> np.ndarray:
+    """Counter-clockwise rotation about a center.
+
+    Args:
+        angle: Rotation angle in radians
+        cx: X-coordinate of the center
+        cy: Y-coordinate of the center
+
+    Returns:
+        3x3 affine matrix
+
+    """
+    c, s = np.cos(angle), np.sin(angle)
+    rotation = np.array([[c, -s, 0.0], [s, c, 0.0], [0.0, 0.0, 1.0]])
+    return translate(cx, cy) @ rotation @ translate(-cx, -cy)
+
+
+def scale(
+    sx: float, sy: Optional[float] = None, cx: float = 0.0, cy: float = 0.0
+) -> np.ndarray:
+    """Scaling about a center (uniform if sy is omitted).
+
+    Track widths and via sizes are not scaled; groups with arcs only accept
+    uniform scaling.
+
+    Args:
+        sx: X scale factor
+        sy: Y scale factor (defaults to sx)
+        cx: X-coordinate of the center
+        cy: Y-coordinate of the center
+
+    Returns:
+        3x3 affine matrix
+
+    """
+    sy = sx if sy is None else sy
+    scaling = np.array([[sx, 0.0, 0.0], [0.0, sy, 0.0], [0.0, 0.0, 1.0]])
+    return translate(cx, cy) @ scaling @ translate(-cx, -cy)
+
+
+def mirror_x(x: float = 0.0) -> np.ndarray:
+    """Mirror across the vertical line at x (left and right swap)."""
+    return np.array([[-1.0, 0.0, 2.0 * x], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]])
+
+
+def mirror_y(y: float = 0.0) -> np.ndarray:
+    """Mirror across the horizontal line at y (top and bottom swap)."""
+    return np.array([[1.0, 0.0, 0.0], [0.0, -1.0, 2.0 * y], [0.0, 0.0, 1.0]])
+
+
+def apply(matrix, x, y) -> Tuple[np.ndarray, np.ndarray]:
+    """Transform arrays of coordinates.
+
+    Args:
+        matrix: 3x3 affine matrix
+        x: X-coordinates (array-like)
+        y: Y-coordinates (array-like, same shape as x)
+
+    Returns:
+        Tuple of transformed (x, y) arrays
+
+    """
+    m = as_affine(matrix)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    return (
+        m[0, 0] * x + m[0, 1] * y + m[0, 2],
+        m[1, 0] * x + m[1, 1] * y + m[1, 2],
+    )
+
+
+def grid_placements(
+    rows: int, columns: int, pitch_x: float, pitch_y: float
+) -> np.ndarray:
+    """Translations placing copies on a rectangular grid.
+
+    Args:
+        rows: Number of rows (along Y)
+        columns: Number of columns (along X)
+        pitch_x: Distance between columns
+        pitch_y: Distance between rows
+
+    Returns:
+        (rows * columns, 3, 3) stack of matrices in row-major order, the first
+        one being the identity
+
+    """
+    if rows < 1 or columns < 1:
+        raise ValueError(
+            f"Grid must have at least one row and column: {rows}x{columns}"
+        )
+    row, column = np.divmod(np.arange(rows * columns), columns)
+    matrices = np.tile(np.eye(3), (rows * columns, 1, 1))
+    matrices[:, 0, 2] = column * pitch_x
+    matrices[:, 1, 2] = row * pitch_y
+    return matrices
+
+
+def polar_placements(
+    count: int,
+    radius: float,
+    origin: Tuple[float, float],
+    center: Tuple[float, float],
+    start_angle: float = 0.0,
+    rotate: bool = True,
+) -> np.ndarray:
+    """Transforms placing copies evenly on a circle.
+
+    Args:
+        count: Number of copies
+        radius: Circle radius
+        origin: Point of the geometry that is moved onto the circle
+        center: Circle center
+        start_angle: Angle of the first copy in radians
+        rotate: Whether to rotate each copy by its angle on the circle
+
+    Returns:
+        (count, 3, 3) stack of matrices
+
+    """
+    if count < 1:
+        raise ValueError(f"count must be positive, got {count}")
+    angles = start_angle + 2 * np.pi * np.arange(count) / count
+    c, s = np.cos(angles), np.sin(angles)
+    if not rotate:
+        c, s = np.ones(count), np.zeros(count)
+    matrices = np.zeros((count, 3, 3))
+    matrices[:, 0, 0], matrices[:, 0, 1] = c, -s
+    matrices[:, 1, 0], matrices[:, 1, 1] = s, c
+    matrices[:, 2, 2] = 1.0
+    # Move the origin onto its place on the circle
+    ox, oy = origin
+    matrices[:, 0, 2] = center[0] + radius * np.cos(angles) - (c * ox - s * oy)
+    matrices[:, 1, 2] = center[1] + radius * np.sin(angles) - (s * ox + c * oy)
+    return matrices
+
+
+def flip_layers(layer_count: int) -> np.ndarray:
+    """Layer index mapping for moving geometry to the other board side.
+
+    The stackup is reversed: F.Cu and B.Cu swap, as do In1.Cu and the
+    innermost layer on the other side, and so on.
+
+    Args:
+        layer_count: Number of copper layers of the stackup
+
+    Returns:
+        Array mapping each layer index to its flipped index
+
+    """
+    if layer_count < 1:
+        raise ValueError(f"layer_count must be positive, got {layer_count}")
+    return np.arange(layer_count)[::-1].copy()
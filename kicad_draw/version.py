@@ -0,0 +1,34 @@
+"""Package version lookup."""
+
+import hashlib
+import os
+from functools import lru_cache
+
+
+def get_version() -> str:
+    """Get the package version."""
+    import importlib.metadata  # Slow to import, only needed here
+
+    try:
+        return importlib.metadata.version("kicad-draw")
+    except importlib.metadata.PackageNotFoundError:
+        return "unknown"
+
+
+@lru_cache(maxsize=None)
+def code_version() -> str:
+    """Identify the code that is running.
+
+    The package version is combined with a digest of the package's source
+    files, so that outputs derived from the code change whenever the code
+    does, even in uninstalled or editable checkouts where the version is
+    unknown or stale.
+    """
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    digest = hashlib.sha256()
+    for name in sorted(os.listdir(package_dir)):
+        if name.endswith(".py"):
+            digest.update(name.encode())
+            with open(os.path.join(package_dir, name), "rb") as f:
+                digest.update(f.read())
+    return f"{get_version()}+{digest.hexdigest()[:16]}"
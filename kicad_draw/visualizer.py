@@ -1,11 +1,74 @@
 """SVG-based visualization for PCB patterns."""
 
 import math
-from typing import List, Optional, Tuple
+import warnings
+from typing import TYPE_CHECKING, List, Optional, Tuple
 from xml.dom import minidom
 from xml.etree.ElementTree import Element, SubElement, tostring
 
-from .constants import Defaults
+from .constants import Angle, Defaults
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+ARC_CLOSURE_TOLERANCE = Angle.ARC_CLOSURE_TOLERANCE
+
+
+def arc_extreme_points(
+    center_x: float,
+    center_y: float,
+    radius: float,
+    start_angle: float,
+    end_angle: float,
+) -> List[Tuple[float, float]]:
+    """Get the points that determine the bounding box of an arc.
+
+    Returns:
+        Arc endpoints plus every axis-aligned extreme the arc passes through
+
+    """
+    low, high = sorted((start_angle, end_angle))
+    angles = [start_angle, end_angle]
+    quarter = math.ceil(low / Angle.HALF_PI)
+    while quarter * Angle.HALF_PI <= high and len(angles) < 6:
+        angles.append(quarter * Angle.HALF_PI)
+        quarter += 1
+    return [
+        (center_x + radius * math.cos(a), center_y + radius * math.sin(a))
+        for a in angles
+    ]
+
+
+def arc_path_data(
+    center_x: float,
+    center_y: float,
+    radius: float,
+    start_angle: float,
+    end_angle: float,
+) -> str:
+    """Build SVG path data for an arc using elliptical-arc (``A``) commands.
+
+    Arcs shorter than a full circle become a single ``A`` command; longer
+    arcs are split so that no command has coincident endpoints.
+    """
+    span = end_angle - start_angle
+    if abs(span) < Angle.TWO_PI - ARC_CLOSURE_TOLERANCE:
+        pieces = 1
+    else:
+        pieces = math.ceil(abs(span) / Angle.PI)
+    piece_span = span / pieces
+    sweep = 1 if span > 0 else 0
+    large_arc = 1 if abs(piece_span) > Angle.PI else 0
+
+    x = center_x + radius * math.cos(start_angle)
+    y = center_y + radius * math.sin(start_angle)
+    commands = [f"M {x} {y}"]
+    for i in range(1, pieces + 1):
+        angle = start_angle + piece_span * i
+        x = center_x + radius * math.cos(angle)
+        y = center_y + radius * math.sin(angle)
+        commands.append(f"A {radius} {radius} 0 {large_arc} {sweep} {x} {y}")
+    return " ".join(commands)
 
 
 class PCBVisualizer:
@@ -24,6 +87,9 @@ class PCBVisualizer:
     VIA_COLOR = "#404040"  # Dark gray for vias
     BACKGROUND_COLOR = "#1a1a1a"  # Dark PCB substrate
 
+    # Layer rendering order (bottom to top)
+    RENDER_ORDER = ["B.Cu", "In4.Cu", "In3.Cu", "In2.Cu", "In1.Cu", "F.Cu"]
+
     def __init__(
         self,
         width: float = Defaults.CANVAS_WIDTH,
@@ -78,21 +144,97 @@ class PCBVisualizer:
         end_angle: float,
         width: float,
         layer: str,
-        segments: int = Defaults.ARC_SEGMENTS,
+        segments: Optional[int] = None,
     ) -> None:
-        """Add an arc by converting to line segments."""
-        angle_step = (end_angle - start_angle) / segments
+        """Add an arc element.
+
+        Arcs are kept as true arcs and rendered with the SVG elliptical-arc
+        path command instead of being split into line segments.
+
+        Args:
+            center_x: X-coordinate of the arc center
+            center_y: Y-coordinate of the arc center
+            radius: Arc radius
+            start_angle: Start angle in radians
+            end_angle: End angle in radians (arc runs from start to end)
+            width: Trace width
+            layer: Layer name (e.g., "F.Cu", "In1.Cu", "B.Cu")
+            segments: Deprecated and ignored; arcs are no longer tessellated
+
+        """
+        if segments is not None:
+            warnings.warn(
+                "The 'segments' argument of add_arc is deprecated and ignored; "
+                "arcs are rendered as true SVG arcs",
+                DeprecationWarning,
+                stacklevel=2,
+            )
+        self.elements.append(
+            {
+                "type": "arc",
+                "cx": center_x,
+                "cy": center_y,
+                "radius": radius,
+                "start_angle": start_angle,
+                "end_angle": end_angle,
+                "width": width,
+                "layer": layer,
+            }
+        )
+        self.visible_layers.add(layer)
+        for x, y in arc_extreme_points(
+            center_x, center_y, radius, start_angle, end_angle
+        ):
+            self._update_bounds(x, y)
+
+    def add_elements(self, elements: List[dict]) -> None:
+        """Add elements recorded by another visualizer.
+
+        Args:
+            elements: Element dicts as stored in ``PCBVisualizer.elements``
 
-        for i in range(segments):
-            angle1 = start_angle + i * angle_step
-            angle2 = start_angle + (i + 1) * angle_step
+        """
+        for element in elements:
+            if element["type"] == "line":
+                self.add_line(
+                    element["x1"],
+                    element["y1"],
+                    element["x2"],
+                    element["y2"],
+                    element["width"],
+                    element["layer"],
+                )
+            elif element["type"] == "via":
+                self.add_via(element["x"], element["y"], element["size"])
+            elif element["type"] == "arc":
+                self.add_arc(
+                    element["cx"],
+                    element["cy"],
+                    element["radius"],
+                    element["start_angle"],
+                    element["end_angle"],
+                    element["width"],
+                    element["layer"],
+                )
+            else:
+                raise ValueError(f"Unknown element type: {element['type']}")
 
-            x1 = center_x + radius * math.cos(angle1)
-            y1 = center_y + radius * math.sin(angle1)
-            x2 = center_x + radius * math.cos(angle2)
-            y2 = center_y + radius * math.sin(angle2)
+    def set_elements(self, elements: List[dict]) -> None:
+        """Replace all elements, keeping the layer visibility state.
 
-            self.add_line(x1, y1, x2, y2, width, layer)
+        Bounds are recomputed from the new elements. Layers that had no
+        elements before become visible, as when drawing on them.
+
+        Args:
+            elements: Element dicts as stored in ``PCBVisualizer.elements``
+
+        """
+        known = set(self.get_available_layers())
+        visible = set(self.visible_layers)
+        self.elements = []
+        self.bounds = None
+        self.add_elements(elements)
+        self.visible_layers = visible | (set(self.get_available_layers()) - known)
 
     def _update_bounds(self, x: float, y: float) -> None:
         """Update the bounding box of all elements."""
@@ -171,8 +313,7 @@ class PCBVisualizer:
                 layers[layer].append(element)
 
         # Render layers (bottom to top) - only visible layers
-        render_order = ["B.Cu", "In4.Cu", "In3.Cu", "In2.Cu", "In1.Cu", "F.Cu"]
-        for layer_name in render_order:
+        for layer_name in self.RENDER_ORDER:
             if layer_name in layers and layer_name in self.visible_layers:
                 layer_group = SubElement(main_group, "g")
                 layer_group.set("class", f"layer-{layer_name.replace('.', '-')}")
@@ -189,6 +330,22 @@ class PCBVisualizer:
                         line.set("stroke", color)
                         line.set("stroke-width", str(element["width"]))
                         line.set("stroke-linecap", "round")
+                    elif element["type"] == "arc":
+                        path = SubElement(layer_group, "path")
+                        path.set(
+                            "d",
+                            arc_path_data(
+                                element["cx"],
+                                element["cy"],
+                                element["radius"],
+                                element["start_angle"],
+                                element["end_angle"],
+                            ),
+                        )
+                        path.set("fill", "none")
+                        path.set("stroke", color)
+                        path.set("stroke-width", str(element["width"]))
+                        path.set("stroke-linecap", "round")
 
         # Render vias on top (if enabled)
         if vias and self.show_vias:
@@ -342,6 +499,99 @@ class PCBVisualizer:
             f.write(self.generate_svg())
         print(f"SVG saved to {filename}")
 
+    async def asave_svg(
+        self, filename: str, executor: Optional["Executor"] = None
+    ) -> None:
+        """Save SVG to file without blocking the event loop.
+
+        The SVG is generated and written in an executor (see
+        :mod:`kicad_draw.aio`).
+
+        Args:
+            filename: Output SVG filename
+            executor: Thread pool to run in (default: see
+                :func:`kicad_draw.aio.set_executor`)
+
+        """
+        from kicad_draw import aio
+
+        svg = await aio.run(self.generate_svg, executor=executor, threads=True)
+        await aio.write_text(filename, [svg], executor)
+        print(f"SVG saved to {filename}")
+
+    def save_png(
+        self,
+        filename: str,
+        dpi: float = Defaults.RASTER_DPI,
+        antialias: bool = True,
+        max_size: Optional[int] = None,
+    ) -> None:
+        """Save a raster (PNG) rendering to file.
+
+        Args:
+            filename: Output PNG filename
+            dpi: Output resolution in dots per inch
+            antialias: Whether to blend partially covered pixels
+            max_size: Optional limit for the longest image side in pixels
+
+        """
+        from .raster import PCBRasterizer
+
+        PCBRasterizer(self, dpi, antialias, max_size).save_png(filename)
+
+    def export_scene(
+        self,
+        quantum: Optional[float] = Defaults.SCENE_QUANTUM,
+        compress: bool = False,
+        layer_order: Optional[List[str]] = None,
+    ) -> dict:
+        """Export elements as a compact scene description.
+
+        Args:
+            quantum: Grid size in mm for quantized, delta-encoded coordinates,
+                or None to store float32 coordinates
+            compress: Whether to deflate-compress the typed arrays
+            layer_order: Optional stackup layer order for the layer list
+
+        Returns:
+            JSON-serializable scene dictionary
+
+        """
+        from .scene import build_scene
+
+        return build_scene(self, quantum, compress, layer_order)
+
+    def save_scene(
+        self,
+        filename: str,
+        quantum: Optional[float] = Defaults.SCENE_QUANTUM,
+        compress: bool = True,
+        layer_order: Optional[List[str]] = None,
+    ) -> None:
+        """Save a compact JSON scene to file."""
+        from .scene import scene_to_json
+
+        with open(filename, "w") as f:
+            f.write(scene_to_json(self.export_scene(quantum, compress, layer_order)))
+        print(f"Scene saved to {filename}")
+
+    def save_html(
+        self,
+        filename: str,
+        quantum: Optional[float] = Defaults.SCENE_QUANTUM,
+        compress: bool = True,
+        layer_order: Optional[List[str]] = None,
+    ) -> None:
+        """Save a self-contained HTML canvas viewer to file.
+
+        The viewer supports panning, zooming and toggling layers and vias.
+        """
+        from .scene import scene_to_html
+
+        with open(filename, "w") as f:
+            f.write(scene_to_html(self.export_scene(quantum, compress, layer_order)))
+        print(f"HTML viewer saved to {filename}")
+
     def clear(self) -> None:
         """Clear all elements."""
         self.elements = []
@@ -0,0 +1,308 @@
+"""Incremental board regeneration for watch mode.
+
+An :class:`IncrementalBoard` keeps a board's :class:`~kicad_draw.PCBmodule.PCBdraw`
+across updates, together with the element and visualizer ranges of every coil
+of its spec. When the spec file changes, the new coil placements are matched
+against the previous ones and only coils with changed parameters are drawn.
+The ranges of removed and changed coils are cut out of the PCB's buffers and
+the new blocks are spliced in at their positions; unchanged coils are not
+touched, and the SVG bounds are combined from per-coil bounds.
+
+The output files are still written in full after every update: the board is
+the template joined with all (already formatted) elements, and the SVG
+preview is rendered again from all visualizer elements.
+"""
+
+import json
+import os
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from pydantic import BaseModel
+
+from kicad_draw.config import default_layers
+from kicad_draw.generate import DEFAULT_STACKUP, board_paths, draw_coil_task
+from kicad_draw.models import params_type_name
+from kicad_draw.PCBmodule import PCBdraw
+from kicad_draw.spec import BoardSpec, load_board_spec
+from kicad_draw.visualizer import PCBVisualizer
+
+# Elements and visualizer elements of one coil
+Block = Tuple[List[str], Optional[List[dict]]]
+
+
+def coil_key(params: BaseModel) -> str:
+    """Identify a coil placement by its type and parameter values."""
+    return json.dumps(
+        [params_type_name(params), params.model_dump(mode="json")], sort_keys=True
+    )
+
+
+def diff_coils(
+    old: Sequence[BaseModel], new: Sequence[BaseModel]
+) -> List[Optional[int]]:
+    """Match new coil placements to unchanged previous ones.
+
+    Args:
+        old: Previous coil parameter models
+        new: Current coil parameter models
+
+    Returns:
+        For every new coil, the index of an identical previous coil to reuse,
+        or None if the coil has to be drawn. Each previous coil is reused at
+        most once.
+
+    """
+    available: Dict[str, List[int]] = {}
+    for index, params in enumerate(old):
+        available.setdefault(coil_key(params), []).append(index)
+    matches = []
+    for params in new:
+        indices = available.get(coil_key(params))
+        matches.append(indices.pop(0) if indices else None)
+    return matches
+
+
+class IncrementalBoard:
+    """A board generated from a spec file and updated coil by coil."""
+
+    def __init__(
+        self,
+        spec_path: str,
+        stackup: Optional[str] = None,
+        template_path: Optional[str] = None,
+        output_dir: Optional[str] = None,
+        svg: bool = False,
+    ):
+        """Initialize the board; nothing is drawn until :meth:`update`.
+
+        Args:
+            spec_path: YAML board spec or single coil parameter file
+            stackup: Stackup overriding the spec's
+            template_path: KiCad PCB template overriding the spec's
+            output_dir: Directory for the generated files
+            svg: Also write an SVG preview
+
+        """
+        self.spec_path = spec_path
+        self.stackup = stackup
+        self.template_path = template_path
+        self.output_dir = output_dir
+        self.svg = svg
+        self.spec: Optional[BoardSpec] = None
+        self.blocks: List[Block] = []
+        self.pcb: Optional[PCBdraw] = None  # Kept across updates
+        # Visualizer bounds and layers of every coil, combined after splicing
+        self._bounds: List[Optional[List[float]]] = []
+        self._layers: List[set] = []
+        self._board_stackup: Optional[str] = None
+        self._template: Optional[Tuple[str, float, str]] = None  # path, mtime, text
+
+    def watched_paths(self) -> List[str]:
+        """Files whose changes require an update."""
+        paths = [self.spec_path]
+        template = self.template_path or (self.spec and self.spec.template)
+        if template:
+            paths.append(template)
+        return paths
+
+    def _read_template(self, path: str) -> str:
+        """Read the template, reusing the content while the file is unchanged."""
+        mtime = os.path.getmtime(path)
+        if self._template is None or self._template[:2] != (path, mtime):
+            with open(path, "r") as f:
+                self._template = (path, mtime, f.read())
+        return self._template[2]
+
+    def update(self) -> Dict[str, object]:
+        """Reload the spec, redraw changed coils and write the outputs.
+
+        Returns:
+            Summary with the counts of drawn, reused and removed coils, the
+            element count and the output paths
+
+        """
+        spec = load_board_spec(self.spec_path)
+        board_stackup = self.stackup or spec.stackup or DEFAULT_STACKUP
+        if board_stackup not in default_layers:
+            raise ValueError(f"Unknown stackup: {board_stackup}")
+        template_path = self.template_path or spec.template
+        if template_path is None:
+            raise ValueError(f"{spec.source}: no template given for the board")
+        template = self._read_template(template_path)
+
+        if self.pcb is None or board_stackup != self._board_stackup:
+            self.pcb = PCBdraw(
+                board_stackup, mode="file", enable_visualization=self.svg
+            )
+            self.blocks, self._bounds, self._layers = [], [], []
+        previous = len(self.blocks)
+        matches = diff_coils(self.spec.coils if previous else [], spec.coils)
+
+        # Draw before splicing, so a failing coil leaves the PCB unchanged
+        blocks, bounds, layers = [], [], []
+        for params, match in zip(spec.coils, matches):
+            if match is not None:
+                block = self.blocks[match]
+                bounds.append(self._bounds[match])
+                layers.append(self._layers[match])
+            else:
+                task = (
+                    params_type_name(params),
+                    params.model_dump(),
+                    board_stackup,
+                    self.svg,
+                )
+                block = draw_coil_task(task)
+                scratch = PCBVisualizer()
+                scratch.add_elements(block[1] or [])
+                bounds.append(scratch.bounds)
+                layers.append(scratch.visible_layers)
+            blocks.append(block)
+        # Coils reused in their previous order stay in place; the others are
+        # removed and (re)inserted, moved ones from their previous block
+        kept = [False] * len(matches)
+        last = -1
+        for i, match in enumerate(matches):
+            if match is not None and match > last:
+                kept[i], last = True, match
+        self._remove(set(range(previous)) - {m for m, k in zip(matches, kept) if k})
+
+        self._insert(blocks, kept)
+        self.blocks, self._bounds, self._layers = blocks, bounds, layers
+        pcb = self.pcb
+        if pcb.visualizer is not None:
+            pcb.visualizer.bounds = _union_bounds(bounds)
+            pcb.visualizer.visible_layers.update(*layers)
+
+        content = pcb._merge_template(template)
+        if content is None:
+            raise ValueError(f"Invalid template file format: {template_path}")
+
+        outputs = board_paths(spec, self.output_dir, self.svg)
+        os.makedirs(
+            os.path.dirname(os.path.abspath(outputs["kicad_pcb"])), exist_ok=True
+        )
+        with open(outputs["kicad_pcb"], "w") as f:
+            f.write(content)
+        if self.svg:
+            with open(outputs["svg"], "w") as f:
+                f.write(pcb.get_svg())
+
+        reused = sum(match is not None for match in matches)
+        self.spec = spec
+        self._board_stackup = board_stackup
+        return {
+            "name": spec.name,
+            "drawn": len(blocks) - reused,
+            "reused": reused,
+            "removed": previous - reused,
+            "element_count": len(pcb.elements),
+            "outputs": outputs,
+        }
+
+    def _remove(self, coils: Set[int]) -> None:
+        """Cut the ranges of previous coils out of the PCB's buffers."""
+        visualizer = self.pcb.visualizer
+        stop = len(self.pcb.elements)
+        svg_stop = len(visualizer.elements) if visualizer is not None else 0
+        # Walk backwards so the ranges of earlier coils stay valid
+        for index in reversed(range(len(self.blocks))):
+            elements, svg_elements = self.blocks[index]
+            start = stop - len(elements)
+            svg_start = svg_stop - len(svg_elements or [])
+            if index in coils:
+                del self.pcb.elements[start:stop]
+                if visualizer is not None:
+                    del visualizer.elements[svg_start:svg_stop]
+            stop, svg_stop = start, svg_start
+
+    def _insert(self, blocks: List[Block], kept: List[bool]) -> None:
+        """Splice the blocks of coils that are not kept in place."""
+        visualizer = self.pcb.visualizer
+        position = svg_position = 0
+        for (elements, svg_elements), in_place in zip(blocks, kept):
+            svg_elements = svg_elements or []
+            if not in_place:
+                self.pcb.elements[position:position] = elements
+                if visualizer is not None:
+                    visualizer.elements[svg_position:svg_position] = svg_elements
+            position += len(elements)
+            svg_position += len(svg_elements)
+
+
+def _union_bounds(
+    bounds: Sequence[Optional[List[float]]],
+) -> Optional[List[float]]:
+    """Bounding box [min_x, min_y, max_x, max_y] of several boxes."""
+    boxes = [box for box in bounds if box is not None]
+    if not boxes:
+        return None
+    return [
+        min(box[0] for box in boxes),
+        min(box[1] for box in boxes),
+        max(box[2] for box in boxes),
+        max(box[3] for box in boxes),
+    ]
+
+
+def _mtimes(paths: Sequence[str]) -> Tuple[Optional[float], ...]:
+    """Modification times of files (None for missing files)."""
+    mtimes = []
+    for path in paths:
+        try:
+            mtimes.append(os.path.getmtime(path))
+        except OSError:
+            mtimes.append(None)
+    return tuple(mtimes)
+
+
+def watch_boards(
+    boards: Sequence[IncrementalBoard],
+    on_update: Callable[[IncrementalBoard, Dict[str, object], float], None],
+    on_error: Callable[[IncrementalBoard, Exception], None],
+    interval: float = 0.5,
+    max_updates: Optional[int] = None,
+) -> None:
+    """Poll the boards' files and update a board whenever one changes.
+
+    Every board is updated once at the start. A spec that fails to load
+    (e.g. while it is being edited) is reported and retried on its next
+    change; the previous outputs are left in place.
+
+    Args:
+        boards: Boards to keep up to date
+        on_update: Called with the board, its update summary and the elapsed
+            seconds after each successful update
+        on_error: Called with the board and the exception of a failed update
+        interval: Polling interval in seconds
+        max_updates: Stop after this many update attempts (None runs until
+            interrupted)
+
+    """
+    seen: List[Optional[Dict[str, Optional[float]]]] = [None] * len(boards)
+    attempts = 0
+    while True:
+        for i, board in enumerate(boards):
+            # Times are taken before updating, so edits made while the
+            # update runs are picked up on the next poll
+            paths = board.watched_paths()
+            state = dict(zip(paths, _mtimes(paths)))
+            if state == seen[i]:
+                continue
+            seen[i] = state
+            start = time.perf_counter()
+            try:
+                summary = board.update()
+            except (OSError, ValueError) as e:
+                on_error(board, e)
+            else:
+                on_update(board, summary, time.perf_counter() - start)
+                # The template path may only be known after the update
+                for path in board.watched_paths():
+                    if path not in state:
+                        state[path] = _mtimes([path])[0]
+            attempts += 1
+            if max_updates is not None and attempts >= max_updates:
+                return
+        time.sleep(interval)
@@ -0,0 +1,46 @@
+"""Shared test fixtures."""
+
+import pytest
+
+from kicad_draw.models import HelixParams
+
+# Small two-layer circular helix used across the test modules
+HELIX_FIELDS = {
+    "x0": 150.0,
+    "y0": 100.0,
+    "radius": 10.0,
+    "port_gap": 1.0,
+    "tab_gap": 2.0,
+    "angle_step": 0.1,
+    "layer_index_list": [0, 1],
+    "track_width": 0.5,
+    "connect_width": 0.3,
+    "drill_size": 0.2,
+    "via_size": 0.4,
+    "net_number": 1,
+    "segment_number": 20,
+}
+
+
+@pytest.fixture
+def make_helix():
+    """Return a factory for helix parameters with field overrides."""
+
+    def make(**overrides) -> HelixParams:
+        return HelixParams(**{**HELIX_FIELDS, **overrides})
+
+    return make
+
+
+@pytest.fixture
+def helix(make_helix):
+    """Small circular helix parameters."""
+    return make_helix()
+
+
+@pytest.fixture
+def template(tmp_path):
+    """Write a minimal KiCad PCB template."""
+    path = tmp_path / "template.kicad_pcb"
+    path.write_text('(kicad_pcb\n\t(version 20241229)\n\t(net 0 "")\n)\n')
+    return str(path)
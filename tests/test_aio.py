@@ -0,0 +1,49 @@
+"""Tests for the asyncio API."""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from kicad_draw import aio
+from kicad_draw.PCBmodule import PCBdraw
+
+
+def test_async_save_matches_save(tmp_path, template, helix, monkeypatch):
+    """Test that async drawing and output match the blocking calls."""
+    monkeypatch.setattr(aio, "WRITE_CHUNK_CHARS", 4096)
+    pcb = PCBdraw("default_4layer", mode="file")
+    pcb.draw(helix)
+    pcb.save(str(tmp_path / "sync.kicad_pcb"), template)
+    pcb.save_svg(str(tmp_path / "sync.svg"))
+
+    async def main() -> PCBdraw:
+        apcb = PCBdraw("default_4layer", mode="file")
+        with ThreadPoolExecutor(2) as executor:
+            await apcb.adraw(helix, executor)
+            await apcb.asave(str(tmp_path / "async.kicad_pcb"), template, executor)
+            await apcb.asave_svg(str(tmp_path / "async.svg"), executor)
+            assert await apcb.aget_svg(executor) == pcb.get_svg()
+        return apcb
+
+    apcb = asyncio.run(main())
+    assert apcb.elements == pcb.elements
+    for name in ("kicad_pcb", "svg"):
+        sync = (tmp_path / f"sync.{name}").read_text()
+        assert (tmp_path / f"async.{name}").read_text() == sync
+
+
+def test_draw_coils(make_helix):
+    """Test concurrent drawing with the default executor."""
+    coils = [make_helix(x0=10.0 * i) for i in range(3)]
+    pcbs = [PCBdraw("default_4layer", mode="file") for _ in coils]
+    for pcb, coil in zip(pcbs, coils):
+        pcb.draw(coil)
+
+    with ThreadPoolExecutor(2) as executor:
+        aio.set_executor(executor)
+        try:
+            drawn = asyncio.run(aio.draw_coils(coils, svg=True, limit=2))
+        finally:
+            aio.set_executor(None)
+    assert aio.get_executor() is None
+    assert [elements for elements, _ in drawn] == [pcb.elements for pcb in pcbs]
+    assert drawn[0][1] == pcbs[0].visualizer.elements
@@ -0,0 +1,99 @@
+"""Tests for the inductance estimates."""
+
+import math
+
+import numpy as np
+import pytest
+
+from kicad_draw.analysis import (
+    coil_inductance,
+    coil_inductances,
+    conductor_pieces,
+    layer_heights,
+    partial_inductance,
+)
+from kicad_draw.models import HelixRectangleParams
+from kicad_draw.PCBmodule import PCBdraw
+
+
+def test_single_turn_matches_loop_formula(make_helix):
+    """Test a one-layer ring against the inductance of a circular loop."""
+    ring = make_helix(layer_index_list=[0], port_gap=0.01, segment_number=200)
+    gmd = 0.2235 * (ring.track_width + 0.035)
+    # mu0 R (ln(8 R / g) - 2), in nH with R in mm
+    expected = 0.4 * math.pi * ring.radius * (math.log(8 * ring.radius / gmd) - 2)
+    assert coil_inductance(ring) == pytest.approx(expected, rel=0.01)
+
+
+def test_helix_inductance(make_helix):
+    """Test orientation independence, layer coupling and batches."""
+    helix = make_helix(layer_index_list=[0, 1, 2, 3])
+    value = coil_inductance(helix)
+
+    # Reversed drawing directions describe the same conductors
+    pcb = PCBdraw("default_4layer", mode="file", enable_visualization=False)
+    group = pcb.capture(helix)
+    segments = group.segments
+    segments[["x1", "y1", "x2", "y2"]] = segments[["x2", "y2", "x1", "y1"]].copy()
+    heights = layer_heights("default_4layer")
+    reversed_value = partial_inductance(*conductor_pieces(group, heights))
+    assert reversed_value == pytest.approx(value)
+
+    # Four coupled turns are well above four separate ones
+    ring = coil_inductance(make_helix(layer_index_list=[0]))
+    assert 4 * ring < value < 16 * ring
+    # Closer layers couple more strongly
+    assert coil_inductance(helix, layer_spacing=[0.1, 0.1, 0.1]) > value
+
+    coils = [helix, make_helix(radius=5.0)]
+    values = coil_inductances(coils)
+    assert values[0] == pytest.approx(value)
+    assert values[1] < values[0]
+    assert np.array_equal(coil_inductances(coils, jobs=2), values)
+
+
+def test_rectangle_and_zero_tab_gap(make_helix):
+    """Test default rectangles with ports, whose tabs have zero length."""
+    rectangle = HelixRectangleParams(
+        x0=0.0,
+        y0=0.0,
+        width=20.0,
+        height=10.0,
+        corner_radius=2.0,
+        layer_index_list=[0, 1, 2, 3],
+        track_width=0.5,
+        connect_width=0.3,
+        drill_size=0.3,
+        via_size=0.6,
+        net_number=1,
+        port_gap=0.5,
+    )
+    single = coil_inductance(rectangle.model_copy(update={"layer_index_list": [0]}))
+    assert 4 * single < coil_inductance(rectangle) < 16 * single
+
+    helix = make_helix(layer_index_list=[0, 1, 2, 3])
+    flat_tabs = coil_inductance(helix.model_copy(update={"tab_gap": 0.0}))
+    assert flat_tabs == pytest.approx(coil_inductance(helix), rel=0.1)
+
+
+def test_invalid_inputs(make_helix):
+    """Test stackup spacing validation and coils that are not one path."""
+    with pytest.raises(ValueError):
+        layer_heights("default_4layer", [0.2, 1.2])
+    with pytest.raises(ValueError):
+        coil_inductances([make_helix()], layer_spacing=[0.2, -1.0, 0.2])
+    closed_rings = HelixRectangleParams(
+        x0=0.0,
+        y0=0.0,
+        width=20.0,
+        height=10.0,
+        corner_radius=2.0,
+        layer_index_list=[0, 1],
+        track_width=0.5,
+        connect_width=0.3,
+        drill_size=0.3,
+        via_size=0.6,
+        net_number=1,
+    )
+    with pytest.raises(ValueError):
+        coil_inductance(closed_rings)
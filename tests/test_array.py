@@ -0,0 +1,69 @@
+"""Tests for grid and polar coil arrays."""
+
+import math
+
+import numpy as np
+import pytest
+
+from kicad_draw.PCBmodule import PCBdraw
+
+
+def test_grid_array_matches_individual_coils(make_helix):
+    """Test that a grid array equals coils drawn one by one."""
+    coil = make_helix(x0=0.0, y0=0.0)
+    pcb = PCBdraw("default_4layer", mode="file")
+    node = pcb.draw_array(coil, grid=(3, 4), pitch=(25.0, 30.0))
+    assert node.count == 12
+
+    expected = PCBdraw("default_4layer", mode="file")
+    for row in range(3):
+        for column in range(4):
+            expected.draw_helix(
+                coil.model_copy(
+                    update={
+                        "x0": 25.0 * column,
+                        "y0": 30.0 * row,
+                        "net_number": 1 + 4 * row + column,
+                    }
+                )
+            )
+    assert pcb.export() == expected.export()
+    assert pcb.get_svg() == expected.get_svg()
+
+
+def test_polar_array(make_helix):
+    """Test copies placed on a circle, rotated and on consecutive nets."""
+    coil = make_helix(x0=50.0, y0=50.0, net_number=5)
+    pcb = PCBdraw("default_4layer", mode="file")
+    pcb.draw_polar_array(coil, count=8, radius=40.0, start_angle=math.pi / 8)
+    base = pcb.capture(coil)
+
+    vias = [e for e in pcb.elements if e.startswith("(via")]
+    assert len(vias) == 8 * len(base.vias)
+    assert [f"(net {5 + i})" in via for i, via in enumerate(vias)] == [True] * 8
+
+    # Every via keeps its distance to its copy's center on the circle
+    offset = math.hypot(base.vias["x"][0] - 50.0, base.vias["y"][0] - 50.0)
+    for i, via in enumerate(vias):
+        x, y = (float(v) for v in via.split("(at ")[1].split(")")[0].split())
+        angle = math.pi / 8 + 2 * math.pi * i / 8
+        cx, cy = 50.0 + 40.0 * math.cos(angle), 50.0 + 40.0 * math.sin(angle)
+        assert math.isclose(math.hypot(x - cx, y - cy), offset)
+
+    with pytest.raises(ValueError):
+        pcb.draw_polar_array(coil, count=0, radius=10.0)
+
+
+def test_array_node_edits(make_helix):
+    """Test that editing an array node redraws every copy."""
+    pcb = PCBdraw("default_4layer", mode="file", enable_visualization=False)
+    node = pcb.draw_array(make_helix(), grid=(2, 2), pitch=(30.0, 30.0), net_step=0)
+    count = len(pcb.elements)
+    assert all("(net 1)" in element for element in pcb.elements)
+
+    node.update(segment_number=40)
+    pcb.refresh()
+    single = len(pcb.capture(make_helix(segment_number=40)))
+    assert len(pcb.elements) == 4 * single > count
+    xs = np.array([float(e.split()[2]) for e in pcb.elements if "(segment" in e])
+    assert xs.max() - xs.min() > 30.0
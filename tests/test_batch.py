@@ -0,0 +1,126 @@
+"""Tests for columnar parameter batches."""
+
+import os
+
+import numpy as np
+import pytest
+
+from kicad_draw.batch import HelixParamsBatch, HelixRectangleParamsBatch
+from kicad_draw.models import HelixParams
+from kicad_draw.spec import load_board_spec
+from kicad_draw.sweep import expand_grid
+
+EXAMPLE_PARAMS = os.path.join(
+    os.path.dirname(__file__), os.pardir, "examples", "params"
+)
+
+
+@pytest.fixture
+def helix_batch(helix):
+    """Batch sweeping radius and layer lists."""
+    return HelixParamsBatch.from_grid(
+        helix,
+        {"radius": [5.0, 10.0, 15.0], "layer_index_list": [[0, 1], [0, 1, 2, 3]]},
+    )
+
+
+def test_from_grid_matches_expand_grid(helix, helix_batch):
+    """Test that batch rows equal the models built by expand_grid."""
+    expected = expand_grid(
+        helix,
+        {"radius": [5.0, 10.0, 15.0], "layer_index_list": [[0, 1], [0, 1, 2, 3]]},
+    )
+    assert len(helix_batch) == 6
+    assert list(helix_batch) == expected
+    assert isinstance(helix_batch[-1], HelixParams)
+    assert helix_batch.columns["radius"].dtype == np.float64
+
+
+def test_defaults_and_ragged_columns():
+    """Test defaults for omitted columns and (values, offsets) input."""
+    batch = HelixParamsBatch(
+        x0=[0.0, 1.0],
+        y0=[0, 0],
+        radius=[5, 6],
+        port_gap=[1, 1],
+        tab_gap=[1, 1],
+        angle_step=[0, 0],
+        layer_index_list=(np.array([0, 1, 0, 1, 2]), np.array([0, 2, 5])),
+        track_width=[0.5, 0.5],
+        connect_width=[0.3, 0.3],
+        drill_size=[0.2, 0.2],
+        via_size=[0.4, 0.4],
+        net_number=[1, 2],
+    )
+    assert batch[1].layer_index_list == [0, 1, 2]
+    assert batch[1].tab_position == "OUT"
+    assert batch[0].segment_number == 100
+
+    sub = batch[[1]]
+    assert len(sub) == 1
+    assert sub[0] == batch[1]
+
+
+def test_vectorized_validation_reports_rows(helix_batch):
+    """Test that violations list every failing rule and its rows."""
+    records = [helix_batch.row(i) for i in range(len(helix_batch))]
+    records[1]["tab_position"] = "SIDE"
+    records[4]["tab_position"] = "BOTH"
+    records[2]["segment_number"] = 2.5
+    with pytest.raises(ValueError, match="non-integer"):
+        HelixParamsBatch.from_records(records)
+
+    records[2]["segment_number"] = 10
+    with pytest.raises(ValueError) as excinfo:
+        HelixParamsBatch.from_records(records)
+    assert "tab_position must be one of ['IN', 'OUT'] (2 rows: 1, 4)" in str(
+        excinfo.value
+    )
+
+
+def test_batch_accepts_what_the_model_accepts(helix_batch):
+    """Test that rows valid for the model are valid in a batch."""
+    records = [helix_batch.row(i) for i in range(len(helix_batch))]
+    records[0]["tab_gap"] = -0.75
+    records[1]["port_gap"] = 50.0
+    records[2]["layer_index_list"] = []
+    records[3]["drill_size"] = 1.0
+    models = [HelixParams(**record) for record in records]
+    assert list(HelixParamsBatch.from_records(records)) == models
+
+
+def test_batch_from_example_params():
+    """Test batching the coils of the example parameter files."""
+    for name in ("params_helix_rectangle.yaml", "board_coil_array.yaml"):
+        spec = load_board_spec(os.path.join(EXAMPLE_PARAMS, name))
+        for coil in spec.coils:
+            batch_type = (
+                HelixParamsBatch
+                if isinstance(coil, HelixParams)
+                else HelixRectangleParamsBatch
+            )
+            assert list(batch_type.from_models([coil])) == [coil]
+
+
+def test_subclass_constraints(helix):
+    """Test that subclasses can add vectorized constraints."""
+
+    class CompactHelixBatch(HelixParamsBatch):
+        CONSTRAINTS = (
+            ("radius must be at most 12 mm", lambda b: b.columns["radius"] <= 12),
+        )
+
+    variants = expand_grid(helix, {"radius": [5.0, 15.0]})
+    with pytest.raises(ValueError, match=r"at most 12 mm \(1 rows: 1\)"):
+        CompactHelixBatch.from_models(variants)
+
+
+def test_csv_and_npz_roundtrip(tmp_path, helix_batch):
+    """Test saving and loading batches as CSV and NPZ."""
+    helix_batch.to_csv(str(tmp_path / "batch.csv"))
+    helix_batch.to_npz(str(tmp_path / "batch.npz"))
+
+    from_csv = HelixParamsBatch.from_csv(str(tmp_path / "batch.csv"))
+    from_npz = HelixParamsBatch.from_npz(str(tmp_path / "batch.npz"))
+    assert list(from_csv) == list(helix_batch)
+    assert list(from_npz) == list(helix_batch)
@@ -0,0 +1,47 @@
+"""Tests for the benchmark workload and the bench command."""
+
+import json
+
+from click.testing import CliRunner
+
+from kicad_draw.bench import STAGES, format_report, run_benchmark
+from kicad_draw.cli import main
+
+
+def test_run_benchmark():
+    """Test the report of a small workload."""
+    report = run_benchmark([10, 20], repeat=1)
+    assert [(c["shape"], c["segment_number"]) for c in report["cases"]] == [
+        ("helix", 10),
+        ("helix", 20),
+        ("helix_rectangle", 10),
+        ("helix_rectangle", 20),
+    ]
+    assert report["totals"]["elements"] == sum(
+        case["elements"] for case in report["cases"]
+    )
+    for case in report["cases"]:
+        assert set(case["stages"]) == set(STAGES)
+        assert case["stages"]["save"]["bytes"] > case["stages"]["export"]["bytes"]
+        assert case["peak_traced_bytes"] > 0
+    assert report["metadata"]["python"] and report["metadata"]["numpy"]
+    assert json.loads(json.dumps(report)) == report
+    assert "helix_rectangle/20" in format_report(report)
+
+
+def test_bench_command(tmp_path):
+    """Test the JSON report of the bench command."""
+    runner = CliRunner()
+    result = runner.invoke(main, ["bench", "--segments", "10", "--repeat", "1"])
+    assert result.exit_code == 0, result.output
+    report = json.loads(result.output)
+    assert report["workload"]["segment_numbers"] == [10]
+
+    output = tmp_path / "report.json"
+    args = ["bench", "--segments", "10", "--repeat", "1", "--no-memory"]
+    result = runner.invoke(main, args + ["-o", str(output)])
+    assert result.exit_code == 0, result.output
+    assert "peak_traced_bytes" not in json.loads(output.read_text())
+
+    result = runner.invoke(main, ["bench", "--segments", "0"])
+    assert result.exit_code != 0 and "Invalid segment numbers" in result.output
@@ -0,0 +1,119 @@
+"""Tests for the content-addressed coil cache."""
+
+import os
+
+from kicad_draw.cache import BaseCoilCache, CoilCache, MemoryCoilCache
+from kicad_draw.generate import generate_boards
+from kicad_draw.PCBmodule import PCBdraw
+from kicad_draw.spec import BoardSpec
+
+
+def test_key_depends_on_inputs(tmp_path, helix):
+    """Test that every key component changes the key."""
+    cache = CoilCache(str(tmp_path))
+    layers = ["F.Cu", "In1.Cu", "In2.Cu", "B.Cu"]
+    key = cache.key(helix, layers)
+    assert key == cache.key(helix.model_copy(), list(layers))
+    assert key != cache.key(helix.model_copy(update={"radius": 11.0}), layers)
+    assert key != cache.key(helix, layers[::-1])
+    assert key != cache.key(helix, layers, template_digest="abc")
+
+
+def test_pcbdraw_reuses_cached_coils(tmp_path, helix):
+    """Test that a cached draw reproduces elements and SVG exactly."""
+    reference = PCBdraw("default_4layer", mode="file")
+    reference.draw(helix)
+
+    cache = CoilCache(str(tmp_path))
+    first = PCBdraw("default_4layer", mode="file", cache=cache)
+    first.draw(helix)
+    second = PCBdraw("default_4layer", mode="file", cache=cache)
+    second.draw(helix)
+    assert cache.stats() == {"hits": 1, "misses": 1}
+    assert second.elements == first.elements == reference.elements
+    assert second.get_svg() == reference.get_svg()
+
+    # Entries stored without visualizer elements do not satisfy SVG lookups
+    cache.clear()
+    PCBdraw(
+        "default_4layer", mode="file", enable_visualization=False, cache=cache
+    ).draw(helix)
+    third = PCBdraw("default_4layer", mode="file", cache=cache)
+    third.draw(helix)
+    assert cache.hits == 1
+    assert third.get_svg() == reference.get_svg()
+
+
+def test_lru_eviction(tmp_path):
+    """Test that the least recently used entries are evicted first."""
+    cache = CoilCache(str(tmp_path), max_bytes=300)
+    for i, key in enumerate(["aa01", "bb02", "cc03"]):
+        cache.put(key, ["x" * 99])
+        os.utime(cache._path(key, ".kicad"), (i, i))
+    assert cache.get("aa01") is not None  # Refreshes aa01
+    cache.put("dd04", ["y" * 99])
+
+    assert cache.get("bb02") is None
+    assert cache.get("aa01").elements == ["x" * 99]
+    assert cache.get("dd04") is not None
+    assert cache.size() <= 300
+
+
+def test_generate_boards_hits_cache(tmp_path, helix):
+    """Test that regenerating an unchanged board only hits the cache."""
+    template = tmp_path / "template.kicad_pcb"
+    template.write_text("(kicad_pcb\n)\n")
+    moved = helix.model_copy(update={"x0": 120.0})
+    spec = BoardSpec(
+        source=str(tmp_path / "board.yaml"),
+        coils=[helix, moved],
+        template=str(template),
+    )
+    cache = CoilCache(str(tmp_path / "cache"))
+
+    (first,) = generate_boards([spec], jobs=1, cache=cache)
+    with open(first["outputs"]["kicad_pcb"]) as f:
+        expected = f.read()
+    (second,) = generate_boards([spec], jobs=1, cache=cache)
+    assert (first["cache_hits"], second["cache_hits"]) == (0, 2)
+    with open(second["outputs"]["kicad_pcb"]) as f:
+        assert f.read() == expected
+
+    # A changed template digest invalidates the entries
+    template.write_text("(kicad_pcb (version 1)\n)\n")
+    (third,) = generate_boards([spec], jobs=1, cache=cache)
+    assert third["cache_hits"] == 0
+
+
+def test_entries_follow_umask_and_code_version(tmp_path, helix, monkeypatch):
+    """Test entry permissions and that code changes alter the keys."""
+    cache = CoilCache(str(tmp_path))
+    cache.put("ee05", ["(segment)"])
+    mode = os.stat(cache._path("ee05", ".kicad")).st_mode & 0o777
+    umask = os.umask(0)
+    os.umask(umask)
+    assert mode == 0o666 & ~umask
+
+    key = cache.key(helix, ["F.Cu", "B.Cu"])
+    monkeypatch.setattr(cache, "_version", "unknown+0123456789abcdef")
+    assert cache.key(helix, ["F.Cu", "B.Cu"]) != key
+
+
+def test_memory_cache(helix):
+    """Test the in-memory cache's LRU eviction and shared keys."""
+    cache = MemoryCoilCache(max_entries=2)
+    assert isinstance(cache, BaseCoilCache) and not isinstance(cache, CoilCache)
+    layers = ["F.Cu", "In1.Cu", "In2.Cu", "B.Cu"]
+    keys = [
+        cache.key(helix.model_copy(update={"radius": r}), layers) for r in (1, 2, 3)
+    ]
+    cache.put(keys[0], ["a"])
+    cache.put(keys[1], ["b"], [{"type": "via"}])
+    assert cache.get(keys[0]).elements == ["a"]
+    assert cache.get(keys[0], svg=True) is None
+    cache.put(keys[2], ["c"])
+    # keys[1] was the least recently used entry
+    assert cache.get(keys[1]) is None and len(cache) == 2
+    assert cache.stats() == {"hits": 1, "misses": 2}
+    cache.clear()
+    assert len(cache) == 0
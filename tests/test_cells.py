@@ -0,0 +1,67 @@
+"""Tests for hierarchical cells placed by reference."""
+
+import numpy as np
+import pytest
+
+from kicad_draw.cells import Cell, placement_matrix
+from kicad_draw.PCBmodule import PCBdraw
+
+
+@pytest.fixture
+def coil(make_helix):
+    """Helix centered on the origin."""
+    return make_helix(x0=0.0, y0=0.0)
+
+
+def test_placements_match_transformed_coils(coil):
+    """Test that flattened placements equal individually transformed coils."""
+    pcb = PCBdraw("default_4layer", mode="file")
+    cell = pcb.define_cell("coil", coil)
+    placements = [(10.0, 20.0, 0.0, None), (40.0, 20.0, np.pi / 2, 5)]
+    for x, y, rotation, net in placements:
+        pcb.place(cell, x, y, rotation, net)
+    assert pcb.elements == []  # Nothing is copied before export
+
+    expected = []
+    group = pcb.capture(coil)
+    for x, y, rotation, net in placements:
+        moved = group.transformed(placement_matrix(x, y, rotation))
+        if net is not None:
+            moved = moved.with_net(net)
+        expected += moved.format(pcb.layer_manager.layers, pcb.formatter)
+    assert pcb.export() == "\n".join(expected)
+
+    svg = pcb.get_svg()
+    assert svg.count("<path") >= 2 * len(group.arcs)
+    assert pcb.visualizer.elements == []
+
+
+def test_nested_cells_and_memory(coil):
+    """Test nested references, net overrides and memory per distinct shape."""
+    pcb = PCBdraw("default_4layer", mode="file")
+    unit = pcb.define_cell("coil", coil)
+    pair = pcb.define_cell("pair")
+    pair.add(unit, x=-15.0)
+    pair.add(unit, x=15.0, rotation=np.pi)
+    for i in range(50):
+        pcb.place(pair, y=30.0 * i, net=i + 1)
+
+    flat = pair.flatten()
+    assert len(flat) == 2 * len(unit.group)
+    exported = pcb.export().split("\n")
+    assert len(exported) == 100 * len(unit.group)
+    assert "(net 50)" in exported[-1]
+    assert unit.nbytes + pair.nbytes == unit.group.nbytes
+
+    with pytest.raises(ValueError, match="cycle"):
+        unit.add(pair)
+    with pytest.raises(ValueError, match="already defined"):
+        pcb.define_cell("pair")
+
+
+def test_print_mode_prints_placements(coil, capsys):
+    """Test that placing in print mode prints the flattened cell."""
+    pcb = PCBdraw("default_4layer", mode="print", enable_visualization=False)
+    cell = Cell("coil", pcb.capture(coil))
+    pcb.place(cell, 5.0, 5.0)
+    assert capsys.readouterr().out.count("\n") == len(cell.group)
@@ -0,0 +1,73 @@
+"""Tests for KiCad footprint output."""
+
+import math
+import re
+
+import numpy as np
+
+from kicad_draw.footprint import footprint_body
+from kicad_draw.group import ARC_DTYPE, VISUAL_ARC, VISUAL_DTYPE, ElementGroup
+from kicad_draw.PCBmodule import PCBdraw
+
+
+def balanced(text: str) -> bool:
+    """Check that parentheses are balanced."""
+    depth = 0
+    for char in text:
+        depth += {"(": 1, ")": -1}.get(char, 0)
+        if depth < 0:
+            return False
+    return depth == 0
+
+
+def test_save_footprint(tmp_path, make_helix):
+    """Test the items of a saved footprint."""
+    coil = make_helix(x0=0.0, y0=0.0, segment_number=100)
+    pcb = PCBdraw("default_4layer", mode="file")
+    path = tmp_path / "coil.kicad_mod"
+    pcb.save_footprint(coil, str(path))
+    content = path.read_text()
+    group = pcb.capture(coil)
+
+    assert content.startswith('(footprint "coil"')
+    assert balanced(content)
+    assert content.count("(fp_arc") == len(group.arcs) == 2
+    assert content.count("(fp_line") == 2
+    assert content.count("(pad ") == len(group.vias) == 1
+    assert "(net" not in content
+
+    # Arcs start where their tessellation starts
+    start = re.search(r"\(fp_arc \(start (\S+) (\S+)\)", content).groups()
+    first = group.segments[0]
+    assert np.allclose([float(v) for v in start], [first["x1"], first["y1"]])
+
+
+def test_placed_footprints_share_body(make_helix):
+    """Test footprint placements on a board."""
+    coil = make_helix(x0=0.0, y0=0.0, segment_number=100)
+    pcb = PCBdraw("default_4layer", mode="file")
+    cell = pcb.define_cell("coil", coil)
+    pcb.place_footprint(cell, 10.0, 20.0)
+    pcb.place_footprint(cell, 40.0, 20.0, rotation=math.pi / 2, net=3)
+
+    exported = pcb.export()
+    assert balanced(exported)
+    assert exported.count('(footprint "kicad_draw:coil"') == 2
+    assert '(property "Reference" "L2"' in exported
+    assert "(at 40.0 20.0 270.0)" in exported
+    assert '(net 3 "")' in exported and '(net 1 "")' in exported
+
+    # Much smaller than the same coils as segments
+    flat = PCBdraw("default_4layer", mode="file")
+    flat.place(flat.define_cell("coil", coil), 10.0, 20.0)
+    flat.place(flat.cells["coil"], 40.0, 20.0, rotation=math.pi / 2)
+    assert len(exported) * 5 < len(flat.export())
+    assert pcb.get_svg() == flat.get_svg()
+
+
+def test_closed_arcs_are_split():
+    """Test that full-circle arcs become several fp_arc items."""
+    arcs = np.array([(0.0, 0.0, 1.0, 0.0, 2 * math.pi, 0.2, 0)], dtype=ARC_DTYPE)
+    visual = np.array([(VISUAL_ARC, 0)], dtype=VISUAL_DTYPE)
+    body = footprint_body(ElementGroup(arcs=arcs, visual=visual), ["F.Cu"])
+    assert len(body.graphics) == 2
@@ -0,0 +1,107 @@
+"""Tests for YAML-driven board generation."""
+
+import os
+
+import pytest
+import yaml
+from click.testing import CliRunner
+
+from kicad_draw.cli import main
+from kicad_draw.PCBmodule import PCBdraw
+from kicad_draw.spec import load_board_spec
+
+
+@pytest.fixture
+def manifest(tmp_path, template, helix):
+    """Write a board manifest with two coils sharing defaults."""
+    path = tmp_path / "board.yaml"
+    defaults = helix.model_dump(exclude={"x0", "net_number"})
+    path.write_text(
+        yaml.safe_dump(
+            {
+                "template": "template.kicad_pcb",
+                "output": "out/board.kicad_pcb",
+                "defaults": defaults,
+                "coils": [
+                    {"x0": 120.0, "net_number": 1},
+                    {"x0": 160.0, "net_number": 2},
+                ],
+            }
+        )
+    )
+    return str(path)
+
+
+def test_load_single_and_manifest(tmp_path, manifest, helix):
+    """Test both spec layouts, type inference and path resolution."""
+    single = tmp_path / "single.yaml"
+    single.write_text(yaml.safe_dump(helix.model_dump()))
+    spec = load_board_spec(str(single))
+    assert spec.coils == [helix]
+    assert spec.name == "single"
+
+    spec = load_board_spec(manifest)
+    assert [coil.x0 for coil in spec.coils] == [120.0, 160.0]
+    assert spec.output == str(tmp_path / "out" / "board.kicad_pcb")
+
+    single.write_text(
+        yaml.safe_dump({"type": "helix", **helix.model_dump(), "radius_typo": 1.0})
+    )
+    with pytest.raises(ValueError, match="unknown HelixParams fields"):
+        load_board_spec(str(single))
+
+
+def test_generate_matches_direct_drawing(template, manifest):
+    """Test that parallel generation equals drawing the coils in one PCBdraw."""
+    runner = CliRunner()
+    result = runner.invoke(main, ["generate", manifest, "--jobs", "2", "--svg"])
+    assert result.exit_code == 0, result.output
+    assert "board: 2 coils" in result.output
+
+    spec = load_board_spec(manifest)
+    pcb = PCBdraw("default_4layer", mode="file")
+    for coil in spec.coils:
+        pcb.draw(coil)
+    with open(template) as f:
+        expected = pcb._merge_template(f.read())
+    with open(spec.output) as f:
+        assert f.read() == expected
+    with open(spec.output.replace(".kicad_pcb", ".svg")) as f:
+        assert f.read() == pcb.get_svg()
+
+
+def test_dry_run_writes_nothing(tmp_path, manifest):
+    """Test that a dry run reports element counts without a template."""
+    runner = CliRunner()
+    result = runner.invoke(
+        main, ["generate", manifest, "--dry-run", "--stackup", "default_6layer"]
+    )
+    assert result.exit_code == 0, result.output
+    assert "elements (default_6layer)" in result.output
+    assert not (tmp_path / "out").exists()
+
+    result = runner.invoke(main, ["generate", manifest, "--stackup", "bogus"])
+    assert result.exit_code != 0
+    assert "Unknown stackup: bogus" in result.output
+
+
+def test_generate_rejects_bad_yaml_and_clashing_outputs(tmp_path, manifest):
+    """Test CLI errors for malformed YAML and boards sharing an output file."""
+    runner = CliRunner()
+    broken = tmp_path / "broken.yaml"
+    broken.write_text("coils: [{type: helix, x0: 1.0\n")
+    result = runner.invoke(main, ["generate", str(broken), "--dry-run"])
+    assert result.exit_code == 1
+    assert "broken.yaml: invalid YAML" in result.output
+
+    other = tmp_path / "other"
+    other.mkdir()
+    (other / "board.yaml").write_text(open(manifest).read())
+    (other / "template.kicad_pcb").write_text("(kicad_pcb\n)\n")
+    out = str(tmp_path / "build")
+    result = runner.invoke(
+        main, ["generate", manifest, str(other / "board.yaml"), "-o", out]
+    )
+    assert result.exit_code == 1
+    assert "both write" in result.output
+    assert not os.path.exists(out)
@@ -0,0 +1,47 @@
+"""Tests for lazy imports."""
+
+import subprocess
+import sys
+
+import pytest
+
+import kicad_draw
+
+
+def imported_modules(code: str) -> set:
+    """Modules loaded by a fresh interpreter after running some code."""
+    script = f"{code}\nimport sys\nprint(' '.join(sys.modules))"
+    output = subprocess.run(
+        [sys.executable, "-c", script], check=True, capture_output=True, text=True
+    ).stdout
+    return set(output.split())
+
+
+def test_heavy_modules_load_on_use():
+    """Test that Pydantic and the visualizer are only imported when used."""
+    modules = imported_modules("import kicad_draw")
+    assert "numpy" not in modules and "kicad_draw.PCBmodule" not in modules
+
+    modules = imported_modules("import kicad_draw.cli")
+    assert "numpy" not in modules and "importlib.metadata" not in modules
+
+    modules = imported_modules(
+        "from kicad_draw import PCBdraw\n"
+        "PCBdraw('default_4layer', mode='file', enable_visualization=False)"
+    )
+    assert "pydantic" not in modules and "kicad_draw.visualizer" not in modules
+
+    modules = imported_modules(
+        "from kicad_draw import PCBdraw\nPCBdraw('default_4layer', mode='file')"
+    )
+    assert "pydantic" not in modules and "kicad_draw.visualizer" in modules
+
+
+def test_lazy_exports():
+    """Test that the package exports its main classes lazily."""
+    from kicad_draw.PCBmodule import PCBdraw
+
+    assert kicad_draw.PCBdraw is PCBdraw
+    assert "HelixParams" in dir(kicad_draw)
+    with pytest.raises(AttributeError, match="missing"):
+        kicad_draw.missing
@@ -0,0 +1,63 @@
+"""Tests for memory accounting and the memory budget."""
+
+import pytest
+
+from kicad_draw.memory import MemoryBudget, MemoryBudgetExceeded
+from kicad_draw.PCBmodule import PCBdraw
+
+
+def test_memory_usage(make_helix):
+    """Test the bytes reported per store."""
+    pcb = PCBdraw("default_4layer", mode="file")
+    node = pcb.draw_helix(make_helix(segment_number=200))
+    usage = pcb.memory_usage()
+    assert usage["elements"] > sum(len(element) for element in pcb.elements)
+    assert usage["visualizer"] > 0 and usage["cells"] == 0
+    assert usage["total"] == sum(v for k, v in usage.items() if k != "total")
+
+    node.transform = [[1, 0, 5], [0, 1, 0], [0, 0, 1]]
+    pcb.refresh()
+    assert pcb.memory_usage()["nodes"] > usage["nodes"] + node._group.nbytes // 2
+    pcb.disable_visualization()
+    assert pcb.memory_usage()["visualizer"] == 0
+
+
+def test_budget_fails_fast(make_helix):
+    """Test that exceeding the budget raises with a report per store."""
+    pcb = PCBdraw("default_4layer", mode="file")
+    pcb.set_memory_budget(200_000)
+    pcb.draw_helix(make_helix(segment_number=100))
+    with pytest.raises(MemoryBudgetExceeded) as info:
+        for _ in range(50):
+            pcb.draw_helix(make_helix(segment_number=100))
+    assert info.value.usage["total"] > 200_000
+    assert "elements" in str(info.value) and "visualizer" in str(info.value)
+
+    with pytest.raises(ValueError):
+        MemoryBudget(100, on_exceed="spill later")
+
+
+def test_budget_drops_visualization(helix):
+    """Test that visualization is given up before failing."""
+    pcb = PCBdraw("default_4layer", mode="file")
+    for i in range(2000):
+        pcb.drawline(0.0, i, 1.0, i, 0.2, 1, 0)
+    usage = pcb.memory_usage()
+    pcb.set_memory_budget(
+        usage["total"] - usage["visualizer"] // 2, on_exceed="drop_visualization"
+    )
+    assert pcb.visualizer is None
+    pcb.draw_helix(helix)
+    assert pcb.memory_usage()["visualizer"] == 0
+
+
+def test_stage_memory_peaks(make_helix):
+    """Test traced allocation peaks per stage and call."""
+    pcb = PCBdraw("default_4layer", mode="file")
+    with pcb.instrument(memory=True) as stats:
+        pcb.draw_helix(make_helix(segment_number=500))
+    data = stats.to_dict()
+    assert data["stages"]["format"]["peak_bytes"] > 0
+    call = data["calls"]["draw_helix"]["peak_bytes"]
+    assert call >= data["stages"]["format"]["peak_bytes"]
+    assert call >= data["stages"]["geometry"]["peak_bytes"]
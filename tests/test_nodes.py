@@ -0,0 +1,133 @@
+"""Tests for retained-mode draw nodes and element groups."""
+
+import numpy as np
+import pytest
+
+from kicad_draw.formatter import KiCadFormatter
+from kicad_draw.geometry import Line, Point, Via
+from kicad_draw.PCBmodule import PCBdraw
+
+LAYERS = ["F.Cu", "In1.Cu", "In2.Cu", "B.Cu"]
+
+
+def translation(dx, dy):
+    """3x3 translation matrix."""
+    return [[1, 0, dx], [0, 1, dy], [0, 0, 1]]
+
+
+def test_bulk_formatting_matches_single():
+    """Test that bulk formatting produces the per-element text."""
+    formatter = KiCadFormatter()
+    line = Line(Point(1.25, -2.0), Point(3.0, 4.5), 0.2)
+    via = Via(Point(0.1, 0.2), 0.6, 0.3)
+    assert formatter.format_segments(
+        [1.25], [-2.0], [3.0], [4.5], [0.2], ["F.Cu"], [3]
+    ) == [formatter.format_segment(line, "F.Cu", 3)]
+    assert formatter.format_vias(
+        [0.1], [0.2], [0.6], [0.3], ["F.Cu"], ["B.Cu"], [3]
+    ) == [formatter.format_via(via, ["F.Cu", "B.Cu"], 3)]
+
+
+def test_nodes_own_element_ranges(helix, make_helix):
+    """Test that nodes cover their elements and keep low-level ones."""
+    pcb = PCBdraw("default_4layer", mode="file")
+    first = pcb.draw_helix(helix)
+    pcb.drawline(0.0, 0.0, 1.0, 1.0, 0.2, 0, 0)
+    second = pcb.draw(make_helix(x0=120.0))
+
+    assert pcb.nodes == [first, second]
+    assert first.elements == pcb.elements[: len(first.elements)]
+    assert second.elements == pcb.elements[-len(second.elements) :]
+    assert len(pcb.elements) == len(first.elements) + len(second.elements) + 1
+
+
+def test_only_dirty_nodes_are_regenerated(helix, make_helix, monkeypatch):
+    """Test that editing a node redraws it alone and splices the output."""
+    pcb = PCBdraw("default_4layer", mode="file")
+    first = pcb.draw_helix(helix)
+    line_index = len(pcb.elements)
+    pcb.drawline(0.0, 0.0, 1.0, 1.0, 0.2, 0, 0)
+    second = pcb.draw_helix(make_helix(x0=120.0))
+    line = pcb.elements[line_index]
+    kept = first._elements
+
+    captured = []
+    original = pcb.capture
+    monkeypatch.setattr(
+        pcb, "capture", lambda params: captured.append(params) or original(params)
+    )
+    second.update(radius=5.0)
+    assert second.dirty and not first.dirty
+    exported = pcb.export()
+    assert captured == [second.params]
+    assert first._elements is kept
+
+    expected = PCBdraw("default_4layer", mode="file")
+    expected.draw_helix(helix)
+    expected.drawline(0.0, 0.0, 1.0, 1.0, 0.2, 0, 0)
+    expected.draw_helix(make_helix(x0=120.0, radius=5.0))
+    assert exported == expected.export()
+    assert pcb.elements[line_index] == line
+    assert pcb.get_svg() == expected.get_svg()
+
+
+def test_transform_net_and_visibility(helix):
+    """Test node transforms, net overrides, hiding and removal."""
+    pcb = PCBdraw("default_4layer", mode="file")
+    node = pcb.draw_helix(helix)
+    count = len(pcb.elements)
+
+    node.transform = translation(5.0, -2.0)
+    node.net = 7
+    pcb.refresh()
+    moved = pcb.capture(helix.model_copy(update={"x0": 155.0, "y0": 98.0}))
+    result = pcb.capture(helix).transformed(translation(5.0, -2.0))
+    assert np.allclose(result.segments["x1"], moved.segments["x1"])
+    assert all("(net 7)" in element for element in pcb.elements)
+    assert len(pcb.elements) == count
+
+    node.visible = False
+    assert pcb.export() == ""
+    assert pcb.visualizer.elements == []
+    node.visible = True
+    assert len(pcb.export().split("\n")) == count
+
+    node.remove()
+    assert pcb.export() == "" and pcb.nodes == []
+    with pytest.raises(RuntimeError):
+        node.net = 3
+
+
+def test_print_mode_nodes_are_read_only(helix, capsys):
+    """Test that nodes drawn in print mode cannot be edited."""
+    pcb = PCBdraw("default_4layer", mode="print", enable_visualization=False)
+    node = pcb.draw_helix(helix)
+    assert capsys.readouterr().out.count("(segment") > 0
+    with pytest.raises(RuntimeError):
+        node.visible = False
+
+
+def test_group_transform_keeps_arcs_consistent(helix):
+    """Test that transformed arcs still match their tessellated segments."""
+    pcb = PCBdraw("default_4layer", mode="file")
+    group = pcb.capture(helix)
+    angle = 0.7
+    c, s = np.cos(angle), np.sin(angle)
+    mirror_rotate = [[c, s, 3.0], [s, -c, -1.0], [0, 0, 1]]
+    moved = group.transformed(mirror_rotate)
+
+    # The first arc starts where its first tessellated segment starts
+    arc = moved.arcs[0]
+    segment = moved.segments[0]
+    assert np.isclose(
+        arc["cx"] + arc["radius"] * np.cos(arc["start_angle"]), segment["x1"]
+    )
+    assert np.isclose(
+        arc["cy"] + arc["radius"] * np.sin(arc["start_angle"]), segment["y1"]
+    )
+    with pytest.raises(ValueError):
+        group.transformed([[2, 0, 0], [0, 1, 0], [0, 0, 1]])
+    assert (
+        group.format(LAYERS, pcb.formatter)
+        == PCBdraw("default_4layer", mode="file").draw_helix(helix).elements
+    )
@@ -4,10 +4,12 @@ This module contains comprehensive tests for the refactored PCBdraw class
 including new features like visualization and parameter models.
 """
 
+import numpy as np
 import pytest
 
 from kicad_draw.models import HelixParams, HelixRectangleParams
 from kicad_draw.PCBmodule import PCBdraw
+from kicad_draw.visualizer import PCBVisualizer, arc_path_data
 
 
 @pytest.fixture
@@ -238,3 +240,31 @@ def test_mode_switch():
 
     pcb.drawline(x1=0, y1=0, x2=1, y2=1, line_width=0.5, net_number=1, layer_index=0)
     assert len(pcb.elements) == 1
+
+
+def test_helix_svg_uses_arc_paths(pcb_4layer_file, make_helix):
+    """Test that each helix turn is rendered as a single SVG arc path."""
+    pcb_4layer_file.draw_helix(make_helix(segment_number=100))
+
+    # KiCad output stays tessellated
+    assert len(pcb_4layer_file.elements) == 2 * 100 + 2 + 1
+
+    svg = pcb_4layer_file.get_svg()
+    assert svg.count("<path") == 2
+    assert svg.count(" A 10.0 10.0 0 1 1 ") == 2
+    # Only the two connection tabs remain as line elements
+    assert svg.count("<line") == 2
+
+
+def test_arc_bounds_and_path_data():
+    """Test arc bounding boxes and splitting of full-circle arcs."""
+    visualizer = PCBVisualizer()
+    visualizer.add_arc(0.0, 0.0, 1.0, 0.0, np.pi, 0.1, "F.Cu")
+    assert visualizer.bounds == pytest.approx([-1.0, 0.0, 1.0, 1.0], abs=1e-12)
+
+    assert arc_path_data(0.0, 0.0, 1.0, 0.0, np.pi / 2).count("A ") == 1
+    assert arc_path_data(0.0, 0.0, 1.0, 0.0, 2 * np.pi).count("A ") == 2
+
+    with pytest.warns(DeprecationWarning, match="segments"):
+        visualizer.add_arc(0.0, 0.0, 1.0, 0.0, np.pi, 0.1, "F.Cu", segments=8)
+    assert len(visualizer.elements) == 2
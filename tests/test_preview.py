@@ -0,0 +1,84 @@
+"""Tests for progressive notebook previews."""
+
+import sys
+import types
+
+import pytest
+
+from kicad_draw.PCBmodule import PCBdraw
+
+
+class FakeHandle:
+    """Display handle that records updates."""
+
+    def __init__(self, obj):
+        """Record the initially displayed object."""
+        self.objects = [obj]
+
+    def update(self, obj):
+        """Record a display update."""
+        self.objects.append(obj)
+
+
+@pytest.fixture
+def fake_ipython(monkeypatch):
+    """Install a minimal IPython.display replacement."""
+    display_module = types.ModuleType("IPython.display")
+    display_module.handles = []
+
+    def display(obj, display_id=False):
+        handle = FakeHandle(obj)
+        display_module.handles.append(handle)
+        return handle if display_id else None
+
+    display_module.display = display
+    display_module.Image = lambda data, format: ("image", format, data)
+    display_module.SVG = lambda data: ("svg", data)
+
+    ipython = types.ModuleType("IPython")
+    ipython.display = display_module
+    monkeypatch.setitem(sys.modules, "IPython", ipython)
+    monkeypatch.setitem(sys.modules, "IPython.display", display_module)
+    return display_module
+
+
+@pytest.fixture
+def pcb_helix(helix):
+    """Create a PCB with a small helix."""
+    pcb = PCBdraw("default_4layer", mode="file")
+    pcb.draw_helix(helix)
+    return pcb
+
+
+def test_progressive_preview_refines_same_handle(fake_ipython, pcb_helix):
+    """Test that the coarse PNG is replaced by the full SVG in one display."""
+    preview = pcb_helix.show_svg(progressive=True)
+    assert preview.wait(timeout=10)
+
+    (handle,) = fake_ipython.handles
+    kind, fmt, data = handle.objects[0]
+    assert (kind, fmt) == ("image", "png")
+    assert data.startswith(b"\x89PNG")
+    assert handle.objects[1] == ("svg", preview.svg)
+    assert "<svg" in preview.svg
+
+
+def test_new_preview_cancels_previous(fake_ipython, pcb_helix):
+    """Test that starting a new preview cancels the pending one."""
+    first = pcb_helix.show_svg(progressive=True)
+    second = pcb_helix.show_svg(progressive=True)
+    assert first.cancelled
+    assert not second.cancelled
+    assert second.wait(timeout=10)
+
+
+def test_preview_snapshot_ignores_later_drawing(fake_ipython, pcb_helix):
+    """Test that elements drawn after starting are not part of the preview."""
+    count = len(pcb_helix.visualizer.elements)
+    pcb_helix.cancel_preview()
+    preview = pcb_helix.show_svg(progressive=True)
+    pcb_helix.drawline(
+        x1=0, y1=0, x2=1, y2=1, line_width=0.5, net_number=1, layer_index=0
+    )
+    assert len(preview.visualizer.elements) == count
+    assert preview.wait(timeout=10)
@@ -0,0 +1,116 @@
+"""Tests for the raster (PNG) preview renderer."""
+
+import struct
+import zlib
+
+import numpy as np
+import pytest
+
+from kicad_draw.models import HelixParams
+from kicad_draw.PCBmodule import PCBdraw
+from kicad_draw.raster import PCBRasterizer, encode_png, hex_to_rgb
+
+
+@pytest.fixture
+def pcb_line():
+    """Create a PCB with a single horizontal trace and a via."""
+    pcb = PCBdraw("default_4layer", mode="file")
+    pcb.drawline(x1=0, y1=0, x2=10, y2=0, line_width=1.0, net_number=1, layer_index=0)
+    pcb.draw_via(
+        x=10,
+        y=5,
+        via_size=1.0,
+        drill_size=0.5,
+        layer_index_1=0,
+        layer_index_2=3,
+        net_number=1,
+    )
+    return pcb
+
+
+def _pixel_color(rgba, x, y):
+    return tuple(int(c) for c in rgba[y, x, :3])
+
+
+def test_render_layer_colors(pcb_line):
+    """Test that traces are drawn in their layer color over the background."""
+    rasterizer = PCBRasterizer(pcb_line.visualizer, dpi=254, antialias=False)
+    rgba = rasterizer.render()
+
+    # Content spans 10.5 x 5.5 mm at 10 px/mm plus a 10 px margin on each side
+    assert rgba.shape == (75, 125, 4)
+    background = tuple(round(c * 255) for c in hex_to_rgb("#1a1a1a"))
+    trace = tuple(round(c * 255) for c in hex_to_rgb("#C8860D"))
+    via = tuple(round(c * 255) for c in hex_to_rgb("#404040"))
+
+    # Trace runs along y=0 mm, which maps to the top margin row
+    assert _pixel_color(rgba, 60, 10) == trace
+    assert _pixel_color(rgba, 60, 40) == background
+    assert _pixel_color(rgba, 110, 60) == via
+    assert (rgba[..., 3] == 255).all()
+
+
+def test_render_respects_visibility(pcb_line):
+    """Test that hidden layers and vias are not drawn."""
+    pcb_line.hide_layer("F.Cu")
+    pcb_line.set_via_visibility(False)
+    rgba = PCBRasterizer(pcb_line.visualizer, dpi=254).render()
+    background = tuple(round(c * 255) for c in hex_to_rgb("#1a1a1a"))
+    assert (rgba[..., :3] == np.array(background, dtype=np.uint8)).all()
+
+
+def test_antialias_blends_edges(pcb_line):
+    """Test that antialiasing produces intermediate coverage at edges."""
+    aliased = PCBRasterizer(pcb_line.visualizer, dpi=100, antialias=False).render()
+    smooth = PCBRasterizer(pcb_line.visualizer, dpi=100, antialias=True).render()
+    assert len(np.unique(smooth[..., 0])) > len(np.unique(aliased[..., 0]))
+
+
+def test_max_size_limits_thumbnail():
+    """Test that max_size bounds the image independent of the design size."""
+    pcb = PCBdraw("default_4layer", mode="file")
+    pcb.draw_helix(
+        HelixParams(
+            x0=100,
+            y0=100,
+            radius=50,
+            port_gap=1.0,
+            tab_gap=1.0,
+            angle_step=0.1,
+            layer_index_list=[0, 1, 2, 3],
+            track_width=0.5,
+            connect_width=0.3,
+            drill_size=0.2,
+            via_size=0.4,
+            net_number=1,
+        )
+    )
+    for max_size in (128, 20, 3, 1):
+        rgba = PCBRasterizer(pcb.visualizer, dpi=1200, max_size=max_size).render()
+        assert max(rgba.shape[:2]) <= max_size
+    with pytest.raises(ValueError, match="max_size"):
+        PCBRasterizer(pcb.visualizer, max_size=0)
+
+
+def test_encode_png_roundtrip(tmp_path, pcb_line):
+    """Test that the PNG encoder writes a valid, decodable image."""
+    filename = tmp_path / "preview.png"
+    pcb_line.save_png(str(filename), dpi=50)
+    data = filename.read_bytes()
+    assert data[:8] == b"\x89PNG\r\n\x1a\n"
+
+    width, height = struct.unpack(">II", data[16:24])
+    idat_length = struct.unpack(">I", data[33:37])[0]
+    assert data[37:41] == b"IDAT"
+    raw = zlib.decompress(data[41 : 41 + idat_length])
+    assert len(raw) == height * (width * 4 + 1)
+
+    rgba = PCBRasterizer(pcb_line.visualizer, dpi=50).render()
+    decoded = np.frombuffer(raw, dtype=np.uint8).reshape(height, width * 4 + 1)
+    assert (decoded[:, 1:].reshape(height, width, 4) == rgba).all()
+
+
+def test_encode_png_rejects_bad_shape():
+    """Test that invalid image arrays are rejected."""
+    with pytest.raises(ValueError):
+        encode_png(np.zeros((4, 4, 3), dtype=np.uint8))
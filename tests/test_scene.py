@@ -0,0 +1,123 @@
+"""Tests for compact scene export and the HTML viewer."""
+
+import json
+
+import numpy as np
+import pytest
+
+from kicad_draw.models import HelixRectangleParams
+from kicad_draw.PCBmodule import PCBdraw
+from kicad_draw.scene import build_scene, decode_array, decode_points, scene_to_html
+
+
+@pytest.fixture
+def pcb_polyline():
+    """Create a PCB with a long chain of short traces and a few vias."""
+    pcb = PCBdraw("default_4layer", mode="file")
+    angles = np.linspace(0, 20 * np.pi, 2001)
+    x = 100 + angles * np.cos(angles)
+    y = 100 + angles * np.sin(angles)
+    for i in range(len(angles) - 1):
+        pcb.drawline(
+            x1=x[i],
+            y1=y[i],
+            x2=x[i + 1],
+            y2=y[i + 1],
+            line_width=0.2,
+            net_number=1,
+            layer_index=1,
+        )
+    for i in range(3):
+        pcb.draw_via(
+            x=90 + i,
+            y=90,
+            via_size=0.6,
+            drill_size=0.3,
+            layer_index_1=0,
+            layer_index_2=3,
+            net_number=1,
+        )
+    return pcb
+
+
+def test_scene_roundtrip_quantized(pcb_polyline):
+    """Test that quantized, delta-encoded coordinates decode within the grid."""
+    scene = build_scene(pcb_polyline.visualizer, quantum=0.001)
+    (layer,) = scene["layers"]
+    assert layer["name"] == "In1.Cu"
+    # The connected chain is merged into a single polyline
+    assert layer["polyline_count"] == 1
+    assert list(decode_array(layer["lengths"])) == [2001]
+
+    points = decode_points(layer["points"], scene)
+    expected = [(e["x1"], e["y1"]) for e in pcb_polyline.visualizer.elements[:1]] + [
+        (e["x2"], e["y2"]) for e in pcb_polyline.visualizer.elements[:2000]
+    ]
+    np.testing.assert_allclose(points, expected, atol=0.0005 + 1e-9)
+
+    vias = decode_points(scene["vias"]["points"], scene)
+    np.testing.assert_allclose(vias, [(90, 90), (91, 90), (92, 90)], atol=0.0005 + 1e-9)
+
+
+def test_scene_roundtrip_float(pcb_polyline):
+    """Test unquantized float32 storage with compression."""
+    scene = build_scene(pcb_polyline.visualizer, quantum=None, compress=True)
+    points = decode_points(scene["layers"][0]["points"], scene)
+    assert points[0] == pytest.approx(
+        [pcb_polyline.visualizer.elements[0]["x1"], 100], abs=1e-4
+    )
+
+
+def test_scene_much_smaller_than_svg(pcb_polyline):
+    """Test that the compact scene is at least 10x smaller than the SVG."""
+    svg = pcb_polyline.get_svg()
+    payload = json.dumps(build_scene(pcb_polyline.visualizer))
+    assert len(payload) * 10 < len(svg)
+
+
+def test_scene_keeps_arcs_and_visibility():
+    """Test that arcs and layer visibility are carried into the scene."""
+    pcb = PCBdraw("default_4layer", mode="file")
+    pcb.draw_helix_rectangle(
+        HelixRectangleParams(
+            x0=150.0,
+            y0=100.0,
+            width=30.0,
+            height=20.0,
+            corner_radius=3.0,
+            layer_index_list=[0, 1],
+            track_width=0.5,
+            connect_width=0.3,
+            drill_size=0.2,
+            via_size=0.4,
+            net_number=1,
+        )
+    )
+    pcb.hide_layer("In1.Cu")
+    scene = pcb.visualizer.export_scene(layer_order=pcb.layer_manager.layers)
+    assert [layer["name"] for layer in scene["layers"]] == ["F.Cu", "In1.Cu"]
+    assert [layer["visible"] for layer in scene["layers"]] == [True, False]
+    assert all(layer["arc_count"] == 4 for layer in scene["layers"])
+    arcs = decode_array(scene["layers"][0]["arcs"]).reshape(-1, 6)
+    assert arcs[:, 2] == pytest.approx([3.0] * 4)
+
+
+def test_save_html(tmp_path, pcb_polyline):
+    """Test that the HTML viewer embeds the scene and needs no external files."""
+    filename = tmp_path / "viewer.html"
+    pcb_polyline.save_html(str(filename))
+    html = filename.read_text()
+    assert html.startswith("<!DOCTYPE html>")
+    assert "<canvas" in html
+    assert "http://" not in html and "https://" not in html
+
+    start = html.index('type="application/json">') + len('type="application/json">')
+    scene = json.loads(html[start : html.index("</script>", start)])
+    assert scene["layers"][0]["points"]["encoding"] == "deflate"
+
+
+def test_scene_to_html_escapes_script_end():
+    """Test that embedded JSON cannot terminate the script element."""
+    scene = {"background": "#000000", "layers": [{"name": "</script>"}]}
+    html = scene_to_html(scene)
+    assert "<\\/script>" in html
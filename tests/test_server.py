@@ -0,0 +1,90 @@
+"""Tests for the coil generation server."""
+
+import socket
+import threading
+
+import pytest
+
+from kicad_draw.PCBmodule import PCBdraw
+from kicad_draw.server import CoilServer, request
+from tests.conftest import HELIX_FIELDS
+
+
+@pytest.fixture
+def server(tmp_path):
+    """Serve on a Unix socket in a background thread."""
+    if not hasattr(socket, "AF_UNIX"):
+        pytest.skip("Unix sockets are not available")
+    coil_server = CoilServer(str(tmp_path / "kicad-draw.sock"), workers=2)
+    thread = threading.Thread(target=coil_server.serve_forever, daemon=True)
+    thread.start()
+    yield coil_server
+    coil_server.shutdown()
+    thread.join()
+
+
+def test_generate_requests(server, template, helix):
+    """Test s-expression, SVG and board outputs and the coil cache."""
+    pcb = PCBdraw("default_4layer", mode="file")
+    pcb.draw(helix)
+
+    first, second = request(
+        server.address,
+        [
+            {"id": 1, "params": HELIX_FIELDS, "output": ["sexpr", "svg"]},
+            {
+                "id": "b",
+                "type": "helix",
+                "params": HELIX_FIELDS,
+                "output": "board",
+                "template": template,
+            },
+        ],
+    )
+    assert first == {
+        "id": 1,
+        "ok": True,
+        "sexpr": pcb.export(),
+        "svg": pcb.get_svg(),
+    }
+    assert second["id"] == "b" and second["board"].startswith("(kicad_pcb")
+    assert pcb.export() in second["board"]
+
+    stats = request(server.address, {"op": "stats"})
+    assert stats["requests"] == 3 and stats["cached_coils"] == 1
+    assert stats["hits"] == 1 and stats["templates"] == 1
+
+
+def test_invalid_requests(server):
+    """Test that errors are reported per request without closing the server."""
+    responses = request(
+        server.address,
+        [
+            {"id": 1, "type": "spiral", "params": HELIX_FIELDS},
+            {"id": 2, "params": {**HELIX_FIELDS, "radius": "wide"}},
+            {"id": 3, "params": HELIX_FIELDS, "stackup": "default_3layer"},
+            {"id": 4, "params": HELIX_FIELDS, "output": "png"},
+            {"id": 5, "params": HELIX_FIELDS, "output": "board"},
+        ],
+    )
+    assert [r["ok"] for r in responses] == [False] * 5
+    assert "spiral" in responses[0]["error"]
+
+    with socket.socket(socket.AF_UNIX) as sock:
+        sock.connect(server.address)
+        sock.sendall(b"not json\n")
+        assert b'"ok": false' in sock.makefile("rb").readline()
+    assert request(server.address, {"params": HELIX_FIELDS})["ok"]
+
+
+def test_tcp_server():
+    """Test serving on a TCP port picked by the system."""
+    with CoilServer(("127.0.0.1", 0)) as coil_server:
+        thread = threading.Thread(target=coil_server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            response = request(coil_server.address, {"params": HELIX_FIELDS})
+        finally:
+            coil_server._server.shutdown()
+        thread.join()
+    assert response["ok"] and response["sexpr"].startswith("(segment")
@@ -0,0 +1,59 @@
+"""Tests for sharded drawing."""
+
+import threading
+
+import pytest
+
+from kicad_draw.PCBmodule import PCBdraw
+from kicad_draw.shards import ShardedBuilder
+
+
+def test_map_matches_sequential_drawing(make_helix):
+    """Test that merged shards equal drawing the coils on one thread."""
+    coils = [make_helix(x0=40.0 * i, net_number=i + 1) for i in range(7)]
+    sequential = PCBdraw("default_4layer", mode="file")
+    sequential.drawline(0.0, 0.0, 1.0, 0.0, 0.2, 0, 0)
+    for coil in coils:
+        sequential.draw(coil)
+
+    pcb = PCBdraw("default_4layer", mode="file")
+    pcb.drawline(0.0, 0.0, 1.0, 0.0, 0.2, 0, 0)
+    builder = ShardedBuilder(pcb)
+    nodes = builder.map(lambda shard, coil: shard.draw(coil), coils, workers=3)
+    assert len(builder) == 3
+    assert builder.merge() is pcb and len(builder) == 0
+    assert pcb.export() == sequential.export()
+    assert pcb.visualizer.elements == sequential.visualizer.elements
+
+    # Merged nodes stay editable on the target PCB
+    nodes[3].net = 99
+    sequential.nodes[3].net = 99
+    assert pcb.export() == sequential.export()
+    assert pcb.visualizer.elements == sequential.visualizer.elements
+
+
+def test_shards_merge_in_key_order(helix):
+    """Test concurrent producers with explicit keys and cell conflicts."""
+    pcb = PCBdraw("default_4layer", mode="file", enable_visualization=False)
+    builder = ShardedBuilder(pcb)
+
+    def produce(key: int) -> None:
+        shard = builder.shard(key)
+        assert builder.shard(key) is shard
+        shard.drawline(float(key), 0.0, float(key), 1.0, 0.2, key, 0)
+
+    threads = [threading.Thread(target=produce, args=(key,)) for key in (2, 0, 1)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    builder.merge()
+    assert len(pcb.elements) == 3
+    assert all(f"(net {key})" in element for key, element in enumerate(pcb.elements))
+
+    builder.shard(0).define_cell("coil", helix)
+    builder.shard(1).define_cell("coil", helix)
+    with pytest.raises(ValueError):
+        builder.merge()
+    with pytest.raises(ValueError):
+        ShardedBuilder(PCBdraw("default_4layer"))
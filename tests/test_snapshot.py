@@ -0,0 +1,51 @@
+"""Tests for binary snapshots of board geometry."""
+
+import numpy as np
+import pytest
+
+from kicad_draw.PCBmodule import PCBdraw
+from kicad_draw.snapshot import read_snapshot
+
+
+def test_snapshot_round_trip(tmp_path, make_helix):
+    """Test that a loaded snapshot exports and renders like the board."""
+    helix = make_helix(x0=0.0, y0=0.0)
+    pcb = PCBdraw("default_6layer", mode="file")
+    pcb.drawline(0.0, 0.0, 1.0, 1.0, 0.2, 1, 0)
+    pcb.draw_via(1.0, 1.0, 0.4, 0.2, 2, 0, 5)
+    pcb.draw_helix(helix).transform = [[0, -1, 5.0], [1, 0, 0], [0, 0, 1]]
+    pcb.draw_array(helix, grid=(2, 3), pitch=(30.0, 30.0))
+    cell = pcb.define_cell("coil", helix)
+    pcb.place(cell, 100.0, 0.0, rotation=np.pi / 2, net=7)
+    pcb.place_footprint(cell, 200.0, 0.0)
+    path = str(tmp_path / "board.snapshot")
+    pcb.save_snapshot(path)
+
+    loaded = PCBdraw.load_snapshot(path)
+    assert loaded.export() == pcb.export()
+    # Footprint instances are kept as text and not visualized
+    visual = loaded.visualizer.elements
+    assert visual == pcb._scene_visualizer().elements[: len(visual)]
+    # Saving a loaded board again keeps the footprint instances
+    loaded.save_snapshot(path)
+    assert PCBdraw.load_snapshot(path, mmap=False).export() == pcb.export()
+
+
+def test_read_snapshot_maps_arrays(tmp_path, helix):
+    """Test memory-mapped reading and plain NPZ compatibility."""
+    pcb = PCBdraw("default_4layer", mode="file")
+    pcb.draw_array(helix, grid=(4, 4), pitch=(30.0, 30.0))
+    path = str(tmp_path / "board.npz")
+    pcb.save_snapshot(path)
+
+    snapshot = read_snapshot(path)
+    assert isinstance(snapshot.group.segments, np.memmap)
+    assert snapshot.stackup == "default_4layer"
+    assert snapshot.elements() == pcb.elements
+    with np.load(path) as data:
+        assert (data["segments"] == snapshot.group.segments).all()
+        assert data["layers"].tolist() == pcb.layer_manager.layers
+
+    np.savez(path, version=np.array(99))
+    with pytest.raises(ValueError):
+        read_snapshot(path)
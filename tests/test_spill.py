@@ -0,0 +1,72 @@
+"""Tests for the disk-backed spill store."""
+
+import os
+
+import pytest
+
+from kicad_draw.PCBmodule import PCBdraw
+from kicad_draw.spill import SpillStore
+
+
+def test_spilled_output_matches_memory(tmp_path, template, helix):
+    """Test that spilled drawing calls export and save like in-memory ones."""
+    expected = PCBdraw("default_4layer", mode="file")
+    expected.drawline(0.0, 0.0, 1.0, 1.0, 0.2, 1, 0)
+    expected.draw_helix(helix)
+    expected.draw_array(helix, grid=(3, 4), pitch=(30.0, 30.0))
+
+    pcb = PCBdraw("default_4layer", mode="file")
+    pcb.drawline(0.0, 0.0, 1.0, 1.0, 0.2, 1, 0)
+    store = pcb.spill_to(str(tmp_path / "spill"), chunk_elements=100)
+    node = pcb.draw_helix(helix)
+    pcb.draw_array(helix, grid=(3, 4), pitch=(30.0, 30.0))
+    assert len(pcb.elements) == 1 and not pcb.nodes
+    assert len(store) == len(expected.elements) - 1
+    with pytest.raises(RuntimeError):
+        node.update(segment_number=30)
+
+    assert pcb.export() == expected.export()
+    pcb.save(str(tmp_path / "spilled.kicad_pcb"), template)
+    expected.save(str(tmp_path / "memory.kicad_pcb"), template)
+    spilled = (tmp_path / "spilled.kicad_pcb").read_text()
+    assert spilled == (tmp_path / "memory.kicad_pcb").read_text()
+
+
+def test_chunks_and_reopen(tmp_path, helix):
+    """Test chunked streaming and reopening a store from its directory."""
+    pcb = PCBdraw("default_4layer", mode="file")
+    group = pcb.capture(helix).tile(
+        [[[1, 0, 30.0 * i], [0, 1, 0], [0, 0, 1]] for i in range(10)]
+    )
+    directory = str(tmp_path / "spill")
+    store = SpillStore(directory, chunk_elements=64)
+    store.append(group)
+    store.append(group)
+    chunks = list(store.chunks())
+    assert all(len(chunk) <= 64 for chunk in chunks)
+    assert sum(len(chunk) for chunk in chunks) == len(store) == 2 * len(group)
+
+    reopened = SpillStore(directory)
+    rows = [chunk.segments for chunk in reopened.chunks()]
+    assert sum(len(r) for r in rows) == 2 * len(group.segments)
+    assert (rows[0] == group.segments[: len(rows[0])]).all()
+
+    with SpillStore() as temporary:
+        temporary.append(group)
+        scratch = temporary.directory
+        assert len(list(temporary.chunks())) > 0
+    assert not os.path.exists(scratch)
+    assert os.path.exists(directory)
+
+
+def test_budget_spills(make_helix):
+    """Test that the spill policy moves later calls to disk instead of raising."""
+    pcb = PCBdraw("default_4layer", mode="file")
+    pcb.set_memory_budget(200_000, on_exceed="spill")
+    for _ in range(50):
+        pcb.draw_helix(make_helix(segment_number=100))
+    assert pcb.spill is not None and len(pcb.spill) > 0
+    assert pcb.memory_usage()["spill"] == pcb.spill.buffered_bytes
+    directory = pcb.spill.directory
+    pcb.set_mode("print")
+    assert pcb.spill is None and not os.path.exists(directory)
@@ -0,0 +1,50 @@
+"""Tests for the opt-in instrumentation."""
+
+import json
+
+from kicad_draw.PCBmodule import PCBdraw
+from kicad_draw.stats import Stats
+
+
+def test_instrument_collects_stages_and_calls(tmp_path, template, helix):
+    """Test timers and counters of drawing and saving."""
+    pcb = PCBdraw("default_4layer", mode="file")
+    assert pcb.stats is None
+    with pcb.instrument() as stats:
+        node = pcb.draw_helix(helix)
+        pcb.draw_array(helix, grid=(2, 2), pitch=(30.0, 30.0))
+        node.update(segment_number=30)
+        pcb.save(str(tmp_path / "out.kicad_pcb"), template)
+        pcb.get_svg()
+    assert pcb.stats is None
+
+    data = stats.to_dict()
+    assert data["calls"]["draw_helix"]["count"] == 1
+    assert data["calls"]["draw_array"]["count"] == 1
+    assert data["stages"]["geometry"]["count"] == 3  # Two draws and the edit
+    for stage in ("format", "visualize", "transform", "refresh", "save", "svg"):
+        assert data["stages"][stage]["seconds"] > 0, stage
+    assert data["counters"]["nodes_rendered"] == 3
+    # The edited helix counts once as drawn and once as redrawn
+    drawn = len(pcb.capture(helix)) + sum(len(n._elements) for n in pcb.nodes)
+    assert data["counters"]["elements"] == drawn
+    assert data["counters"]["chars_written"] > len(pcb.export())
+    assert json.loads(stats.to_json()) == data
+
+
+def test_disabled_and_shared_stats(helix):
+    """Test that nothing is collected outside the block and stats can be shared."""
+    shared = Stats()
+    first = PCBdraw("default_4layer", mode="file")
+    second = PCBdraw("default_4layer", mode="file")
+    first.draw_helix(helix)
+    with first.instrument(shared), second.instrument(shared):
+        first.draw_helix(helix)
+        second.draw(helix)
+    first.draw_helix(helix)
+    assert shared.calls["draw_helix"].count == 1
+    assert shared.calls["draw"].count == 1
+    assert shared.counters["nodes_rendered"] == 2
+
+    shared.reset()
+    assert shared.to_dict() == {"stages": {}, "calls": {}, "counters": {}}
@@ -0,0 +1,85 @@
+"""Tests for parallel parameter sweeps."""
+
+import json
+
+import pytest
+
+from kicad_draw.models import HelixRectangleParams
+from kicad_draw.sweep import expand_grid, params_from_manifest, run_sweep
+
+
+def test_expand_grid_order(helix):
+    """Test that grid expansion follows itertools.product order."""
+    variants = expand_grid(
+        helix,
+        {"radius": [5.0, 10.0], "layer_index_list": [[0, 1], [0, 1, 2, 3]]},
+    )
+    assert [(v.radius, v.layer_index_list) for v in variants] == [
+        (5.0, [0, 1]),
+        (5.0, [0, 1, 2, 3]),
+        (10.0, [0, 1]),
+        (10.0, [0, 1, 2, 3]),
+    ]
+    assert all(v.track_width == 0.5 for v in variants)
+
+
+def test_expand_grid_rejects_unknown_field(helix):
+    """Test that unknown grid fields are rejected."""
+    with pytest.raises(ValueError, match="Unknown HelixParams fields"):
+        expand_grid(helix, {"diameter": [1.0]})
+
+
+def test_run_sweep_is_independent_of_workers(tmp_path, helix, template):
+    """Test that outputs and manifest do not depend on the worker count."""
+    variants = expand_grid(helix, {"radius": [5.0, 6.0, 7.0, 8.0, 9.0]})
+    variants.append(
+        HelixRectangleParams(
+            x0=150.0,
+            y0=100.0,
+            width=30.0,
+            height=20.0,
+            corner_radius=3.0,
+            layer_index_list=[0, 1],
+            track_width=0.5,
+            connect_width=0.3,
+            drill_size=0.2,
+            via_size=0.4,
+            net_number=1,
+        )
+    )
+
+    serial = run_sweep(
+        variants,
+        str(tmp_path / "serial"),
+        formats=("kicad_pcb", "svg"),
+        template_path=template,
+        jobs=1,
+    )
+    parallel = run_sweep(
+        variants,
+        str(tmp_path / "parallel"),
+        formats=("kicad_pcb", "svg"),
+        template_path=template,
+        jobs=2,
+        chunksize=2,
+    )
+
+    assert [entry["name"] for entry in parallel] == [
+        f"variant_{i:05d}" for i in range(6)
+    ]
+    assert [entry["type"] for entry in parallel][-2:] == ["helix", "helix_rectangle"]
+    for a, b in zip(serial, parallel):
+        assert a["element_count"] == b["element_count"]
+        for fmt in ("kicad_pcb", "svg"):
+            with open(a["outputs"][fmt]) as fa, open(b["outputs"][fmt]) as fb:
+                assert fa.read() == fb.read()
+
+    with open(tmp_path / "parallel" / "manifest.json") as f:
+        manifest = json.load(f)
+    assert params_from_manifest(manifest["variants"]) == variants
+
+
+def test_run_sweep_requires_template(tmp_path, helix):
+    """Test that KiCad output requires a template."""
+    with pytest.raises(ValueError, match="template_path"):
+        run_sweep([helix], str(tmp_path))
@@ -0,0 +1,80 @@
+"""Tests for affine transforms and bottom-side flipping."""
+
+import numpy as np
+import pytest
+
+from kicad_draw.PCBmodule import PCBdraw
+from kicad_draw.transform import (
+    apply,
+    flip_layers,
+    mirror_x,
+    rotate,
+    scale,
+    translate,
+)
+
+
+def segments_on(pcb, layer):
+    """Count the exported segments on a layer."""
+    return sum(
+        element.startswith("(segment") and f'"{layer}"' in element
+        for element in pcb.elements
+    )
+
+
+def test_matrix_builders():
+    """Test composed transforms on point arrays."""
+    x, y = apply(rotate(np.pi / 2, cx=1.0, cy=1.0), [2.0, 1.0], [1.0, 3.0])
+    assert np.allclose(x, [1.0, -1.0]) and np.allclose(y, [2.0, 1.0])
+    x, y = apply(translate(1.0, 0.0) @ scale(2.0), [1.0], [1.0])
+    assert np.allclose([x[0], y[0]], [3.0, 2.0])
+    assert np.allclose(mirror_x(2.0) @ mirror_x(2.0), np.eye(3))
+    assert flip_layers(4).tolist() == [3, 2, 1, 0]
+    with pytest.raises(ValueError):
+        apply(np.eye(2), [0.0], [0.0])
+
+
+def test_rotation_matches_angle_offset(helix):
+    """Test that rotating a helix equals drawing it with an angle offset."""
+    pcb = PCBdraw("default_4layer", mode="file")
+    angle = 0.4
+    rotated = pcb.capture(helix).transformed(rotate(angle, helix.x0, helix.y0))
+    offset = pcb.capture(helix.model_copy(update={"base_angle_offset": angle}))
+    for field in ("x1", "y1", "x2", "y2"):
+        assert np.allclose(rotated.segments[field], offset.segments[field])
+    assert np.allclose(rotated.vias["x"], offset.vias["x"])
+    assert np.allclose(rotated.arcs["start_angle"], offset.arcs["start_angle"])
+
+
+def test_flip_node_to_bottom(helix):
+    """Test that flipping a node mirrors it and reverses its layers."""
+    pcb = PCBdraw("default_4layer", mode="file")
+    node = pcb.draw_helix(helix)
+    top = pcb.capture(helix)
+
+    node.flip()
+    pcb.refresh()
+    assert node.flipped
+    assert not any('"F.Cu"' in element for element in pcb.elements)
+    assert segments_on(pcb, "B.Cu") == (top.segments["layer"] == 0).sum()
+    assert '(layers "In2.Cu" "B.Cu")' in pcb.export()
+    expected = top.remap_layers(flip_layers(4)).transformed(mirror_x(helix.x0))
+    assert node.elements == expected.format(pcb.layer_manager.layers, pcb.formatter)
+
+    node.flip()
+    pcb.refresh()
+    assert not node.flipped
+    assert segments_on(pcb, "F.Cu") == (top.segments["layer"] == 0).sum()
+
+
+def test_flipped_cell_placement(make_helix):
+    """Test that flipped placements remap layers per board side."""
+    pcb = PCBdraw("default_4layer", mode="file")
+    cell = pcb.define_cell("coil", make_helix(x0=0.0, y0=0.0))
+    pcb.place(cell, 10.0, 0.0)
+    pcb.place(cell, 40.0, 0.0, flip=True)
+    flat = cell.group
+    exported = pcb.export().split("\n")
+    top, bottom = exported[: len(flat)], exported[len(flat) :]
+    assert sum('"F.Cu"' in e for e in top) == sum('"B.Cu"' in e for e in bottom)
+    assert not any('"F.Cu"' in e for e in bottom)
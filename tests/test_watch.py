@@ -0,0 +1,124 @@
+"""Tests for incremental regeneration in watch mode."""
+
+import pytest
+import yaml
+
+from kicad_draw.generate import generate_boards
+from kicad_draw.spec import load_board_spec
+from kicad_draw.watch import IncrementalBoard, diff_coils, watch_boards
+
+
+def write_manifest(path, helix, xs):
+    """Write a manifest with one copy of the helix per x position."""
+    defaults = {"type": "helix", **helix.model_dump(exclude={"x0", "net_number"})}
+    coils = [{"x0": x, "net_number": i + 1} for i, x in enumerate(xs)]
+    path.write_text(
+        yaml.safe_dump(
+            {"template": "template.kicad_pcb", "defaults": defaults, "coils": coils}
+        )
+    )
+
+
+@pytest.fixture
+def manifest(tmp_path, template, make_helix):
+    """Write a manifest with three coils next to the template."""
+    path = tmp_path / "board.yaml"
+    write_manifest(path, make_helix(radius=5.0), [100.0, 120.0, 140.0])
+    return path
+
+
+def test_diff_coils(make_helix):
+    """Test that unchanged placements are matched once each."""
+    coils = [make_helix(x0=x) for x in (1.0, 2.0, 1.0)]
+    assert diff_coils(coils, [coils[1], coils[0], coils[0], coils[0]]) == [
+        1,
+        0,
+        2,
+        None,
+    ]
+
+
+def test_update_redraws_only_changed_coils(tmp_path, manifest, make_helix):
+    """Test that an edit redraws one coil and matches a full regeneration."""
+    board = IncrementalBoard(str(manifest), svg=True)
+    summary = board.update()
+    assert (summary["drawn"], summary["reused"]) == (3, 0)
+    first_blocks = board.blocks
+
+    write_manifest(manifest, make_helix(radius=5.0), [100.0, 125.0, 140.0, 160.0])
+    summary = board.update()
+    assert (summary["drawn"], summary["reused"], summary["removed"]) == (2, 2, 1)
+    assert board.blocks[0] is first_blocks[0]
+    assert board.blocks[2] is first_blocks[2]
+
+    with open(summary["outputs"]["kicad_pcb"]) as f:
+        incremental = f.read()
+    with open(summary["outputs"]["svg"]) as f:
+        incremental_svg = f.read()
+    (full,) = generate_boards(
+        [load_board_spec(str(manifest))],
+        output_dir=str(tmp_path / "full"),
+        svg=True,
+        jobs=1,
+    )
+    with open(full["outputs"]["kicad_pcb"]) as f:
+        assert f.read() == incremental
+    with open(full["outputs"]["svg"]) as f:
+        assert f.read() == incremental_svg
+
+
+def test_update_splices_in_place(tmp_path, manifest, make_helix):
+    """Test that updates edit the kept PCB and match full regenerations."""
+    board = IncrementalBoard(str(manifest), svg=True)
+    board.update()
+    pcb, elements = board.pcb, board.pcb.elements
+    svg_elements = pcb.visualizer.elements
+
+    # Move a coil to the front, edit one, drop one and shrink the bounds
+    for xs in ([140.0, 100.0, 125.0], [100.0, 125.0], [100.0]):
+        write_manifest(manifest, make_helix(radius=5.0), xs)
+        summary = board.update()
+        assert board.pcb is pcb and pcb.elements is elements
+        assert pcb.visualizer.elements is svg_elements
+
+        (full,) = generate_boards(
+            [load_board_spec(str(manifest))],
+            output_dir=str(tmp_path / "full"),
+            svg=True,
+            jobs=1,
+        )
+        for name in ("kicad_pcb", "svg"):
+            with open(full["outputs"][name]) as f:
+                expected = f.read()
+            with open(summary["outputs"][name]) as f:
+                assert f.read() == expected
+
+
+def test_watch_reports_errors_and_picks_up_edits(manifest, make_helix):
+    """Test that invalid edits are reported and later edits are processed."""
+    board = IncrementalBoard(str(manifest))
+    updates, errors = [], []
+    # Each callback edits the manifest while the watcher is running
+    edits = [
+        "coils: [{type: helix, x0: 1.0}]",
+        "coils: [{type: helix, x0: 1.0\n",
+    ]
+
+    def on_update(board, summary, elapsed):
+        updates.append(summary)
+        if edits:
+            manifest.write_text(edits.pop(0))
+
+    def on_error(board, error):
+        errors.append(error)
+        if edits:
+            manifest.write_text(edits.pop(0))
+        else:
+            write_manifest(manifest, make_helix(radius=5.0), [100.0, 120.0])
+
+    watch_boards([board], on_update, on_error, interval=0.01, max_updates=4)
+    assert "Field required" in str(errors[0])
+    assert "invalid YAML" in str(errors[1])
+    assert [u["drawn"] for u in updates] == [3, 0]
+    assert [u["reused"] for u in updates] == [0, 2]
+    assert len(board.spec.coils) == 2